@@ -0,0 +1,96 @@
+"""
+Medición y salida común de las suites
+Cada suite se ejecuta como proceso hijo de run.py (con el directorio de su
+servicio en el path) y escribe sus resultados como JSON en la última línea de
+stdout.
+"""
+
+import argparse
+import itertools
+import json
+import logging
+import time
+from typing import Callable, Dict, Iterable, Iterator, List
+
+# Artículos generados por bloque, fuera del tiempo medido
+CHUNK = 1000
+
+
+def chunks(items: Iterable, size: int = CHUNK) -> Iterator[List]:
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def result(
+    suite: str, name: str, size: int, items: int, seconds: float, **extra
+) -> Dict:
+    return {
+        "suite": suite,
+        "name": name,
+        "size": size,
+        "items": items,
+        "seconds": round(seconds, 4),
+        "items_per_second": round(items / seconds, 1) if seconds else None,
+        **extra,
+    }
+
+
+def measure_chunks(
+    suite: str,
+    name: str,
+    size: int,
+    items: Iterable,
+    fn: Callable[[List], None],
+    budget: float,
+    chunk_size: int = CHUNK,
+    **extra,
+) -> Dict:
+    """
+    Medir fn sobre bloques de items. Al superar budget segundos se detiene y
+    el resultado queda marcado como truncated (throughput de lo medido).
+    """
+    elapsed = 0.0
+    done = 0
+    truncated = False
+    for chunk in chunks(items, chunk_size):
+        start = time.perf_counter()
+        fn(chunk)
+        elapsed += time.perf_counter() - start
+        done += len(chunk)
+        if budget and elapsed > budget and done < size:
+            truncated = True
+            break
+    return result(suite, name, size, done, elapsed, truncated=truncated, **extra)
+
+
+def measure_once(
+    suite: str, name: str, size: int, fn: Callable[[], object], **extra
+) -> Dict:
+    """Medir una sola llamada que procesa los size artículos"""
+    start = time.perf_counter()
+    fn()
+    return result(suite, name, size, size, time.perf_counter() - start, **extra)
+
+
+def skipped(suite: str, name: str, size: int, reason: str) -> Dict:
+    return {"suite": suite, "name": name, "size": size, "skipped": reason}
+
+
+def run_suite(run: Callable[[argparse.Namespace], List[Dict]]):
+    """Punto de entrada de una suite: argumentos de run.py y JSON a stdout"""
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", required=True)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--budget", type=float, default=0)
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+    args.sizes = [int(s) for s in args.sizes.split(",")]
+
+    # Los logs por artículo de los servicios distorsionan la medición
+    logging.disable(logging.WARNING)
+    results = run(args)
+    print(json.dumps(results))
@@ -0,0 +1,132 @@
+"""
+Titulares económicos sintéticos en español
+Generador determinista (semilla fija) de artículos con la forma que usan los
+servicios: campos de la tabla news y, para el collector, los de GDELT
+(seendate, domain). Es un generador: 1M de artículos no se cargan en memoria,
+y los primeros n artículos son los mismos para cualquier tamaño.
+"""
+
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator
+
+EMPRESAS = [
+    "Ecopetrol",
+    "Bancolombia",
+    "Grupo Argos",
+    "Nutresa",
+    "ISA",
+    "Grupo Aval",
+    "Avianca",
+    "Cementos Argos",
+    "Davivienda",
+    "Celsia",
+    "Grupo Sura",
+    "Canacol",
+]
+INDICADORES = [
+    "El COLCAP",
+    "El dólar",
+    "La inflación",
+    "El desempleo",
+    "El precio del petróleo",
+    "El PIB",
+    "La tasa de interés",
+    "Las exportaciones de café",
+    "El peso colombiano",
+    "La inversión extranjera",
+]
+SUBE = ["sube", "crece", "se recupera", "repunta", "avanza", "mejora"]
+BAJA = ["cae", "se desploma", "retrocede", "pierde", "disminuye", "se debilita"]
+CAUSAS_POSITIVAS = [
+    "ganancias récord",
+    "el optimismo de los inversionistas",
+    "el aumento de la demanda",
+    "un acuerdo comercial",
+    "la estabilidad del mercado",
+    "nuevas inversiones",
+]
+CAUSAS_NEGATIVAS = [
+    "temor a la recesión",
+    "la crisis internacional",
+    "pérdidas en el trimestre",
+    "la incertidumbre política",
+    "la caída de la demanda",
+    "el riesgo de devaluación",
+]
+ENTIDADES = [
+    "El Banco de la República",
+    "El Ministerio de Hacienda",
+    "El Gobierno",
+    "La Superintendencia Financiera",
+    "El DANE",
+]
+OBJETOS = ["la tasa de interés", "su pronóstico", "la meta fiscal", "el encaje"]
+FUENTES = ["portafolio.co", "larepublica.co", "eltiempo.com", "valoraanalitik.com"]
+
+TEMPLATES = [
+    ("{empresa} {sube} {pct}% tras {causa_pos}", "positive"),
+    ("{indicador} {sube} por {causa_pos}", "positive"),
+    ("{empresa} {baja} {pct}% por {causa_neg}", "negative"),
+    ("{indicador} {baja} ante {causa_neg}", "negative"),
+    ("{entidad} mantiene {objeto} sin cambios", "neutral"),
+    ("{entidad} publica informe sobre {indicador_lower}", "neutral"),
+    ("Analistas advierten que {indicador_lower} {baja} por {causa_neg}", "negative"),
+    ("{empresa} no logra {sube_inf} pese a {causa_pos}", "negative"),
+]
+CONTENT_TEMPLATES = [
+    "Según analistas, {causa} marcó la jornada en la bolsa de Colombia.",
+    "{entidad} indicó que seguirá de cerca la evolución de {indicador_lower}.",
+    "Las acciones de {empresa} cerraron la sesión con un volumen de {volumen} millones.",
+    "Los inversionistas esperan nuevos datos del mercado la próxima semana.",
+]
+
+# Ventana de fechas de publicación (último año)
+DAYS = 365
+
+
+def generate(n: int, seed: int = 42) -> Iterator[Dict]:
+    """n artículos sintéticos (url única, fecha dentro del último año)"""
+    rng = random.Random(seed)
+    end = datetime(2025, 1, 1)
+    for i in range(n):
+        template, label = rng.choice(TEMPLATES)
+        indicador = rng.choice(INDICADORES)
+        slots = {
+            "empresa": rng.choice(EMPRESAS),
+            "indicador": indicador,
+            "indicador_lower": indicador[0].lower() + indicador[1:],
+            "sube": rng.choice(SUBE),
+            "sube_inf": "recuperarse",
+            "baja": rng.choice(BAJA),
+            "causa_pos": rng.choice(CAUSAS_POSITIVAS),
+            "causa_neg": rng.choice(CAUSAS_NEGATIVAS),
+            "entidad": rng.choice(ENTIDADES),
+            "objeto": rng.choice(OBJETOS),
+            "pct": f"{rng.uniform(0.1, 6):.1f}",
+        }
+        title = template.format(**slots)
+        content = " ".join(
+            sentence.format(
+                causa=rng.choice(CAUSAS_POSITIVAS + CAUSAS_NEGATIVAS),
+                entidad=slots["entidad"],
+                indicador_lower=slots["indicador_lower"],
+                empresa=slots["empresa"],
+                volumen=rng.randint(5, 900),
+            )
+            for sentence in rng.sample(CONTENT_TEMPLATES, 2)
+        )
+        published = end - timedelta(seconds=rng.randrange(DAYS * 86400))
+        domain = rng.choice(FUENTES)
+        yield {
+            "url": f"https://{domain}/economia/{seed}-{i}",
+            "title": title,
+            "content": content,
+            "source": domain,
+            "domain": domain,
+            "published_date": published,
+            "seendate": published.strftime("%Y%m%dT%H%M%SZ"),
+            "country": "CO",
+            # Etiqueta de la plantilla (referencia aproximada, p. ej. evaluate_tiers)
+            "label": label,
+        }
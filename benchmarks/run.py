@@ -0,0 +1,319 @@
+"""
+Suite de benchmarks del pipeline
+Mide processor (analyze_sentiment, process_article), analyzer
+(calculate_correlation, save_correlations, get_daily_news_sentiment),
+collector (save_to_database) y los endpoints principales de la API sobre
+titulares económicos sintéticos con semilla fija, y guarda los resultados en
+JSON (benchmarks/results/) para comparar ejecuciones.
+
+Backends (ver standins.py):
+  fake   fakeredis y PostgreSQL falso en proceso (sin servicios externos)
+  local  PostgreSQL y Redis reales (POSTGRES_*, PGPORT, REDIS_*): se crea una base de
+         datos desechable con database/init.sql y se usa la base Redis
+         BENCH_REDIS_DB (15); ambas se borran al terminar.
+         Con --spawn se arrancan initdb/pg_ctl y redis-server temporales.
+
+Cada suite corre en su propio proceso con el directorio del servicio en el
+path (todos los servicios tienen su main.py).
+
+Uso: python benchmarks/run.py [--sizes 1000,100000,1000000] [--suites processor,api]
+         [--backend fake|local] [--spawn] [--budget 300] [--output archivo.json]
+     python benchmarks/run.py --compare base.json nuevo.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import ExitStack
+from datetime import datetime
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(BENCH_DIR)
+
+SUITES = {
+    "processor": "services/processor",
+    "analyzer": "services/analyzer",
+    "collector": "services/collector",
+    "api": "services/api",
+}
+
+# Variables que cambian los resultados y se guardan con ellos
+RECORDED_ENV = [
+    "SCORING_TIER",
+    "SCORING_EARLY_EXIT",
+    "PROCESSOR_EXECUTION_MODE",
+    "PROCESSOR_WORKERS",
+    "COLLECTOR_FLUSH_ROWS",
+]
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_servers(stack: ExitStack, env: Dict[str, str]):
+    """PostgreSQL y Redis temporales en un directorio que se borra al salir"""
+    missing = [b for b in ("initdb", "pg_ctl", "redis-server") if not shutil.which(b)]
+    if missing:
+        sys.exit(f"--spawn requiere {', '.join(missing)} en el PATH")
+
+    workdir = stack.enter_context(tempfile.TemporaryDirectory(prefix="news-bench-"))
+    data = os.path.join(workdir, "pg")
+    pg_port, redis_port = free_port(), free_port()
+    user = env.get("POSTGRES_USER", "newsuser")
+
+    subprocess.run(
+        ["initdb", "-D", data, "-U", user, "--auth=trust"],
+        check=True,
+        capture_output=True,
+    )
+    subprocess.run(
+        [
+            "pg_ctl",
+            "-D",
+            data,
+            "-o",
+            f"-p {pg_port} -k {workdir} -c listen_addresses=127.0.0.1 -c fsync=off",
+            "-l",
+            os.path.join(workdir, "postgres.log"),
+            "-w",
+            "start",
+        ],
+        check=True,
+        capture_output=True,
+    )
+    stack.callback(
+        subprocess.run,
+        ["pg_ctl", "-D", data, "-m", "immediate", "stop"],
+        capture_output=True,
+    )
+
+    redis_server = subprocess.Popen(
+        ["redis-server", "--port", str(redis_port), "--save", "", "--appendonly", "no"],
+        stdout=subprocess.DEVNULL,
+    )
+    stack.callback(redis_server.terminate)
+
+    env.update(
+        POSTGRES_HOST="127.0.0.1",
+        PGPORT=str(pg_port),
+        BENCH_ADMIN_DB="postgres",
+        REDIS_HOST="127.0.0.1",
+        REDIS_PORT=str(redis_port),
+    )
+
+
+def create_bench_database(stack: ExitStack, env: Dict[str, str]):
+    """Base de datos desechable con el esquema del sistema, y base Redis limpia"""
+    import psycopg2
+    import redis
+
+    name = f"news_colcap_bench_{os.getpid()}"
+    params = {
+        "host": env.get("POSTGRES_HOST", "localhost"),
+        "user": env.get("POSTGRES_USER", "newsuser"),
+        "password": env.get("POSTGRES_PASSWORD", "newspass123"),
+        "port": env.get("PGPORT"),
+    }
+
+    for attempt in range(50):
+        try:
+            admin = psycopg2.connect(
+                database=env.get("BENCH_ADMIN_DB", "postgres"), **params
+            )
+            break
+        except psycopg2.OperationalError:
+            if attempt == 49:
+                raise
+            time.sleep(0.2)
+    admin.autocommit = True
+    admin.cursor().execute(f"CREATE DATABASE {name}")
+
+    def drop():
+        admin.cursor().execute(f"DROP DATABASE IF EXISTS {name}")
+        admin.close()
+
+    stack.callback(drop)
+
+    conn = psycopg2.connect(database=name, **params)
+    with open(os.path.join(ROOT, "database", "init.sql"), encoding="utf-8") as f:
+        conn.cursor().execute(f.read())
+    conn.commit()
+    conn.close()
+    env["POSTGRES_DB"] = name
+
+    redis_db = redis.Redis(
+        host=env.get("REDIS_HOST", "localhost"),
+        port=int(env.get("REDIS_PORT", 6379)),
+        db=int(env.setdefault("BENCH_REDIS_DB", "15")),
+    )
+    redis_db.flushdb()
+    stack.callback(redis_db.flushdb)
+
+
+def run_suite(suite: str, args, env: Dict[str, str]) -> List[Dict]:
+    service_dir = os.path.join(ROOT, SUITES[suite])
+    suite_env = dict(
+        env, PYTHONPATH=os.pathsep.join([service_dir, BENCH_DIR])
+    )
+    output = subprocess.run(
+        [
+            sys.executable,
+            os.path.join(BENCH_DIR, f"suite_{suite}.py"),
+            "--sizes",
+            ",".join(str(s) for s in args.sizes),
+            "--seed",
+            str(args.seed),
+            "--budget",
+            str(args.budget),
+            "--requests",
+            str(args.requests),
+        ],
+        cwd=service_dir,
+        env=suite_env,
+        stdout=subprocess.PIPE,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def print_results(results: List[Dict]):
+    print(f"{'suite':<10} {'benchmark':<42} {'tamaño':>9} {'ítems/s':>12} {'segundos':>9}")
+    for r in results:
+        label = f"{r['suite']:<10} {r['name']:<42} {r['size']:>9}"
+        if "skipped" in r:
+            print(f"{label} {'omitido':>12}  ({r['skipped']})")
+            continue
+        mark = " *" if r.get("truncated") else ""
+        print(f"{label} {r['items_per_second']:>12,.1f} {r['seconds']:>9.2f}{mark}")
+    if any(r.get("truncated") for r in results):
+        print("* detenido al agotar --budget (throughput sobre lo medido)")
+
+
+def compare(base_path: str, new_path: str):
+    """Variación de throughput entre dos ejecuciones"""
+    with open(base_path, encoding="utf-8") as f:
+        base = json.load(f)
+    with open(new_path, encoding="utf-8") as f:
+        new = json.load(f)
+
+    def key(r):
+        return r["suite"], r["name"], r["size"]
+
+    base_results = {key(r): r for r in base["results"] if "skipped" not in r}
+    print(f"base: {base['meta']['commit']} ({base['meta']['backend']})  "
+          f"nuevo: {new['meta']['commit']} ({new['meta']['backend']})")
+    for r in new["results"]:
+        old = base_results.get(key(r))
+        if "skipped" in r or old is None:
+            continue
+        change = r["items_per_second"] / old["items_per_second"] - 1
+        print(
+            f"{r['suite']:<10} {r['name']:<42} {r['size']:>9} "
+            f"{old['items_per_second']:>12,.1f} → {r['items_per_second']:>12,.1f} "
+            f"({change:+.1%})"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="1000,100000,1000000")
+    parser.add_argument("--suites", default=",".join(SUITES))
+    parser.add_argument("--backend", choices=["fake", "local"], default="fake")
+    parser.add_argument("--spawn", action="store_true")
+    parser.add_argument("--seed", type=int, default=42)
+    # Segundos máximos medidos por benchmark y tamaño (0 = sin límite)
+    parser.add_argument("--budget", type=float, default=300)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--output")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "NUEVO"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+        return
+
+    args.sizes = [int(s) for s in args.sizes.split(",")]
+    suites = args.suites.split(",")
+    unknown = set(suites) - SUITES.keys()
+    if unknown:
+        sys.exit(f"Suites desconocidas: {', '.join(sorted(unknown))}")
+
+    env = dict(os.environ, BENCH_BACKEND=args.backend)
+    started = datetime.utcnow()
+    results = []
+    with ExitStack() as stack:
+        if args.backend == "local":
+            if args.spawn:
+                spawn_servers(stack, env)
+            create_bench_database(stack, env)
+        for suite in suites:
+            print(f"▶ {suite}", file=sys.stderr)
+            try:
+                results.extend(run_suite(suite, args, env))
+            except subprocess.CalledProcessError as e:
+                # El error del proceso hijo ya salió por stderr
+                results.append(
+                    {
+                        "suite": suite,
+                        "name": "*",
+                        "size": "-",
+                        "skipped": f"la suite falló (código {e.returncode})",
+                    }
+                )
+
+    report = {
+        "meta": {
+            "timestamp": started.isoformat(),
+            "commit": git_commit(),
+            "backend": args.backend,
+            "sizes": args.sizes,
+            "seed": args.seed,
+            "budget_seconds": args.budget,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "env": {k: os.environ[k] for k in RECORDED_ENV if k in os.environ},
+        },
+        "results": results,
+    }
+
+    output = args.output or os.path.join(
+        BENCH_DIR,
+        "results",
+        f"{started.strftime('%Y%m%dT%H%M%S')}-{report['meta']['commit']}-{args.backend}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print_results(results)
+    print(f"\nResultados guardados en {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,182 @@
+"""
+Sustitutos de Redis y PostgreSQL para los benchmarks
+BENCH_BACKEND=fake (por defecto): fakeredis y una conexión PostgreSQL falsa
+en proceso. La conexión falsa serializa los parámetros igual que psycopg2
+(mogrify, COPY) pero no ejecuta nada: mide el coste del lado del cliente, y
+las lecturas devuelven las filas de un responder del benchmark.
+
+BENCH_BACKEND=local: PostgreSQL y Redis reales (variables POSTGRES_*/REDIS_*)
+sobre la base de datos desechable que crea run.py (POSTGRES_DB) y la base
+Redis BENCH_REDIS_DB, nunca sobre los datos del sistema.
+"""
+
+import csv
+import io
+import os
+import random
+from typing import Callable, Dict, List, Optional
+
+import psycopg2
+import redis
+from psycopg2.extensions import adapt
+
+from headlines import generate
+
+BACKEND = os.getenv("BENCH_BACKEND", "fake")
+
+# Filas de lectura de la conexión falsa: responder(sql, params) -> filas
+Responder = Callable[[str, object], List[Dict]]
+
+_fake_server = None
+
+
+def redis_client(decode_responses: bool = True) -> redis.Redis:
+    """Cliente Redis del backend (todos los fakes comparten servidor)"""
+    global _fake_server
+    if BACKEND == "fake":
+        import fakeredis
+
+        if _fake_server is None:
+            _fake_server = fakeredis.FakeServer()
+        return fakeredis.FakeRedis(
+            server=_fake_server, decode_responses=decode_responses
+        )
+    return redis.Redis(
+        host=os.getenv("REDIS_HOST", "localhost"),
+        port=int(os.getenv("REDIS_PORT", 6379)),
+        db=int(os.getenv("BENCH_REDIS_DB", 15)),
+        decode_responses=decode_responses,
+    )
+
+
+def connector(responder: Optional[Responder] = None) -> Callable:
+    """Función de conexión a PostgreSQL del backend (sustituye get_db_connection)"""
+    if BACKEND == "fake":
+        return lambda: FakeConnection(responder)
+    return lambda: psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        database=os.getenv("POSTGRES_DB", "news_colcap_bench"),
+        user=os.getenv("POSTGRES_USER", "newsuser"),
+        password=os.getenv("POSTGRES_PASSWORD", "newspass123"),
+    )
+
+
+def _quote(value) -> str:
+    """Literal SQL de un parámetro, con la adaptación de psycopg2"""
+    if isinstance(value, (list, tuple)) and not isinstance(value, str):
+        return "ARRAY[" + ",".join(_quote(item) for item in value) + "]"
+    adapted = adapt(value)
+    if hasattr(adapted, "encoding"):
+        adapted.encoding = "utf8"
+    return adapted.getquoted().decode()
+
+
+class FakeCursor:
+    def __init__(self, connection: "FakeConnection"):
+        self.connection = connection
+        self.rowcount = -1
+        self._rows: List[Dict] = []
+
+    def mogrify(self, sql, params=None) -> bytes:
+        if isinstance(sql, bytes):
+            sql = sql.decode()
+        if params is None:
+            return sql.encode()
+        if isinstance(params, dict):
+            return (sql % {k: _quote(v) for k, v in params.items()}).encode()
+        return (sql % tuple(_quote(v) for v in params)).encode()
+
+    def execute(self, sql, params=None):
+        statement = self.mogrify(sql, params)
+        self.connection.statements += 1
+        self.connection.bytes_sent += len(statement)
+        responder = self.connection.responder
+        self._rows = list(responder(sql, params)) if responder else []
+        self.rowcount = len(self._rows)
+
+    def copy_expert(self, sql, file):
+        self.connection.statements += 1
+        self.connection.bytes_sent += len(file.read())
+
+    def fetchall(self) -> List[Dict]:
+        rows, self._rows = self._rows, []
+        return rows
+
+    def fetchone(self) -> Optional[Dict]:
+        return self._rows.pop(0) if self._rows else None
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class FakeConnection:
+    """Conexión PostgreSQL en proceso que cuenta sentencias y bytes enviados"""
+
+    encoding = "UTF8"
+
+    def __init__(self, responder: Optional[Responder] = None):
+        self.responder = responder
+        self.statements = 0
+        self.bytes_sent = 0
+
+    def cursor(self, *args, **kwargs) -> FakeCursor:
+        return FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def populate_news(conn, size: int, seed: int = 42):
+    """
+    (local) Tabla news con size artículos sintéticos ya puntuados, cargados
+    con COPY por bloques. Borra el contenido previo de la base desechable.
+    """
+    rng = random.Random(seed)
+    cursor = conn.cursor()
+    cursor.execute("TRUNCATE news RESTART IDENTITY CASCADE")
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for i, article in enumerate(generate(size, seed), 1):
+        score = rng.uniform(-0.5, 1.2)
+        label = "positive" if score >= 0.30 else "negative" if score <= 0.22 else "neutral"
+        writer.writerow(
+            [
+                article["url"],
+                article["title"],
+                article["content"],
+                article["source"],
+                article["published_date"].isoformat(),
+                article["country"],
+                score,
+                label,
+                "{mercados}",
+                "{colcap}",
+            ]
+        )
+        if i % 50000 == 0 or i == size:
+            buffer.seek(0)
+            cursor.copy_expert(
+                """
+                COPY news (url, title, content, source, published_date, country,
+                           sentiment_score, sentiment_label, categories, keywords)
+                FROM STDIN WITH (FORMAT csv)
+            """,
+                buffer,
+            )
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+    cursor.execute("ANALYZE news")
+    conn.commit()
+    cursor.close()
@@ -0,0 +1,99 @@
+"""
+Suite del analyzer: calculate_correlation y save_correlations sobre el
+agregado diario de size artículos repartidos en un año, y (solo con backend
+local) get_daily_news_sentiment sobre una tabla news de size filas.
+"""
+
+import numpy as np
+import pandas as pd
+
+from harness import measure_once, run_suite, skipped
+from headlines import DAYS
+from main import COLCAPAnalyzer
+from standins import BACKEND, connector, populate_news, redis_client
+
+SUITE = "analyzer"
+
+
+def daily_frames(size: int, seed: int):
+    """
+    news_df y colcap_df con la forma de get_daily_news_sentiment y
+    get_colcap_from_db para size artículos (ids 1..size)
+    """
+    rng = np.random.default_rng(seed)
+    days = pd.date_range(end="2024-12-31", periods=DAYS, freq="D")
+    day_index = rng.integers(0, DAYS, size)
+    scores = rng.uniform(-0.5, 1.2, size)
+    articles = pd.DataFrame(
+        {"date": days[day_index], "score": scores, "id": np.arange(1, size + 1)}
+    )
+    grouped = articles.groupby("date")
+    news_df = pd.DataFrame(
+        {
+            "news_count": grouped.size(),
+            "avg_sentiment": grouped["score"].mean(),
+            "sentiment_stddev": grouped["score"].std(),
+            "positive_count": grouped["score"].apply(lambda s: int((s >= 0.30).sum())),
+            "negative_count": grouped["score"].apply(lambda s: int((s <= 0.22).sum())),
+            "news_ids": grouped["id"].apply(list),
+        }
+    )
+
+    trading_days = days[days.dayofweek < 5]
+    close = 1300 * np.cumprod(1 + rng.normal(0, 0.01, len(trading_days)))
+    colcap_df = pd.DataFrame({"Close": close}, index=trading_days)
+    colcap_df["Daily_Change"] = colcap_df["Close"].pct_change() * 100
+    return news_df, colcap_df
+
+
+def run(args):
+    analyzer = COLCAPAnalyzer()
+    analyzer.redis_client = redis_client()
+    analyzer.get_db_connection = connector()
+
+    results = []
+    for size in args.sizes:
+        news_df, colcap_df = daily_frames(size, args.seed)
+        results.append(
+            measure_once(
+                SUITE,
+                "calculate_correlation",
+                size,
+                lambda: analyzer.calculate_correlation(news_df, colcap_df),
+            )
+        )
+        results.append(
+            measure_once(
+                SUITE,
+                "save_correlations",
+                size,
+                lambda: analyzer.save_correlations(news_df, colcap_df),
+            )
+        )
+
+        if BACKEND != "local":
+            results.append(
+                skipped(
+                    SUITE, "get_daily_news_sentiment", size, "requiere backend local"
+                )
+            )
+            continue
+        conn = analyzer.get_db_connection()
+        try:
+            populate_news(conn, size, args.seed)
+        finally:
+            conn.close()
+        results.append(
+            measure_once(
+                SUITE,
+                "get_daily_news_sentiment",
+                size,
+                # Ventana amplia: los artículos sintéticos son de 2024
+                lambda: analyzer.get_daily_news_sentiment(days_back=3650),
+            )
+        )
+    return results
+
+
+if __name__ == "__main__":
+    run_suite(run)
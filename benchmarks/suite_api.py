@@ -0,0 +1,153 @@
+"""
+Suite de la API: endpoints más consultados por el dashboard, con TestClient
+(en proceso, sin red). Con backend local las consultas corren sobre una tabla
+news de size filas; con el fake se mide solo FastAPI, validación y
+serialización de las filas que devuelve el responder.
+"""
+
+import time
+from datetime import date, timedelta
+
+from fastapi.testclient import TestClient
+
+import main as api
+from harness import result, run_suite
+from headlines import generate
+from standins import BACKEND, connector, populate_news, redis_client
+
+SUITE = "api"
+
+ENDPOINTS = [
+    "/api/stats",
+    "/api/news/recent?limit=100",
+    "/api/news/sentiment-distribution",
+    "/api/colcap/latest?days=30",
+    "/api/correlations?days=365",
+    "/api/news/search?query=inflación&limit=20",
+    "/api/metrics",
+]
+
+CORRELATION_STATS = '{"pearson_correlation": 0.12, "sample_size": 240}'
+
+
+def fake_responder(size: int, seed: int):
+    """Filas con la forma de cada consulta de la API"""
+    news = [
+        {
+            "id": i,
+            "title": article["title"],
+            "url": article["url"],
+            "source": article["source"],
+            "published_date": article["published_date"],
+            "sentiment_score": 0.31,
+            "sentiment_label": "positive",
+            "categories": ["mercados"],
+        }
+        for i, article in enumerate(generate(100, seed), 1)
+    ]
+    days = [date(2024, 12, 31) - timedelta(days=d) for d in range(365)]
+    colcap = [
+        {"date": d, "close_price": 1300.0, "daily_change": 0.1, "volume": 1000}
+        for d in days
+    ]
+    correlations = [
+        {
+            "date": d,
+            "news_count": max(1, size // 365),
+            "avg_sentiment": 0.3,
+            "colcap_change": 0.1,
+            "correlation_coefficient": 0.12,
+        }
+        for d in days
+    ]
+    distribution = [
+        {"sentiment_label": label, "count": size // 3}
+        for label in ("positive", "neutral", "negative")
+    ]
+
+    def respond(sql, params):
+        if "GROUP BY sentiment_label" in sql:
+            return distribution
+        if "GROUP BY lane" in sql:
+            return [{"lane": "live", "count": size}]
+        if "COUNT(*)" in sql:
+            return [{"count": size}]
+        if "AVG(sentiment_score)" in sql:
+            return [{"avg": 0.31}]
+        if "FROM correlations" in sql:
+            return correlations[: params[0]]
+        if "FROM colcap_data" in sql:
+            return colcap[: params[0] if params else 1]
+        if "FROM news" in sql:
+            return news[: params[-1]]
+        return []
+
+    return respond
+
+
+def populate(size: int, seed: int):
+    """(local) news con size artículos, un año de COLCAP y de correlaciones"""
+    conn = api.get_db()
+    try:
+        populate_news(conn, size, seed)
+        cursor = conn.cursor()
+        cursor.execute("TRUNCATE colcap_data, correlations")
+        cursor.execute(
+            """
+            INSERT INTO colcap_data (date, close_price, daily_change, volume)
+            SELECT d, 1300, 0.1, 1000
+            FROM generate_series('2024-01-01'::date, '2024-12-31', '1 day') AS d
+        """
+        )
+        cursor.execute(
+            """
+            INSERT INTO correlations (date, news_count, avg_sentiment,
+                                      colcap_change, correlation_coefficient)
+            SELECT d, %s, 0.3, 0.1, 0.12
+            FROM generate_series('2024-01-01'::date, '2024-12-31', '1 day') AS d
+        """,
+            (max(1, size // 366),),
+        )
+        conn.commit()
+        cursor.close()
+    finally:
+        conn.close()
+
+
+def run(args):
+    api.redis_client = redis_client()
+    api.redis_client.set("latest_correlation_stats", CORRELATION_STATS)
+    client = TestClient(api.app)
+
+    results = []
+    for size in args.sizes:
+        if BACKEND == "local":
+            api.get_db = connector()
+            populate(size, args.seed)
+        else:
+            api.get_db = connector(fake_responder(size, args.seed))
+
+        for endpoint in ENDPOINTS:
+            latencies = []
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.get(endpoint)
+                latencies.append(time.perf_counter() - start)
+                response.raise_for_status()
+            latencies.sort()
+            results.append(
+                result(
+                    SUITE,
+                    endpoint,
+                    size,
+                    len(latencies),
+                    sum(latencies),
+                    p50_ms=round(latencies[len(latencies) // 2] * 1000, 3),
+                    p95_ms=round(latencies[int(len(latencies) * 0.95)] * 1000, 3),
+                )
+            )
+    return results
+
+
+if __name__ == "__main__":
+    run_suite(run)
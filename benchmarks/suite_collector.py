@@ -0,0 +1,66 @@
+"""
+Suite del collector: save_to_database por lotes de COLLECTOR_FLUSH_ROWS
+artículos (lo que vacía el ArticleBuffer) en carril live y backfill, y de
+nuevo con los mismos artículos (ruta ON CONFLICT DO NOTHING), más la
+notificación al processor. Cada caso se mide con los dos modos de inserción:
+copy (COPY a news_staging + INSERT ... SELECT) y values (execute_values).
+"""
+
+from article_pipeline import INSERT_MODES
+from harness import measure_chunks, run_suite
+from headlines import generate
+from main import GDELTCollector
+from standins import BACKEND, connector, redis_client
+
+SUITE = "collector"
+
+
+def run(args):
+    collector = GDELTCollector()
+    collector.redis_client = redis_client()
+    collector.get_db_connection = connector()
+
+    def truncate():
+        if BACKEND != "local":
+            return
+        conn = collector.get_db_connection()
+        cursor = conn.cursor()
+        cursor.execute("TRUNCATE news RESTART IDENTITY CASCADE")
+        conn.commit()
+        conn.close()
+
+    def save(lane):
+        def fn(chunk):
+            ids = collector.save_to_database(chunk, lane=lane)
+            collector.queue_for_processing(ids, lane=lane)
+
+        return fn
+
+    results = []
+    for size in args.sizes:
+        for mode in INSERT_MODES:
+            collector.insert_mode = mode
+            for name, lane, fresh in (
+                ("save_to_database", "live", True),
+                ("save_to_database (duplicados)", "live", False),
+                ("save_to_database (backfill)", "backfill", True),
+            ):
+                if fresh:
+                    truncate()
+                results.append(
+                    measure_chunks(
+                        SUITE,
+                        f"{name} [{mode}]",
+                        size,
+                        generate(size, args.seed),
+                        save(lane),
+                        args.budget,
+                        chunk_size=collector.flush_rows,
+                        insert_mode=mode,
+                    )
+                )
+    return results
+
+
+if __name__ == "__main__":
+    run_suite(run)
@@ -0,0 +1,64 @@
+"""
+Suite del processor: analyze_sentiment y process_article por artículo
+(nivel y early exit según SCORING_TIER / SCORING_EARLY_EXIT, sin caché de
+puntuación para medir siempre el cálculo completo).
+"""
+
+import os
+
+os.environ.update(SCORING_CACHE_ENABLED="false", PROCESSOR_FAST_START="false")
+
+from harness import measure_chunks, run_suite  # noqa: E402
+from headlines import generate  # noqa: E402
+from main import NewsProcessor  # noqa: E402
+from standins import BACKEND, redis_client  # noqa: E402
+
+SUITE = "processor"
+
+
+def run(args):
+    processor = NewsProcessor()
+    processor.redis_client = redis_client()
+    # BITFIELD en fakeredis es Python puro sobre el sketch entero (segundos por
+    # flush): con el fake la tabla DF se queda local y no se mide su envío
+    processor.document_frequency.redis_client = (
+        redis_client(decode_responses=False) if BACKEND == "local" else None
+    )
+
+    def analyze(chunk):
+        for article in chunk:
+            processor.analyze_sentiment(f"{article['title']} {article['content']}")
+
+    def process(chunk):
+        for i, article in enumerate(chunk):
+            result = processor.process_article(
+                {"id": i, "title": article["title"], "content": article["content"]}
+            )
+            # Como flush_updates al escribir el artículo
+            processor.document_frequency.add_document(result["document_terms"])
+        # Como publish_batch_stats tras cada lote
+        processor.document_frequency.flush()
+
+    results = []
+    for size in args.sizes:
+        for name, fn in (("analyze_sentiment", analyze), ("process_article", process)):
+            results.append(
+                measure_chunks(
+                    SUITE,
+                    name,
+                    size,
+                    generate(size, args.seed),
+                    fn,
+                    args.budget,
+                    # Tamaño de lote por defecto del processor
+                    chunk_size=50 if name == "process_article" else 1000,
+                    scoring_tier=processor.scoring_tier,
+                    early_exit=processor.early_exit,
+                    shared_df=BACKEND == "local",
+                )
+            )
+    return results
+
+
+if __name__ == "__main__":
+    run_suite(run)
@@ -9,12 +9,75 @@ CREATE TABLE IF NOT EXISTS news (
     country VARCHAR(10),
     sentiment_score FLOAT,
     sentiment_label VARCHAR(20),
+    keyword_score FLOAT,
+    textblob_polarity FLOAT,
+    vader_compound FLOAT,
     categories TEXT[],
     keywords TEXT[],
+    lexicon_version TEXT,
+    needs_rescore BOOLEAN NOT NULL DEFAULT FALSE,
+    lane VARCHAR(10) NOT NULL DEFAULT 'live',
+    scoring_attempts INTEGER NOT NULL DEFAULT 0,
+    claimed_by TEXT,
+    lease_expires_at TIMESTAMP,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Upgrade databases created before these columns existed (idempotent)
+ALTER TABLE news
+    ADD COLUMN IF NOT EXISTS keyword_score FLOAT,
+    ADD COLUMN IF NOT EXISTS textblob_polarity FLOAT,
+    ADD COLUMN IF NOT EXISTS vader_compound FLOAT,
+    ADD COLUMN IF NOT EXISTS lexicon_version TEXT,
+    ADD COLUMN IF NOT EXISTS needs_rescore BOOLEAN NOT NULL DEFAULT FALSE,
+    ADD COLUMN IF NOT EXISTS lane VARCHAR(10) NOT NULL DEFAULT 'live',
+    ADD COLUMN IF NOT EXISTS scoring_attempts INTEGER NOT NULL DEFAULT 0,
+    ADD COLUMN IF NOT EXISTS claimed_by TEXT,
+    ADD COLUMN IF NOT EXISTS lease_expires_at TIMESTAMP;
+
+-- Lexicon versions (tables used to score each article)
+CREATE TABLE IF NOT EXISTS lexicon_versions (
+    version TEXT PRIMARY KEY,
+    lexicon JSONB NOT NULL,
+    lemmatization_rules JSONB NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Inverted index: lexicon term -> articles containing it
+CREATE TABLE IF NOT EXISTS news_terms (
+    term TEXT NOT NULL,
+    news_id INTEGER NOT NULL REFERENCES news(id) ON DELETE CASCADE,
+    PRIMARY KEY (term, news_id)
+);
+
+-- Dead letters: articles that failed scoring too many times
+CREATE TABLE IF NOT EXISTS dead_letters (
+    news_id INTEGER PRIMARY KEY REFERENCES news(id) ON DELETE CASCADE,
+    attempts INTEGER NOT NULL,
+    last_error TEXT,
+    failed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Collector high-water marks: newest GDELT seendate saved per keyword
+CREATE TABLE IF NOT EXISTS collector_watermarks (
+    keyword TEXT PRIMARY KEY,
+    last_seendate TIMESTAMP NOT NULL,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Collector staging: batches are COPYed here and moved to news with
+-- INSERT ... SELECT ... ON CONFLICT DO NOTHING in the same transaction
+CREATE UNLOGGED TABLE IF NOT EXISTS news_staging (
+    url TEXT,
+    title TEXT,
+    content TEXT,
+    source TEXT,
+    published_date TIMESTAMP,
+    country VARCHAR(10),
+    lane VARCHAR(10)
+);
+
 -- Create COLCAP index data table
 CREATE TABLE IF NOT EXISTS colcap_data (
     id SERIAL PRIMARY KEY,
@@ -54,12 +117,17 @@ CREATE TABLE IF NOT EXISTS processing_status (
 );
 
 -- Create indexes for performance
-CREATE INDEX idx_news_published_date ON news(published_date DESC);
-CREATE INDEX idx_news_country ON news(country);
-CREATE INDEX idx_news_sentiment ON news(sentiment_score);
-CREATE INDEX idx_colcap_date ON colcap_data(date DESC);
-CREATE INDEX idx_correlations_date ON correlations(date DESC);
-CREATE INDEX idx_processing_status ON processing_status(status, service_name);
+CREATE INDEX IF NOT EXISTS idx_news_published_date ON news(published_date DESC);
+CREATE INDEX IF NOT EXISTS idx_news_country ON news(country);
+CREATE INDEX IF NOT EXISTS idx_news_sentiment ON news(sentiment_score);
+CREATE INDEX IF NOT EXISTS idx_news_unprocessed ON news(published_date DESC) WHERE sentiment_score IS NULL OR needs_rescore;
+CREATE INDEX IF NOT EXISTS idx_news_pending_live ON news(published_date DESC) WHERE (sentiment_score IS NULL OR needs_rescore) AND lane = 'live';
+CREATE INDEX IF NOT EXISTS idx_news_pending_backfill ON news(id) WHERE (sentiment_score IS NULL OR needs_rescore) AND lane = 'backfill';
+CREATE INDEX IF NOT EXISTS idx_news_terms_news_id ON news_terms(news_id);
+CREATE INDEX IF NOT EXISTS idx_news_lexicon_version ON news(lexicon_version);
+CREATE INDEX IF NOT EXISTS idx_colcap_date ON colcap_data(date DESC);
+CREATE INDEX IF NOT EXISTS idx_correlations_date ON correlations(date DESC);
+CREATE INDEX IF NOT EXISTS idx_processing_status ON processing_status(status, service_name);
 
 -- Create view for daily summary
 CREATE OR REPLACE VIEW daily_news_summary AS
@@ -84,6 +152,7 @@ END;
 $$ language 'plpgsql';
 
 -- Create trigger for news table
+DROP TRIGGER IF EXISTS update_news_updated_at ON news;
 CREATE TRIGGER update_news_updated_at BEFORE UPDATE ON news
 FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
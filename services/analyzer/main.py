@@ -6,9 +6,12 @@ Analiza correlaciones entre noticias y el índice COLCAP
 import json
 import logging
 import os
+import threading
 import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict
+from typing import Dict, List, Optional
 
 import pandas as pd
 import psycopg2
@@ -46,6 +49,30 @@ class COLCAPAnalyzer:
         # Símbolo del COLCAP en Yahoo Finance (GXG es el ticker correcto)
         self.colcap_symbol = "GXG"
 
+        # Redis Streams: disparadores de análisis publicados por el processor
+        self.trigger_stream = "analysis_trigger"
+        self.trigger_group = "analyzers"
+        self.consumer_name = os.getenv("ANALYZER_CONSUMER", "analyzer")
+        # Sin disparadores, se analiza igualmente cada 12 horas
+        self.max_idle_ms = int(os.getenv("ANALYSIS_INTERVAL", 43200)) * 1000
+
+        # Debounce: una ráfaga de disparadores se atiende con un único análisis
+        # cuando pasan quiet_seconds sin nuevos, o como mucho max_delay_seconds
+        # después del primero
+        self.quiet_seconds = float(os.getenv("ANALYZER_QUIET_SECONDS", 30))
+        self.max_delay_seconds = float(os.getenv("ANALYZER_MAX_DELAY_SECONDS", 300))
+
+        # Lock en Redis: nunca dos análisis a la vez (réplicas y CronJob)
+        self.lock_key = "analysis_lock"
+        self.lock_ttl = int(os.getenv("ANALYZER_LOCK_TTL", 1800))
+
+        # Yahoo Finance solo publica un cierre diario: los análisis disparados
+        # reutilizan los datos de la BD si se descargaron hace poco
+        self.colcap_refresh_seconds = int(
+            os.getenv("ANALYZER_COLCAP_REFRESH_SECONDS", 3600)
+        )
+        self.colcap_fetched_key = "colcap_last_fetch"
+
         logger.info("COLCAP Analyzer inicializado")
 
     def get_db_connection(self):
@@ -96,11 +123,11 @@ class COLCAPAnalyzer:
             logger.error(traceback.format_exc())
             return pd.DataFrame()
 
-    def save_colcap_data(self, df: pd.DataFrame):
-        """Guardar datos del COLCAP en la base de datos"""
+    def save_colcap_data(self, df: pd.DataFrame) -> bool:
+        """Guardar datos del COLCAP en la base de datos (True si se guardaron)"""
         if df.empty:
             logger.warning("DataFrame vacío, no hay datos COLCAP para guardar")
-            return
+            return False
 
         conn = self.get_db_connection()
         cursor = conn.cursor()
@@ -143,10 +170,12 @@ class COLCAPAnalyzer:
             conn.commit()
 
             logger.info(f"✅ Guardados/actualizados {len(records)} registros COLCAP")
+            return True
 
         except Exception:
             conn.rollback()
             logger.exception("❌ Error guardando datos COLCAP")
+            return False
         finally:
             cursor.close()
             conn.close()
@@ -373,18 +402,138 @@ class COLCAPAnalyzer:
             conn.close()
             logger.info("🔌 [DEBUG] Conexión a BD cerrada")
 
-    def run_analysis(self):
-        """Ejecutar análisis completo"""
+    def get_saved_colcap_data(self, days_back: int = 90) -> pd.DataFrame:
+        """Datos COLCAP descargados de Yahoo Finance y guardados en colcap_data"""
+        conn = self.get_db_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+        try:
+            cursor.execute(
+                """
+                SELECT date, close_price AS "Close", daily_change AS "Daily_Change"
+                FROM colcap_data
+                WHERE date >= CURRENT_DATE - INTERVAL '%s days'
+                ORDER BY date ASC
+            """,
+                (days_back,),
+            )
+            rows = cursor.fetchall()
+            if not rows:
+                return pd.DataFrame()
+
+            df = pd.DataFrame(rows)
+            df["date"] = pd.to_datetime(df["date"])
+            df.set_index("date", inplace=True)
+            df["Close"] = df["Close"].astype(float)
+            df["Daily_Change"] = df["Daily_Change"].astype(float)
+
+            logger.info(f"✅ Cargados {len(df)} registros COLCAP descargados desde BD")
+            return df
+
+        except Exception:
+            logger.exception("❌ Error obteniendo datos COLCAP descargados desde BD")
+            return pd.DataFrame()
+        finally:
+            cursor.close()
+            conn.close()
+
+    def acquire_lock(self) -> Optional[str]:
+        """Tomar el lock de análisis; None si otro análisis está en curso"""
+        token = uuid.uuid4().hex
+        if self.redis_client.set(self.lock_key, token, nx=True, ex=self.lock_ttl):
+            return token
+        return None
+
+    def release_lock(self, token: str):
+        """Liberar el lock solo si sigue siendo nuestro (no expiró y lo tomó otro)"""
+        self.redis_client.eval(
+            """
+            if redis.call('GET', KEYS[1]) == ARGV[1] then
+                return redis.call('DEL', KEYS[1])
+            end
+            return 0
+            """,
+            1,
+            self.lock_key,
+            token,
+        )
+
+    def renew_lock(self, token: str) -> bool:
+        """Extender el TTL del lock si sigue siendo nuestro"""
+        return bool(
+            self.redis_client.eval(
+                """
+                if redis.call('GET', KEYS[1]) == ARGV[1] then
+                    return redis.call('EXPIRE', KEYS[1], ARGV[2])
+                end
+                return 0
+                """,
+                1,
+                self.lock_key,
+                token,
+                self.lock_ttl,
+            )
+        )
+
+    def keep_lock_alive(self, token: str, stop: threading.Event):
+        """Renovar el lock cada tercio del TTL mientras dure el análisis"""
+        while not stop.wait(self.lock_ttl / 3):
+            try:
+                if not self.renew_lock(token):
+                    logger.warning("⚠️ Lock de análisis perdido durante la ejecución")
+                    return
+            except redis.RedisError as e:
+                logger.warning(f"No se pudo renovar el lock de análisis: {str(e)}")
+
+    def colcap_is_fresh(self) -> bool:
+        """Los datos COLCAP de colcap_data se descargaron hace menos del intervalo"""
+        fetched = self.redis_client.get(self.colcap_fetched_key)
+        return fetched is not None and (
+            time.time() - float(fetched) < self.colcap_refresh_seconds
+        )
+
+    def run_analysis(self, refresh_colcap: bool = True) -> bool:
+        """
+        Ejecutar análisis completo (sin solaparse con otro en curso).
+        refresh_colcap=False reutiliza los datos COLCAP de la BD si son recientes.
+        Returns: False si no se ejecutó porque otro análisis tenía el lock
+        """
+        token = self.acquire_lock()
+        if token is None:
+            logger.info("⏳ Análisis en curso en otro proceso, se omite")
+            return False
+
+        # Un análisis largo no debe perder el lock por TTL a mitad de ejecución
+        stop = threading.Event()
+        heartbeat = threading.Thread(
+            target=self.keep_lock_alive, args=(token, stop), daemon=True
+        )
+        heartbeat.start()
+        try:
+            self._run_analysis(refresh_colcap)
+        finally:
+            stop.set()
+            heartbeat.join()
+            self.release_lock(token)
+        return True
+
+    def _run_analysis(self, refresh_colcap: bool):
         logger.info("=" * 50)
         logger.info("Iniciando análisis de correlación")
         logger.info("=" * 50)
         
         start_time = time.time()
+        skip_download = not refresh_colcap and self.colcap_is_fresh()
         
         # Fetch COLCAP y News sentiment simultáneamente
         with ThreadPoolExecutor(max_workers=3) as executor:
             # Lanzar tareas I/O en paralelo
-            future_colcap = executor.submit(self.fetch_colcap_data, 365)
+            if skip_download:
+                # La última descarga, tal como se guardó en colcap_data
+                logger.info("Datos COLCAP recientes, se omite Yahoo Finance")
+                future_colcap = executor.submit(self.get_saved_colcap_data, 365)
+            else:
+                future_colcap = executor.submit(self.fetch_colcap_data, 365)
             future_news = executor.submit(self.get_daily_news_sentiment, 365)
             future_colcap_db = executor.submit(self.get_colcap_from_db, 365)
             
@@ -397,15 +546,19 @@ class COLCAPAnalyzer:
         
         # Usar datos de Yahoo Finance, o BD como fallback
         if colcap_df.empty:
-            logger.warning("No se pudo descargar de Yahoo Finance, usando datos de BD")
-            colcap_df = self.get_colcap_from_db(days_back=365)
+            logger.warning(
+                "No se pudo obtener la descarga de Yahoo Finance, usando datos de BD"
+            )
+            colcap_df = colcap_db_df
 
             if colcap_df.empty:
                 logger.error("No hay datos del COLCAP (ni en Yahoo ni en BD)")
                 return
-        else:
-            # Guardar datos nuevos de Yahoo Finance
-            self.save_colcap_data(colcap_df)
+        elif not skip_download:
+            # Guardar datos nuevos de Yahoo Finance; solo entonces cuentan como
+            # recientes para los análisis que los reutilizan
+            if self.save_colcap_data(colcap_df):
+                self.redis_client.set(self.colcap_fetched_key, time.time())
         
         # Verificar datos de noticias
         if news_df.empty:
@@ -431,24 +584,95 @@ class COLCAPAnalyzer:
             )
             logger.info("✅ Estadísticas de correlación guardadas en Redis")
 
-        # 4. Guardar correlaciones diarias
-        self.save_correlations(news_df, colcap_df)
-
         logger.info("✅ Análisis completado exitosamente")
         logger.info("=" * 50)
 
+    def ensure_consumer_group(self):
+        """Crear el grupo de consumidores (y el stream) si no existen"""
+        try:
+            self.redis_client.xgroup_create(
+                self.trigger_stream, self.trigger_group, id="0", mkstream=True
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def read_triggers(self, block_ms: int) -> List[str]:
+        """Leer disparadores pendientes (propios sin confirmar primero, luego nuevos)"""
+        for stream_id, block in (("0", None), (">", block_ms)):
+            response = self.redis_client.xreadgroup(
+                self.trigger_group,
+                self.consumer_name,
+                {self.trigger_stream: stream_id},
+                count=10000,
+                block=block,
+            )
+            message_ids = [
+                message_id for _, entries in response for message_id, _ in entries
+            ]
+            if message_ids:
+                return message_ids
+        return []
+
+    def collect_burst(self, message_ids: List[str]) -> List[str]:
+        """
+        Debounce: seguir leyendo disparadores hasta quiet_seconds sin nuevos
+        o hasta max_delay_seconds desde el primero, y devolverlos todos
+        """
+        deadline = time.time() + self.max_delay_seconds
+        while True:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            wait_ms = int(min(self.quiet_seconds, remaining) * 1000)
+            response = self.redis_client.xreadgroup(
+                self.trigger_group,
+                self.consumer_name,
+                {self.trigger_stream: ">"},
+                count=10000,
+                block=max(1, wait_ms),
+            )
+            new_ids = [
+                message_id for _, entries in response for message_id, _ in entries
+            ]
+            if not new_ids:
+                break
+            message_ids.extend(new_ids)
+        return message_ids
+
     def run(self):
         """Ejecutar servicio"""
         logger.info("🚀 Iniciando COLCAP Analyzer Service")
 
+        self.ensure_consumer_group()
+
         # Ejecutar análisis al iniciar
         self.run_analysis()
 
-        # Ejecutar análisis cada 12 horas
+        # Ejecutar análisis al recibir disparadores (o cada 12 horas)
         while True:
             try:
-                time.sleep(43200)  # 12 horas
-                self.run_analysis()
+                message_ids = self.read_triggers(self.max_idle_ms)
+                if message_ids:
+                    burst_start = time.time()
+                    message_ids = self.collect_burst(message_ids)
+                    logger.info(
+                        f"Recibidos {len(message_ids)} disparadores de análisis "
+                        f"(agrupados en {time.time() - burst_start:.1f}s)"
+                    )
+
+                # Todos los disparadores leídos se atienden con un único análisis;
+                # el análisis periódico sí vuelve a descargar el COLCAP
+                if not self.run_analysis(refresh_colcap=not message_ids):
+                    # Otro análisis en curso: los disparadores quedan pendientes
+                    # y se releen tras el periodo de espera
+                    time.sleep(self.quiet_seconds)
+                    continue
+
+                if message_ids:
+                    self.redis_client.xack(
+                        self.trigger_stream, self.trigger_group, *message_ids
+                    )
 
             except KeyboardInterrupt:
                 logger.info("Deteniendo analizador...")
@@ -457,7 +681,6 @@ class COLCAPAnalyzer:
                 logger.error(f"Error en loop principal: {str(e)}")
                 time.sleep(3600)  # Esperar 1 hora en caso de error
 
-
 if __name__ == "__main__":
     analyzer = COLCAPAnalyzer()
     analyzer.run()
@@ -0,0 +1,239 @@
+"""
+Barrido de pesos de sentimiento
+Recalcula el score final de cada artículo a partir de los componentes
+guardados (keyword_score, textblob_polarity, vader_compound) para miles de
+combinaciones de pesos, amplificación y offset, y las ordena por correlación
+del sentimiento diario con la variación del COLCAP. Todo es NumPy vectorizado
+sobre las columnas: no se vuelve a puntuar ningún texto.
+
+Para la mejor combinación se barren también los umbrales de etiqueta,
+ordenados por la correlación del balance diario (positivas - negativas) / total.
+
+Uso: python sweep_weights.py [--days 90] [--top 20] [--output resultados.csv]
+"""
+
+import argparse
+import itertools
+import logging
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+from psycopg2.extras import RealDictCursor
+
+from main import COLCAPAnalyzer
+
+logger = logging.getLogger(__name__)
+
+# Configuración actual del processor (services/processor/scoring.py)
+CURRENT = {
+    "keyword_weight": 0.65,
+    "textblob_weight": 0.25,
+    "vader_weight": 0.1,
+    "amplifier": 2.5,
+    "offset": 0.26,
+}
+CURRENT_THRESHOLDS = (0.30, 0.22)
+SCORE_MIN, SCORE_MAX = -0.5, 1.2
+
+# Rejilla de búsqueda
+KEYWORD_WEIGHTS = np.round(np.arange(0.30, 1.001, 0.05), 2)
+TEXTBLOB_WEIGHTS = np.round(np.arange(0.0, 0.501, 0.05), 2)
+VADER_WEIGHTS = np.round(np.arange(0.0, 0.301, 0.05), 2)
+AMPLIFIERS = np.array([1.5, 2.0, 2.5, 3.0])
+OFFSETS = np.array([0.20, 0.23, 0.26, 0.29])
+POSITIVE_THRESHOLDS = np.round(np.arange(0.26, 0.401, 0.02), 2)
+NEGATIVE_THRESHOLDS = np.round(np.arange(0.12, 0.261, 0.02), 2)
+
+# Máximo de celdas (artículos × combinaciones) por bloque
+MAX_CELLS = 20_000_000
+
+
+def build_grid() -> pd.DataFrame:
+    """Combinaciones de pesos, amplificación y offset (incluye la actual)"""
+    grid = pd.DataFrame(
+        list(
+            itertools.product(
+                KEYWORD_WEIGHTS, TEXTBLOB_WEIGHTS, VADER_WEIGHTS, AMPLIFIERS, OFFSETS
+            )
+        ),
+        columns=list(CURRENT),
+    )
+    if not (grid[list(CURRENT)] == pd.Series(CURRENT)).all(axis=1).any():
+        grid = pd.concat([pd.DataFrame([CURRENT]), grid], ignore_index=True)
+    return grid
+
+
+def final_scores(components: np.ndarray, grid: pd.DataFrame) -> np.ndarray:
+    """Score final por artículo y combinación: matriz (artículos × combinaciones)"""
+    weights = grid[["keyword_weight", "textblob_weight", "vader_weight"]].to_numpy()
+    scores = components @ weights.T
+    scores *= grid["amplifier"].to_numpy()
+    scores += grid["offset"].to_numpy()
+    return np.clip(scores, SCORE_MIN, SCORE_MAX, out=scores)
+
+
+def daily_means(
+    values: np.ndarray, starts: np.ndarray, counts: np.ndarray
+) -> np.ndarray:
+    """Media diaria por columna (artículos ordenados por día)"""
+    return np.add.reduceat(values, starts, axis=0) / counts[:, None]
+
+
+def pearson_columns(matrix: np.ndarray, target: np.ndarray) -> np.ndarray:
+    """Correlación de Pearson de cada columna con target (NaN si es constante)"""
+    target = target - target.mean()
+    centered = matrix - matrix.mean(axis=0)
+    denominator = np.sqrt((centered**2).sum(axis=0) * (target**2).sum())
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return (target @ centered) / denominator
+
+
+def sweep(
+    components: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    colcap_change: np.ndarray,
+    grid: pd.DataFrame,
+) -> pd.DataFrame:
+    """Correlación del sentimiento medio diario con el COLCAP para toda la rejilla"""
+    chunk = max(1, MAX_CELLS // len(components))
+    correlations = []
+    mean_sentiment = []
+    for i in range(0, len(grid), chunk):
+        scores = final_scores(components, grid.iloc[i : i + chunk])
+        daily = daily_means(scores, starts, counts)
+        correlations.append(pearson_columns(daily, colcap_change))
+        mean_sentiment.append(daily.mean(axis=0))
+
+    result = grid.copy()
+    result["pearson"] = np.concatenate(correlations)
+    result["avg_sentiment"] = np.concatenate(mean_sentiment)
+    return result.sort_values("pearson", ascending=False, na_position="last")
+
+
+def sweep_thresholds(
+    components: np.ndarray,
+    starts: np.ndarray,
+    counts: np.ndarray,
+    colcap_change: np.ndarray,
+    params: Dict[str, float],
+) -> pd.DataFrame:
+    """Umbrales de etiqueta para una combinación, por correlación del balance diario"""
+    scores = final_scores(components, pd.DataFrame([params]))[:, 0]
+    pairs = [
+        (positive, negative)
+        for positive in POSITIVE_THRESHOLDS
+        for negative in NEGATIVE_THRESHOLDS
+        if negative < positive
+    ]
+    positive = np.array([p for p, _ in pairs])
+    negative = np.array([n for _, n in pairs])
+    balance = (scores[:, None] >= positive).astype(float) - (
+        scores[:, None] <= negative
+    )
+    result = pd.DataFrame(
+        {"positive_threshold": positive, "negative_threshold": negative}
+    )
+    result["label_pearson"] = pearson_columns(
+        daily_means(balance, starts, counts), colcap_change
+    )
+    return result.sort_values("label_pearson", ascending=False, na_position="last")
+
+
+def load_components(
+    analyzer: COLCAPAnalyzer, days_back: int
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Componentes por artículo ordenados por día, alineados con el COLCAP.
+    Returns: (componentes n×3, inicio de cada día, artículos por día,
+              variación diaria del COLCAP)
+    Los componentes no calculados (nivel de puntuación o early exit) cuentan como 0.
+    """
+    conn = analyzer.get_db_connection()
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+    try:
+        cursor.execute(
+            """
+            SELECT
+                DATE(published_date) AS date,
+                keyword_score,
+                COALESCE(textblob_polarity, 0) AS textblob_polarity,
+                COALESCE(vader_compound, 0) AS vader_compound
+            FROM news
+            WHERE published_date >= CURRENT_DATE - make_interval(days => %s)
+              AND keyword_score IS NOT NULL
+            ORDER BY date
+        """,
+            (days_back,),
+        )
+        news = pd.DataFrame(cursor.fetchall())
+    finally:
+        cursor.close()
+        conn.close()
+
+    colcap = analyzer.get_colcap_from_db(days_back)
+    if news.empty or colcap.empty:
+        raise ValueError("Sin componentes de sentimiento o datos COLCAP")
+
+    news["date"] = pd.to_datetime(news["date"])
+    change = colcap["Daily_Change"].dropna()
+    news = news[news["date"].isin(change.index)]
+    if news.empty:
+        raise ValueError("Sin días comunes entre noticias y COLCAP")
+
+    components = news[
+        ["keyword_score", "textblob_polarity", "vader_compound"]
+    ].to_numpy(dtype=float)
+    days, starts, counts = np.unique(
+        news["date"].to_numpy(), return_index=True, return_counts=True
+    )
+    return components, starts, counts, change.loc[days].to_numpy(dtype=float)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    analyzer = COLCAPAnalyzer()
+    components, starts, counts, colcap_change = load_components(analyzer, args.days)
+    if len(counts) < 10:
+        logger.warning("Datos insuficientes para correlación")
+        return
+
+    grid = build_grid()
+    logger.info(
+        f"Barriendo {len(grid)} combinaciones sobre {len(components)} artículos "
+        f"y {len(counts)} días"
+    )
+    results = sweep(components, starts, counts, colcap_change, grid)
+    current = results[(results[list(CURRENT)] == pd.Series(CURRENT)).all(axis=1)]
+
+    pd.set_option("display.width", 160)
+    print("Configuración actual:")
+    print(current.to_string(index=False))
+    print(f"\nMejores {args.top} combinaciones:")
+    print(results.head(args.top).to_string(index=False))
+
+    best = results.iloc[0][list(CURRENT)].to_dict()
+    thresholds = sweep_thresholds(components, starts, counts, colcap_change, best)
+    print("\nUmbrales para la mejor combinación (actuales y mejores):")
+    positive, negative = CURRENT_THRESHOLDS
+    print(
+        thresholds[
+            np.isclose(thresholds["positive_threshold"], positive)
+            & np.isclose(thresholds["negative_threshold"], negative)
+        ].to_string(index=False)
+    )
+    print(thresholds.head(10).to_string(index=False))
+
+    if args.output:
+        results.to_csv(args.output, index=False)
+        logger.info(f"Resultados guardados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -10,7 +10,7 @@ import asyncio
 import redis
 import psycopg2
 from psycopg2.extras import RealDictCursor
-from fastapi import FastAPI, Query
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
 from datetime import datetime
@@ -477,7 +477,7 @@ async def get_stats():
         return 0.0
 
     # Ejecutar DB y Redis en paralelo
-    total_news, avg_sentiment, latest_colcap_change, correlation = await asyncio.gather(
+    (total_news, avg_sentiment, latest_colcap_change), correlation = await asyncio.gather(
         asyncio.to_thread(fetch_db_stats),
         asyncio.to_thread(fetch_redis_corr),
     )
@@ -654,17 +654,36 @@ async def get_metrics():
         """)
         news_today = cursor.fetchone()["count"]
 
-        # Noticias pendientes de procesar
+        # Noticias pendientes de procesar, por carril: el mismo filtro con el
+        # que el processor las reclama (sin puntuar o a re-puntuar y sin lease
+        # vigente; las dead letters tienen lease infinito y se cuentan aparte)
         cursor.execute("""
-            SELECT COUNT(*) as count
+            SELECT lane, COUNT(*) as count
             FROM news
-            WHERE sentiment_score IS NULL
+            WHERE (sentiment_score IS NULL OR needs_rescore)
+              AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+            GROUP BY lane
         """)
-        pending = cursor.fetchone()["count"]
+        pending_by_lane = {"live": 0, "backfill": 0}
+        pending_by_lane.update({row["lane"]: row["count"] for row in cursor.fetchall()})
+        pending = sum(pending_by_lane.values())
+
+        # Artículos apartados tras fallar repetidamente
+        cursor.execute("SELECT COUNT(*) as count FROM dead_letters")
+        dead_letters = cursor.fetchone()["count"]
+
+        # Aciertos/fallos de la caché de puntuación del processor
+        cache_stats = {k: int(v) for k, v in redis_client.hgetall("score_cache:stats").items()}
+        lookups = sum(cache_stats.values())
+        hits = cache_stats.get("local_hits", 0) + cache_stats.get("redis_hits", 0)
+        cache_stats["hit_ratio"] = hits / lookups if lookups else 0.0
 
         return {
             "news_collected_today": news_today,
             "news_pending_processing": pending,
+            "news_pending_by_lane": pending_by_lane,
+            "dead_letters": dead_letters,
+            "scoring_cache": cache_stats,
             "redis_connected": redis_client.ping(),
             "timestamp": datetime.utcnow().isoformat(),
         }
@@ -673,6 +692,79 @@ async def get_metrics():
         conn.close()
 
 
+@app.get("/api/dead-letters")
+async def get_dead_letters(limit: int = Query(default=50, le=500)):
+    """Artículos que fallaron la puntuación demasiadas veces"""
+    conn = get_db()
+    cursor = conn.cursor(cursor_factory=RealDictCursor)
+
+    try:
+        cursor.execute(
+            """
+            SELECT d.news_id, n.title, n.url, n.source, n.published_date,
+                   d.attempts, d.last_error, d.failed_at
+            FROM dead_letters d
+            JOIN news n ON n.id = d.news_id
+            ORDER BY d.failed_at DESC
+            LIMIT %s
+        """,
+            (limit,),
+        )
+
+        return cursor.fetchall()
+    finally:
+        cursor.close()
+        conn.close()
+
+
+@app.post("/api/dead-letters/requeue")
+async def requeue_dead_letters(news_id: Optional[int] = None):
+    """Devolver dead letters a la cola del processor (una o todas)"""
+    conn = get_db()
+    cursor = conn.cursor()
+
+    try:
+        cursor.execute(
+            """
+            WITH requeued AS (
+                DELETE FROM dead_letters
+                WHERE %(news_id)s IS NULL OR news_id = %(news_id)s
+                RETURNING news_id
+            )
+            UPDATE news
+            SET scoring_attempts = 0,
+                claimed_by = NULL,
+                lease_expires_at = NULL
+            FROM requeued
+            WHERE news.id = requeued.news_id
+        """,
+            {"news_id": news_id},
+        )
+        requeued = cursor.rowcount
+        conn.commit()
+
+        if news_id is not None and requeued == 0:
+            raise HTTPException(status_code=404, detail="Dead letter no encontrada")
+
+        if requeued:
+            # Despertar a los processors
+            redis_client.xadd(
+                "news_processing",
+                {
+                    "timestamp": datetime.utcnow().isoformat(),
+                    "new_articles": requeued,
+                    "action": "requeue_dead_letters",
+                },
+                maxlen=10000,
+                approximate=True,
+            )
+
+        return {"requeued": requeued}
+    finally:
+        cursor.close()
+        conn.close()
+
+
 @app.get("/api/conclusiones")
 async def get_conclusiones():
     """Generar conclusiones automáticas del análisis"""
@@ -0,0 +1,186 @@
+"""
+Escritura por lotes de los collectors
+Los collectors entregan artículos a medida que los obtienen; ArticleBuffer
+descarta las URLs ya vistas en la ejecución y vacía el lote a la base de datos
+cada flush_rows artículos o flush_seconds segundos, publicando en
+news_processing tras cada escritura para que el processor empiece a puntuar
+mientras la recolección sigue. La memoria queda acotada por el tamaño del lote
+(más el conjunto de URLs vistas).
+
+insert_articles carga cada lote con COPY en la tabla UNLOGGED news_staging y
+lo pasa a news con INSERT ... SELECT ... ON CONFLICT DO NOTHING RETURNING id:
+el aviso al processor lleva los ids realmente nuevos, no el tamaño del lote.
+"""
+
+import csv
+import io
+import logging
+import time
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+from psycopg2.extras import execute_values
+
+logger = logging.getLogger(__name__)
+
+PROCESSING_STREAM = "news_processing"
+
+# Orden de las columnas de las filas que reciben insert_articles
+NEWS_COLUMNS = ("url", "title", "content", "source", "published_date", "country", "lane")
+
+# Modos de inserción: copy (staging) o values (execute_values, para comparar)
+INSERT_MODES = ("copy", "values")
+
+# Marcador de NULL en el CSV del COPY
+COPY_NULL = "\\N"
+
+
+def insert_articles(conn, rows: Sequence[Sequence], mode: str = "copy") -> List[int]:
+    """
+    Insertar filas (en el orden de NEWS_COLUMNS) sin duplicar URLs, dentro de
+    la transacción de conn (el commit es del llamador). Las filas sin url,
+    título o fecha se descartan.
+    Returns: ids de los artículos que no existían
+    """
+    columns = ", ".join(NEWS_COLUMNS)
+    cursor = conn.cursor()
+    try:
+        if mode == "values":
+            valid = [row for row in rows if row[0] and row[1] and row[4]]
+            ids = execute_values(
+                cursor,
+                f"""
+                INSERT INTO news ({columns})
+                VALUES %s
+                ON CONFLICT (url) DO NOTHING
+                RETURNING id
+            """,
+                valid,
+                page_size=1000,
+                fetch=True,
+            )
+            return [row[0] for row in ids]
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        for row in rows:
+            writer.writerow([COPY_NULL if value is None else value for value in row])
+        buffer.seek(0)
+        cursor.copy_expert(
+            f"COPY news_staging ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer,
+        )
+        # Las filas de staging solo existen dentro de esta transacción: otros
+        # collectors no las ven y se borran antes del commit
+        cursor.execute(
+            f"""
+            INSERT INTO news ({columns})
+            SELECT {columns}
+            FROM news_staging
+            WHERE url IS NOT NULL AND title IS NOT NULL AND published_date IS NOT NULL
+            ON CONFLICT (url) DO NOTHING
+            RETURNING id
+        """
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+        cursor.execute("DELETE FROM news_staging")
+        return ids
+    finally:
+        cursor.close()
+
+
+def publish_new_articles(redis_client, ids: List[int], lane: str = "live"):
+    """Avisar al processor de los artículos nuevos (con sus ids)"""
+    if ids:
+        message = {
+            "timestamp": datetime.utcnow().isoformat(),
+            "new_articles": len(ids),
+            "article_ids": ",".join(str(i) for i in ids),
+            "lane": lane,
+            "action": "process_new_articles",
+        }
+        redis_client.xadd(PROCESSING_STREAM, message, maxlen=10000, approximate=True)
+
+
+class ArticleBuffer:
+    """
+    Lote de artículos pendientes de guardar.
+    save(artículos) escribe el lote y devuelve los ids de los nuevos;
+    notify(ids) se llama después de cada escritura.
+    El plazo de flush_seconds se comprueba al llegar artículos y en tick().
+    """
+
+    def __init__(
+        self,
+        save: Callable[[List[Dict]], List[int]],
+        notify: Optional[Callable[[List[int]], None]] = None,
+        flush_rows: int = 500,
+        flush_seconds: float = 30.0,
+    ):
+        self.save = save
+        self.notify = notify
+        self.flush_rows = flush_rows
+        self.flush_seconds = flush_seconds
+
+        self._pending: List[Dict] = []
+        self._seen = set()
+        self._oldest: Optional[float] = None
+
+        self.stats = {"received": 0, "duplicates": 0, "flushes": 0, "saved": 0}
+
+    def add(self, article: Dict):
+        self.stats["received"] += 1
+        url = article.get("url")
+        if not url or url in self._seen:
+            self.stats["duplicates"] += 1
+            return
+        self._seen.add(url)
+        self._pending.append(article)
+        if self._oldest is None:
+            self._oldest = time.monotonic()
+        if len(self._pending) >= self.flush_rows:
+            self.flush()
+        else:
+            self.tick()
+
+    def extend(self, articles: Iterable[Dict]):
+        for article in articles:
+            self.add(article)
+
+    def tick(self):
+        """Vaciar si el artículo más antiguo del lote lleva flush_seconds esperando"""
+        if (
+            self._oldest is not None
+            and time.monotonic() - self._oldest >= self.flush_seconds
+        ):
+            self.flush()
+
+    def flush(self) -> int:
+        if not self._pending:
+            return 0
+        batch, self._pending, self._oldest = self._pending, [], None
+        ids = self.save(batch)
+        self.stats["flushes"] += 1
+        self.stats["saved"] += len(ids)
+        logger.info(
+            f"💾 Lote {self.stats['flushes']}: {len(batch)} artículos, {len(ids)} nuevos"
+        )
+        if self.notify is not None:
+            self.notify(ids)
+        return len(ids)
+
+    @property
+    def unique(self) -> int:
+        return len(self._seen)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.flush()
+        elif self._pending:
+            # Si falló la escritura reintentarla volvería a fallar; lo no
+            # guardado se recupera en la próxima ejecución
+            logger.error(f"❌ {len(self._pending)} artículos sin guardar por el error")
+        return False
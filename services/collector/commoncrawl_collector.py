@@ -11,12 +11,15 @@ import re
 import sys
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 
 import psycopg2
+import redis
 import requests
 from bs4 import BeautifulSoup
 
+from article_pipeline import ArticleBuffer, insert_articles, publish_new_articles
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -36,6 +39,15 @@ class CommonCrawlCollector:
             "password": os.getenv("POSTGRES_PASSWORD", "newspass123"),
         }
 
+        # Redis: avisos al processor tras cada lote guardado
+        self.redis_client = redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            decode_responses=True,
+        )
+        self.flush_rows = int(os.getenv("COLLECTOR_FLUSH_ROWS", 500))
+        self.flush_seconds = float(os.getenv("COLLECTOR_FLUSH_SECONDS", 30))
+
         # Mismos keywords económicos que GDELT
         self.economic_keywords = [
             "colombia economía",
@@ -312,10 +324,10 @@ class CommonCrawlCollector:
         except:
             return "Common Crawl"
 
-    def collect_from_indices(self, days_back: int = 365) -> List[Dict]:
-        """Recolectar noticias de múltiples índices"""
-        all_articles = []
-        article_urls = set()  # Para deduplicación
+    def collect_from_indices(self, days_back: int = 365) -> Iterator[Dict]:
+        """Recolectar noticias de múltiples índices (se entregan a medida que se obtienen)"""
+        collected = 0
+        article_urls = set()  # Para no descargar dos veces el mismo WARC
 
         logger.info(
             f"🔍 Iniciando recolección de Common Crawl (últimos {days_back} días)"
@@ -351,7 +363,8 @@ class CommonCrawlCollector:
 
                         if article and len(article["title"]) > 10:
                             article_urls.add(record["url"])
-                            all_articles.append(article)
+                            collected += 1
+                            yield article
 
                     # Pequeña pausa para no sobrecargar el servidor
                     time.sleep(0.5)
@@ -361,64 +374,50 @@ class CommonCrawlCollector:
                     continue
 
             logger.info(
-                f"✅ Índice {index} completado. Total acumulado: {len(all_articles)}"
+                f"✅ Índice {index} completado. Total acumulado: {collected}"
             )
 
             # Si ya tenemos suficientes artículos, parar
-            if len(all_articles) >= 2000:
+            if collected >= 2000:
                 logger.info("✅ Alcanzado límite de 2000 artículos")
                 break
 
-        logger.info(f"📊 Total recolectado: {len(all_articles)} artículos únicos")
-        return all_articles
+        logger.info(f"📊 Total recolectado: {collected} artículos únicos")
 
-    def save_to_database(self, articles: List[Dict]) -> int:
-        """Guardar artículos en la base de datos (misma tabla que GDELT)"""
+    def save_to_database(self, articles: List[Dict]) -> List[int]:
+        """
+        Guardar artículos en la base de datos (misma tabla que GDELT)
+        Returns: ids de los artículos nuevos
+        """
         if not articles:
-            return 0
+            return []
+
+        rows = [
+            (
+                article["url"],
+                article["title"],
+                article.get("content", ""),
+                article["source"],
+                article["published_date"],
+                None,
+                "live",
+            )
+            for article in articles
+        ]
 
         conn = self.get_db_connection()
-        cursor = conn.cursor()
-        saved = 0
-
         try:
-            for article in articles:
-                try:
-                    cursor.execute(
-                        """
-                        INSERT INTO news (title, url, content, source, published_date, collected_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (url) DO NOTHING
-                    """,
-                        (
-                            article["title"],
-                            article["url"],
-                            article.get("content", ""),
-                            article["source"],
-                            article["published_date"],
-                            datetime.now(),
-                        ),
-                    )
-
-                    if cursor.rowcount > 0:
-                        saved += 1
-
-                except Exception as e:
-                    logger.debug(f"Error insertando artículo: {str(e)}")
-                    continue
-
+            ids = insert_articles(conn, rows)
             conn.commit()
-            logger.info(f"💾 Guardados: {saved} artículos nuevos en la BD")
-
+            logger.info(f"💾 Guardados: {len(ids)} artículos nuevos en la BD")
+            return ids
         except Exception as e:
             conn.rollback()
             logger.error(f"Error en transacción: {str(e)}")
+            return []
         finally:
-            cursor.close()
             conn.close()
 
-        return saved
-
     def run(self, days_back: int = 365):
         """Ejecutar recolección completa"""
         logger.info("=" * 70)
@@ -427,15 +426,20 @@ class CommonCrawlCollector:
 
         start = time.time()
 
-        # Recolectar artículos
-        articles = self.collect_from_indices(days_back)
-
-        # Guardar en BD
-        saved = self.save_to_database(articles)
+        # Recolectar y guardar por lotes: el processor empieza con el primero
+        with ArticleBuffer(
+            self.save_to_database,
+            lambda ids: publish_new_articles(self.redis_client, ids),
+            flush_rows=self.flush_rows,
+            flush_seconds=self.flush_seconds,
+        ) as buffer:
+            for article in self.collect_from_indices(days_back):
+                buffer.add(article)
+        saved = buffer.stats["saved"]
 
         elapsed = time.time() - start
         logger.info(
-            f"✅ Completado en {int(elapsed)}s - {len(articles)} artículos, {saved} nuevos guardados"
+            f"✅ Completado en {int(elapsed)}s - {buffer.unique} artículos, {saved} nuevos guardados"
         )
         logger.info("=" * 70)
 
@@ -0,0 +1,215 @@
+"""
+Motor asíncrono de consultas a GDELT
+Un token bucket compartido impone el límite de GDELT a todas las consultas,
+un número fijo de workers acota las peticiones en vuelo y cada consulta se
+reintenta con backoff exponencial con jitter. Los resultados se entregan a
+medida que llegan (async iterator), no al terminar la pasada.
+"""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+GDELT_URL = "https://api.gdeltproject.org/api/v2/doc/doc"
+GDELT_TIME_FORMAT = "%Y%m%d%H%M%S"
+
+# Respuestas que merecen reintento
+RETRY_STATUS = {429, 500, 502, 503, 504}
+
+
+class TokenBucket:
+    """
+    Token bucket asíncrono: rate tokens por segundo con ráfagas de hasta
+    capacity. acquire() espera hasta que haya un token disponible.
+    """
+
+    def __init__(self, rate: float, capacity: float = 1.0):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop = None
+
+    async def acquire(self):
+        # El lock queda ligado a un event loop y el collector abre uno nuevo
+        # (asyncio.run) en cada ejecución programada
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._lock, self._loop = asyncio.Lock(), loop
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                # Quien espera conserva el lock: los turnos salen en orden
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass(frozen=True)
+class GDELTQuery:
+    """Consulta artlist de una keyword en una ventana de tiempo"""
+
+    keyword: str
+    start: datetime
+    end: datetime
+
+    def params(self, max_records: int) -> Dict:
+        return {
+            "query": self.keyword,
+            "mode": "artlist",
+            "maxrecords": max_records,
+            "startdatetime": self.start.strftime(GDELT_TIME_FORMAT),
+            "enddatetime": self.end.strftime(GDELT_TIME_FORMAT),
+            # Más recientes primero: una respuesta saturada cubre por completo
+            # el tramo entre su artículo más antiguo y el final de la ventana
+            "sort": "datedesc",
+            "format": "json",
+        }
+
+
+class GDELTFetcher:
+    """Consultas concurrentes a GDELT con límite de tasa global y reintentos"""
+
+    def __init__(
+        self,
+        base_url: str = GDELT_URL,
+        rate: float = 1 / 1.2,
+        burst: float = 1.0,
+        concurrency: int = 4,
+        max_retries: int = 3,
+        backoff_base: float = 2.0,
+        backoff_max: float = 30.0,
+        timeout: float = 30.0,
+        max_records: int = 250,
+    ):
+        self.base_url = base_url
+        self.bucket = TokenBucket(rate, burst)
+        self.concurrency = concurrency
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.timeout = timeout
+        self.max_records = max_records
+
+        # Contadores de la última pasada (para logs y el replay)
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "skipped": 0}
+
+    def backoff(self, attempt: int) -> float:
+        """Full jitter: uniforme entre 0 y base * 2^intento (con tope)"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    async def fetch(
+        self, client: httpx.AsyncClient, query: GDELTQuery
+    ) -> Optional[List[Dict]]:
+        """Artículos de una consulta; None si falla tras los reintentos"""
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.acquire()
+            self.stats["requests"] += 1
+            try:
+                response = await client.get(
+                    self.base_url, params=query.params(self.max_records)
+                )
+                if response.status_code == 200:
+                    # GDELT responde {} (o cuerpo vacío) cuando no hay resultados
+                    if not response.content.strip():
+                        return []
+                    return response.json().get("articles", [])
+                if response.status_code not in RETRY_STATUS:
+                    logger.error(
+                        f"'{query.keyword}': HTTP {response.status_code}, sin reintento"
+                    )
+                    break
+                error = f"HTTP {response.status_code}"
+            except (httpx.HTTPError, ValueError) as e:
+                # Timeouts, conexión y respuestas que no son JSON (GDELT devuelve
+                # texto plano al superar su límite)
+                error = f"{type(e).__name__}: {e}"
+
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                delay = self.backoff(attempt)
+                logger.warning(
+                    f"'{query.keyword}': {error}, reintento {attempt + 1} en {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        self.stats["failures"] += 1
+        return None
+
+    async def fetch_all(
+        self,
+        queries: Iterable[GDELTQuery],
+        expand: Optional[
+            Callable[[GDELTQuery, Optional[List[Dict]]], List[GDELTQuery]]
+        ] = None,
+        budget: Optional[int] = None,
+    ) -> AsyncIterator[Tuple[GDELTQuery, Optional[List[Dict]]]]:
+        """
+        Ejecutar las consultas con concurrency workers y entregar cada
+        (consulta, artículos) en cuanto termina. Artículos None = consulta fallida.
+        expand(consulta, artículos) devuelve consultas derivadas que se encolan
+        en la misma pasada (p. ej. subdividir una ventana saturada).
+        budget: peticiones HTTP de la pasada; las consultas que empiezan con el
+        presupuesto agotado se entregan con None y se cuentan en stats["skipped"]
+        (los reintentos de las que ya estaban en vuelo pueden excederlo).
+        """
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "skipped": 0}
+        pending: asyncio.Queue = asyncio.Queue()
+        results: asyncio.Queue = asyncio.Queue()
+        outstanding = 0
+        # Consultas empezadas: con los reintentos ya programados acotan las
+        # peticiones de la pasada aunque aún estén esperando token
+        started = 0
+        for query in queries:
+            pending.put_nowait(query)
+            outstanding += 1
+
+        async def worker(client: httpx.AsyncClient):
+            nonlocal started
+            while True:
+                query = await pending.get()
+                if budget is not None and started + self.stats["retries"] >= budget:
+                    self.stats["skipped"] += 1
+                    await results.put((query, None))
+                    continue
+                started += 1
+                try:
+                    articles = await self.fetch(client, query)
+                except Exception as e:
+                    logger.error(f"'{query.keyword}': {type(e).__name__}: {e}")
+                    self.stats["failures"] += 1
+                    articles = None
+                await results.put((query, articles))
+
+        limits = httpx.Limits(max_connections=self.concurrency)
+        async with httpx.AsyncClient(timeout=self.timeout, limits=limits) as client:
+            workers = [
+                asyncio.create_task(worker(client)) for _ in range(self.concurrency)
+            ]
+            try:
+                while outstanding:
+                    query, articles = await results.get()
+                    outstanding -= 1
+                    if expand is not None:
+                        for follow_up in expand(query, articles):
+                            pending.put_nowait(follow_up)
+                            outstanding += 1
+                    yield query, articles
+            finally:
+                for task in workers:
+                    task.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,120 @@
+"""
+Planificador de consultas GDELT por tramos de tiempo
+GDELT devuelve como mucho maxrecords (250) artículos por consulta, así que una
+ventana amplia de una keyword popular solo trae los más recientes. El
+planificador divide la ventana de cada keyword en tramos y, cuando un tramo
+vuelve saturado, consulta solo lo que queda sin cubrir: con orden datedesc la
+respuesta cubre desde su artículo más antiguo hasta el final del tramo, y el
+resto se bisecciona recursivamente (las dos mitades van en paralelo).
+Las keywords escasas cuestan una sola petición por tramo.
+
+Todo pasa por el GDELTFetcher (límite de tasa global, concurrencia acotada)
+con un presupuesto de peticiones por ejecución.
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
+
+from gdelt_fetcher import GDELTFetcher, GDELTQuery
+
+logger = logging.getLogger(__name__)
+
+SEENDATE_FORMAT = "%Y%m%dT%H%M%SZ"
+
+
+class QueryPlanner:
+    """Tramos por keyword y subdivisión de los tramos saturados"""
+
+    def __init__(
+        self,
+        fetcher: GDELTFetcher,
+        slice_days: float = 90,
+        min_slice: timedelta = timedelta(minutes=10),
+        budget: Optional[int] = None,
+    ):
+        self.fetcher = fetcher
+        self.slice = timedelta(days=slice_days)
+        self.min_slice = min_slice
+        self.budget = budget
+
+        self.stats = self._empty_stats()
+        # Keywords con algún tramo sin cubrir (fallo, presupuesto o saturación
+        # indivisible) en la última ejecución
+        self.incomplete: Set[str] = set()
+
+    @staticmethod
+    def _empty_stats() -> Dict[str, int]:
+        return {"slices": 0, "saturated": 0, "subqueries": 0, "uncovered": 0}
+
+    def plan(self, queries: List[GDELTQuery]) -> List[GDELTQuery]:
+        """
+        Tramos de slice_days, del más reciente al más antiguo, intercalados
+        entre keywords: con presupuesto limitado todas cubren primero lo reciente
+        """
+        per_keyword = []
+        for query in queries:
+            slices = []
+            end = query.end
+            while end > query.start:
+                start = max(query.start, end - self.slice)
+                slices.append(GDELTQuery(query.keyword, start, end))
+                end = start
+            per_keyword.append(slices)
+
+        planned = []
+        for depth in range(max((len(s) for s in per_keyword), default=0)):
+            planned.extend(s[depth] for s in per_keyword if depth < len(s))
+        return planned
+
+    def expand(
+        self, query: GDELTQuery, articles: Optional[List[Dict]]
+    ) -> List[GDELTQuery]:
+        """Consultas para la parte no cubierta de un tramo saturado"""
+        if articles is None:
+            self.stats["uncovered"] += 1
+            self.incomplete.add(query.keyword)
+            return []
+        if len(articles) < self.fetcher.max_records:
+            return []
+
+        self.stats["saturated"] += 1
+        seen = [a["seendate"] for a in articles if a.get("seendate")]
+        oldest = datetime.strptime(min(seen), SEENDATE_FORMAT) if seen else query.end
+        end = min(oldest, query.end)
+        if not query.start < end < query.end:
+            # Más de maxrecords artículos en el mismo segundo: no se puede dividir
+            logger.warning(
+                f"'{query.keyword}': tramo {query.start} – {query.end} saturado "
+                "e indivisible"
+            )
+            self.stats["uncovered"] += 1
+            self.incomplete.add(query.keyword)
+            return []
+
+        # El segundo de `oldest` se vuelve a pedir: puede tener más artículos
+        span = end - query.start
+        if span < 2 * self.min_slice:
+            follow_ups = [GDELTQuery(query.keyword, query.start, end)]
+        else:
+            middle = query.start + span / 2
+            follow_ups = [
+                GDELTQuery(query.keyword, middle, end),
+                GDELTQuery(query.keyword, query.start, middle),
+            ]
+        self.stats["subqueries"] += len(follow_ups)
+        return follow_ups
+
+    async def run(
+        self, queries: List[GDELTQuery]
+    ) -> AsyncIterator[Tuple[GDELTQuery, Optional[List[Dict]]]]:
+        """(tramo, artículos) a medida que llegan, incluidas las subconsultas"""
+        self.stats = self._empty_stats()
+        self.incomplete = set()
+        planned = self.plan(queries)
+        self.stats["slices"] = len(planned)
+
+        async for query, articles in self.fetcher.fetch_all(
+            planned, expand=self.expand, budget=self.budget
+        ):
+            yield query, articles
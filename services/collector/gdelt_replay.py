@@ -0,0 +1,276 @@
+"""
+Servidor local que reproduce respuestas grabadas de GDELT
+Sustituye a api.gdeltproject.org para probar el collector sin red: sirve la
+API artlist (/api/v2/doc/doc) a partir de un cassette JSONL con los artículos
+grabados por keyword, filtrados por startdatetime/enddatetime y recortados a
+maxrecords (más recientes primero), como GDELT. Puede añadir latencia, errores
+503 y rechazar con 429 las peticiones que superan el límite de tasa.
+
+Uso:
+  python gdelt_replay.py record cassette.jsonl [--keywords k1,k2]   (requiere red)
+  python gdelt_replay.py serve cassette.jsonl [--port 8765]
+      → GDELT_URL=http://localhost:8765/api/v2/doc/doc python main.py
+  python gdelt_replay.py check [cassette.jsonl] [--synthetic 2000]
+      [--latency 0.5] [--error-rate 0.05] [--rate 5] [--concurrency 4]
+      → ejecuta GDELTFetcher contra el servidor y reporta tiempos y reintentos
+
+Las pruebas de test_gdelt.py levantan este servidor con cassettes sintéticos.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from gdelt_fetcher import GDELT_TIME_FORMAT, GDELTFetcher, GDELTQuery
+
+logger = logging.getLogger(__name__)
+
+SEENDATE_FORMAT = "%Y%m%dT%H%M%SZ"
+
+# Texto con el que GDELT rechaza las peticiones demasiado seguidas
+RATE_LIMIT_MESSAGE = b"Please limit requests to one every 5 seconds"
+
+
+def load_cassette(path: str) -> Dict[str, List[Dict]]:
+    """Artículos por keyword (sin duplicados), ordenados del más reciente al más antiguo"""
+    by_keyword: Dict[str, Dict[str, Dict]] = defaultdict(dict)
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                for article in record.get("articles", []):
+                    by_keyword[record["keyword"]][article["url"]] = article
+    return {
+        keyword: sorted(articles.values(), key=lambda a: a["seendate"], reverse=True)
+        for keyword, articles in by_keyword.items()
+    }
+
+
+def synthetic_cassette(
+    keywords: List[str], per_keyword: int, days: int = 365, seed: int = 42
+) -> Dict[str, List[Dict]]:
+    """Artículos sintéticos con la forma de GDELT, repartidos en la ventana"""
+    rng = random.Random(seed)
+    end = datetime.utcnow()
+    cassette = {}
+    for keyword in keywords:
+        articles = []
+        for i in range(per_keyword):
+            seen = end - timedelta(seconds=rng.randrange(days * 86400))
+            domain = rng.choice(["portafolio.co", "larepublica.co", "eltiempo.com"])
+            articles.append(
+                {
+                    "url": f"https://{domain}/{keyword.replace(' ', '-')}/{i}",
+                    "title": f"{keyword.capitalize()}: noticia {i}",
+                    "seendate": seen.strftime(SEENDATE_FORMAT),
+                    "domain": domain,
+                    "language": "Spanish",
+                    "sourcecountry": "Colombia",
+                }
+            )
+        articles.sort(key=lambda a: a["seendate"], reverse=True)
+        cassette[keyword] = articles
+    return cassette
+
+
+class ReplayServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(
+        self,
+        port: int,
+        cassette: Dict[str, List[Dict]],
+        latency: float = 0.0,
+        error_rate: float = 0.0,
+        min_interval: float = 0.0,
+    ):
+        super().__init__(("127.0.0.1", port), ReplayHandler)
+        self.cassette = cassette
+        self.latency = latency
+        self.error_rate = error_rate
+        # Intervalo mínimo entre peticiones aceptadas (0 = sin límite)
+        self.min_interval = min_interval
+        self.stats = {"requests": 0, "rate_limited": 0, "errors": 0, "served": 0}
+        self._last_accepted = 0.0
+        self._lock = threading.Lock()
+
+    def admit(self) -> bool:
+        """Aplicar el límite de tasa global (con 10% de tolerancia de reloj)"""
+        with self._lock:
+            self.stats["requests"] += 1
+            now = time.monotonic()
+            if self.min_interval and now - self._last_accepted < self.min_interval * 0.9:
+                self.stats["rate_limited"] += 1
+                return False
+            self._last_accepted = now
+            return True
+
+    def search(self, params: Dict[str, str]) -> List[Dict]:
+        start = params.get("startdatetime", "00000000000000")
+        end = params.get("enddatetime", "99999999999999")
+        matches = [
+            article
+            for article in self.cassette.get(params.get("query", ""), [])
+            # seendate 20240131T120000Z → 20240131120000, comparable con las ventanas
+            if start <= article["seendate"].replace("T", "").rstrip("Z") <= end
+        ]
+        return matches[: int(params.get("maxrecords", 75))]
+
+
+class ReplayHandler(BaseHTTPRequestHandler):
+    server: ReplayServer
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path != "/api/v2/doc/doc":
+            self.send_error(404)
+            return
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+
+        if not self.server.admit():
+            self.respond(429, RATE_LIMIT_MESSAGE, "text/plain")
+            return
+        if self.server.latency:
+            time.sleep(random.uniform(0, self.server.latency))
+        if random.random() < self.server.error_rate:
+            self.server.stats["errors"] += 1
+            self.respond(503, b"Service Unavailable", "text/plain")
+            return
+
+        articles = self.server.search(params)
+        self.server.stats["served"] += 1
+        body = json.dumps({"articles": articles} if articles else {}).encode()
+        self.respond(200, body, "application/json")
+
+    def respond(self, status: int, body: bytes, content_type: str):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+async def record(path: str, keywords: List[str], days: int):
+    """Grabar las respuestas reales de GDELT para las keywords dadas"""
+    end = datetime.utcnow()
+    queries = [GDELTQuery(k, end - timedelta(days=days), end) for k in keywords]
+    fetcher = GDELTFetcher()
+    with open(path, "a", encoding="utf-8") as f:
+        async for query, articles in fetcher.fetch_all(queries):
+            if articles is None:
+                continue
+            f.write(
+                json.dumps(
+                    {
+                        "keyword": query.keyword,
+                        "startdatetime": query.start.strftime(GDELT_TIME_FORMAT),
+                        "enddatetime": query.end.strftime(GDELT_TIME_FORMAT),
+                        "articles": articles,
+                    },
+                    ensure_ascii=False,
+                )
+                + "\n"
+            )
+            logger.info(f"'{query.keyword}': {len(articles)} artículos grabados")
+
+
+async def check(server: ReplayServer, fetcher: GDELTFetcher, days: int) -> Dict:
+    """Consultar todas las keywords del cassette y medir la pasada"""
+    end = datetime.utcnow()
+    queries = [
+        GDELTQuery(keyword, end - timedelta(days=days), end)
+        for keyword in server.cassette
+    ]
+    start = time.time()
+    first_result = None
+    articles = failed = 0
+    async for _, results in fetcher.fetch_all(queries):
+        first_result = first_result or time.time() - start
+        if results is None:
+            failed += 1
+        else:
+            articles += len(results)
+    return {
+        "queries": len(queries),
+        "failed": failed,
+        "articles": articles,
+        "seconds": round(time.time() - start, 2),
+        "first_result_seconds": round(first_result or 0, 2),
+        "client": fetcher.stats,
+        "server": server.stats,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("command", choices=["record", "serve", "check"])
+    parser.add_argument("cassette", nargs="?")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--keywords", help="keywords a grabar, separadas por comas")
+    parser.add_argument("--synthetic", type=int, default=0, help="artículos por keyword")
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    # Límite del servidor y tasa del cliente (peticiones/s)
+    parser.add_argument("--rate", type=float, default=1 / 1.2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+
+    if args.command == "record":
+        if not args.cassette or not args.keywords:
+            parser.error("record requiere cassette y --keywords")
+        asyncio.run(record(args.cassette, args.keywords.split(","), args.days))
+        return
+
+    if args.cassette:
+        cassette = load_cassette(args.cassette)
+    else:
+        keywords = (args.keywords or "colcap,ecopetrol,colombia dólar").split(",")
+        cassette = synthetic_cassette(keywords, args.synthetic or 500, args.days)
+
+    server = ReplayServer(
+        0 if args.command == "check" else args.port,
+        cassette,
+        latency=args.latency,
+        error_rate=args.error_rate,
+        min_interval=1 / args.rate,
+    )
+    port = server.server_address[1]
+
+    if args.command == "serve":
+        logger.info(
+            f"Replay GDELT en http://localhost:{port}/api/v2/doc/doc "
+            f"({len(cassette)} keywords)"
+        )
+        server.serve_forever()
+        return
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    fetcher = GDELTFetcher(
+        base_url=f"http://127.0.0.1:{port}/api/v2/doc/doc",
+        rate=args.rate,
+        concurrency=args.concurrency,
+        backoff_base=0.5,
+    )
+    print(json.dumps(asyncio.run(check(server, fetcher, args.days)), indent=2))
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
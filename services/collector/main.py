@@ -5,22 +5,33 @@ Optimizado para obtener 2,000-3,000 artículos por ejecución
 """
 
 import os
+import sys
 import time
-import json
+import asyncio
 import logging
 import redis
 import psycopg2
-import requests
 import schedule
 from datetime import datetime, timedelta
 from typing import List, Dict
 from psycopg2.extras import execute_values
 
+from article_pipeline import (
+    INSERT_MODES,
+    ArticleBuffer,
+    insert_articles,
+    publish_new_articles,
+)
+from gdelt_fetcher import GDELT_URL, GDELTFetcher, GDELTQuery
+from gdelt_planner import QueryPlanner
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
 )
 logger = logging.getLogger(__name__)
+# httpx registra cada petición en INFO
+logging.getLogger("httpx").setLevel(logging.WARNING)
 
 
 class GDELTCollector:
@@ -126,6 +137,50 @@ class GDELTCollector:
         self.days_back = int(os.getenv("GDELT_DAYS_BACK", 365))  # 1 año completo
         self.max_records_per_query = 250
 
+        # Consultas asíncronas: GDELT_RATE peticiones/s en total (token bucket
+        # compartido), GDELT_CONCURRENCY en vuelo y reintentos con backoff
+        self.fetcher = GDELTFetcher(
+            base_url=os.getenv("GDELT_URL", GDELT_URL),
+            rate=float(os.getenv("GDELT_RATE", 1 / 1.2)),
+            burst=float(os.getenv("GDELT_BURST", 1)),
+            concurrency=int(os.getenv("GDELT_CONCURRENCY", 4)),
+            max_retries=int(os.getenv("GDELT_MAX_RETRIES", 3)),
+            backoff_base=float(os.getenv("GDELT_BACKOFF_BASE", 2)),
+            timeout=float(os.getenv("GDELT_TIMEOUT", 30)),
+            max_records=self.max_records_per_query,
+        )
+
+        # Tramos de GDELT_SLICE_DAYS por keyword; los saturados se subdividen
+        # hasta GDELT_MIN_SLICE_MINUTES. GDELT_REQUEST_BUDGET acota las
+        # peticiones por ejecución (0 = sin límite)
+        budget = int(os.getenv("GDELT_REQUEST_BUDGET", 0))
+        self.planner = QueryPlanner(
+            self.fetcher,
+            slice_days=float(os.getenv("GDELT_SLICE_DAYS", 90)),
+            min_slice=timedelta(minutes=int(os.getenv("GDELT_MIN_SLICE_MINUTES", 10))),
+            budget=budget or None,
+        )
+
+        # Marcas de agua por keyword: las ejecuciones periódicas solo piden lo
+        # posterior al último seendate guardado, con un solape para los
+        # artículos que GDELT indexa con retraso
+        self.watermark_overlap = timedelta(
+            minutes=int(os.getenv("GDELT_WATERMARK_OVERLAP_MINUTES", 120))
+        )
+
+        # Los artículos se guardan y notifican por lotes durante la recolección
+        self.flush_rows = int(os.getenv("COLLECTOR_FLUSH_ROWS", 500))
+        self.flush_seconds = float(os.getenv("COLLECTOR_FLUSH_SECONDS", 30))
+        # copy: COPY a news_staging + INSERT ... SELECT; values: execute_values
+        self.insert_mode = os.getenv("COLLECTOR_INSERT_MODE", "copy").lower()
+        if self.insert_mode not in INSERT_MODES:
+            logger.warning(
+                f"COLLECTOR_INSERT_MODE desconocido '{self.insert_mode}', usando copy"
+            )
+            self.insert_mode = "copy"
+        # Lotes que no se pudieron guardar en la recolección en curso
+        self.failed_flushes = 0
+
         logger.info("GDELT Collector inicializado (OPTIMIZADO)")
         logger.info(f"Keywords: {len(self.economic_keywords)}")
         logger.info(f"Días: {self.days_back} (1 año completo)")
@@ -134,137 +189,220 @@ class GDELTCollector:
     def get_db_connection(self):
         return psycopg2.connect(**self.db_config)
 
-    def fetch_gdelt_articles(self) -> List[Dict]:
-        logger.info(f"🔍 Búsqueda GDELT ({self.days_back} días)")
+    def load_watermarks(self) -> Dict[str, datetime]:
+        """Último seendate guardado por keyword"""
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        try:
+            cursor.execute("SELECT keyword, last_seendate FROM collector_watermarks")
+            return dict(cursor.fetchall())
+        finally:
+            cursor.close()
+            conn.close()
 
-        end_date = datetime.utcnow()
-        start_date = end_date - timedelta(days=self.days_back)
-        start_str = start_date.strftime("%Y%m%d%H%M%S")
-        end_str = end_date.strftime("%Y%m%d%H%M%S")
-
-        articles = []
-        successful = 0
-
-        for i, keyword in enumerate(self.economic_keywords, 1):
-            try:
-                url = "https://api.gdeltproject.org/api/v2/doc/doc"
-                params = {
-                    "query": keyword,
-                    "mode": "artlist",
-                    "maxrecords": self.max_records_per_query,
-                    "startdatetime": start_str,
-                    "enddatetime": end_str,
-                    "format": "json",
-                }
-
-                response = requests.get(url, params=params, timeout=30)
-
-                if response.status_code == 200:
-                    data = response.json()
-                    if "articles" in data:
-                        count = len(data["articles"])
-                        articles.extend(data["articles"])
-                        successful += 1
-                        logger.info(
-                            f"  [{i}/{len(self.economic_keywords)}] '{keyword}': {count} ✓"
-                        )
-
-                time.sleep(1.2)
-
-            except Exception as e:
-                logger.error(f"  [{i}] '{keyword}': Error")
-                continue
+    def save_watermarks(self, watermarks: Dict[str, datetime]):
+        """Avanzar las marcas de agua (nunca retroceden, p. ej. tras un backfill)"""
+        if not watermarks:
+            return
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+        try:
+            execute_values(
+                cursor,
+                """
+                INSERT INTO collector_watermarks (keyword, last_seendate)
+                VALUES %s
+                ON CONFLICT (keyword) DO UPDATE SET
+                    last_seendate = GREATEST(
+                        collector_watermarks.last_seendate, EXCLUDED.last_seendate
+                    ),
+                    updated_at = CURRENT_TIMESTAMP
+            """,
+                list(watermarks.items()),
+            )
+            conn.commit()
+        finally:
+            cursor.close()
+            conn.close()
 
-        unique = {a.get("url"): a for a in articles if a.get("url")}
-        result = list(unique.values())
+    def build_queries(self, backfill: bool = False) -> List[GDELTQuery]:
+        """
+        Una consulta por keyword. Incremental: desde la marca de agua menos el
+        solape (o la ventana completa si la keyword aún no tiene marca).
+        Backfill: la ventana completa de GDELT_DAYS_BACK días.
+        """
+        end_date = datetime.utcnow()
+        full_start = end_date - timedelta(days=self.days_back)
+        watermarks = {} if backfill else self.load_watermarks()
+        return [
+            GDELTQuery(
+                keyword,
+                max(full_start, watermarks[keyword] - self.watermark_overlap)
+                if keyword in watermarks
+                else full_start,
+                end_date,
+            )
+            for keyword in self.economic_keywords
+        ]
 
-        logger.info(f"📊 Total: {len(articles)} → Únicos: {len(result)}")
-        return result
+    def fetch_gdelt_articles(
+        self, buffer: ArticleBuffer, backfill: bool = False
+    ) -> Dict[str, datetime]:
+        return asyncio.run(self.fetch_gdelt_articles_async(buffer, backfill))
 
-    def save_to_database(self, articles: List[Dict]) -> int:
+    async def fetch_gdelt_articles_async(
+        self, buffer: ArticleBuffer, backfill: bool = False
+    ) -> Dict[str, datetime]:
         """
-        Inserta artículos en la base de datos usando batch insert.
-        Mucho más rápido que INSERT uno por uno.
+        Consultar todas las keywords en paralelo, con el límite de tasa de GDELT,
+        partiendo cada ventana en tramos (ver gdelt_planner). Los artículos van
+        al buffer a medida que llegan las respuestas.
+        Returns: seendate más reciente por keyword cubierta
         """
+        queries = self.build_queries(backfill)
+        incremental = sum(
+            q.end - q.start < timedelta(days=self.days_back) for q in queries
+        )
+        logger.info(
+            f"🔍 Búsqueda GDELT {'backfill' if backfill else 'incremental'} "
+            f"({incremental}/{len(queries)} keywords desde su marca de agua)"
+        )
 
-        if not articles:
-            return 0
-
-        conn = self.get_db_connection()
-        cursor = conn.cursor()
+        latest: Dict[str, datetime] = {}
+        per_keyword: Dict[str, int] = {}
+        start = time.time()
 
-        try:
-            rows = []
+        # Los flush del buffer (COPY + aviso en Redis) son bloqueantes: van al
+        # executor para que el loop siga atendiendo las peticiones en vuelo
+        loop = asyncio.get_running_loop()
+        async for query, results in self.planner.run(queries):
+            await loop.run_in_executor(None, buffer.tick)
+            if results is None:
+                continue
+            await loop.run_in_executor(None, buffer.extend, results)
+            per_keyword[query.keyword] = per_keyword.get(query.keyword, 0) + len(results)
+            seen = [a["seendate"] for a in results if a.get("seendate")]
+            if seen:
+                newest = datetime.strptime(max(seen), "%Y%m%dT%H%M%SZ")
+                latest[query.keyword] = max(newest, latest.get(query.keyword, newest))
+
+        # La marca de agua solo avanza si la ventana de la keyword quedó
+        # cubierta entera; si no, la próxima ejecución repite el hueco
+        incomplete = self.planner.incomplete
+        watermarks = {k: v for k, v in latest.items() if k not in incomplete}
+        for keyword in sorted(incomplete):
+            logger.warning(f"  '{keyword}': cobertura incompleta, marca de agua sin mover")
+        for keyword, count in sorted(per_keyword.items(), key=lambda kv: -kv[1])[:5]:
+            logger.info(f"  '{keyword}': {count} ✓")
+
+        stats = self.fetcher.stats
+        plan = self.planner.stats
+        logger.info(
+            f"📊 Total: {buffer.stats['received']} → Únicos: {buffer.unique} "
+            f"({len(queries) - len(incomplete)}/{len(queries)} keywords completas, "
+            f"{plan['slices']} tramos, {plan['saturated']} saturados, "
+            f"{plan['subqueries']} subconsultas, {stats['requests']} peticiones, "
+            f"{stats['retries']} reintentos, {stats['skipped']} sin presupuesto, "
+            f"{time.time() - start:.1f}s)"
+        )
+        return watermarks
 
-            for a in articles:
-                pub_date = datetime.strptime(
-                    a.get("seendate", datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")),
-                    "%Y%m%dT%H%M%SZ",
-                )
-                rows.append(
-                    (
-                        a.get("url"),
-                        a.get("title"),
-                        a.get("title"),
-                        a.get("domain"),
-                        pub_date,
-                        "CO",
-                    )
-                )
+    def save_to_database(self, articles: List[Dict], lane: str = "live") -> List[int]:
+        """
+        Inserta artículos en la base de datos en bloque (COPY a staging, ver
+        article_pipeline.insert_articles).
+        lane: carril de prioridad del processor ("live" o "backfill")
+        Returns: ids de los artículos nuevos (las URLs ya guardadas no cuentan)
+        """
 
-            query = """
-                INSERT INTO news (
-                    url,
-                    title,
-                    content,
-                    source,
-                    published_date,
-                    country
+        if not articles:
+            return []
+
+        rows = []
+        for a in articles:
+            pub_date = datetime.strptime(
+                a.get("seendate", datetime.utcnow().strftime("%Y%m%dT%H%M%SZ")),
+                "%Y%m%dT%H%M%SZ",
+            )
+            rows.append(
+                (
+                    a.get("url"),
+                    a.get("title"),
+                    a.get("title"),
+                    a.get("domain"),
+                    pub_date,
+                    "CO",
+                    lane,
                 )
-                VALUES %s
-                ON CONFLICT (url) DO NOTHING
-            """
-
-            execute_values(cursor, query, rows, page_size=1000)
+            )
 
+        conn = None
+        try:
+            conn = self.get_db_connection()
+            ids = insert_articles(conn, rows, mode=self.insert_mode)
             conn.commit()
-
-            return len(rows)
-
+            return ids
+        except psycopg2.Error as e:
+            if conn is not None and not conn.closed:
+                conn.rollback()
+            # Las marcas de agua no avanzan: la próxima ejecución repite el lote
+            self.failed_flushes += 1
+            logger.error(f"Error en transacción: {str(e)}")
+            return []
         finally:
-            cursor.close()
-            conn.close()
+            if conn is not None:
+                conn.close()
 
-    def queue_for_processing(self, count: int):
-        if count > 0:
-            message = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "new_articles": count,
-                "action": "process_new_articles",
-            }
-            self.redis_client.publish("news_processing", json.dumps(message))
+    def queue_for_processing(self, ids: List[int], lane: str = "live"):
+        publish_new_articles(self.redis_client, ids, lane)
 
-    def collect(self):
+    def collect(self, backfill: bool = False):
+        """
+        Recolección incremental (por defecto) o backfill de la ventana completa.
+        El backfill entra por el carril backfill del processor.
+        """
         logger.info("=" * 70)
-        logger.info("🚀 GDELT Collection")
+        logger.info(f"🚀 GDELT Collection{' (backfill)' if backfill else ''}")
         logger.info("=" * 70)
 
         start = time.time()
-        articles = self.fetch_gdelt_articles()
-        saved = self.save_to_database(articles)
-        self.queue_for_processing(saved)
+        lane = "backfill" if backfill else "live"
+        self.failed_flushes = 0
+        buffer = ArticleBuffer(
+            lambda articles: self.save_to_database(articles, lane=lane),
+            lambda ids: self.queue_for_processing(ids, lane=lane),
+            flush_rows=self.flush_rows,
+            flush_seconds=self.flush_seconds,
+        )
+        with buffer:
+            watermarks = self.fetch_gdelt_articles(buffer, backfill)
+        # Solo tras el último lote: si falla una escritura se vuelve a pedir lo mismo
+        if self.failed_flushes:
+            logger.warning(
+                f"⚠️ {self.failed_flushes} lotes sin guardar, marcas de agua sin mover"
+            )
+        else:
+            self.save_watermarks(watermarks)
 
         elapsed = time.time() - start
         logger.info(
-            f"✅ Completado en {int(elapsed)}s - {len(articles)} artículos, {saved} guardados"
+            f"✅ Completado en {int(elapsed)}s - {buffer.unique} artículos, "
+            f"{buffer.stats['saved']} guardados en {buffer.stats['flushes']} lotes"
         )
 
+    def scheduled_collect(self):
+        """collect() para el scheduler: un fallo no detiene el proceso"""
+        try:
+            self.collect()
+        except Exception as e:
+            logger.error(f"❌ Error en la recolección: {str(e)}")
+
     def run(self):
         logger.info("🚀 GDELT Collector (OPTIMIZADO)")
-        self.collect()
+        self.scheduled_collect()
 
         interval = int(os.getenv("COLLECTION_INTERVAL", 21600))
-        schedule.every(interval).seconds.do(self.collect)
+        schedule.every(interval).seconds.do(self.scheduled_collect)
 
         while True:
             schedule.run_pending()
@@ -273,4 +411,8 @@ class GDELTCollector:
 
 if __name__ == "__main__":
     collector = GDELTCollector()
-    collector.run()
+    # python main.py backfill: una pasada completa de GDELT_DAYS_BACK días
+    if len(sys.argv) > 1 and sys.argv[1] == "backfill":
+        collector.collect(backfill=True)
+    else:
+        collector.run()
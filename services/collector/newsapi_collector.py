@@ -9,11 +9,14 @@ import logging
 import os
 import time
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Dict, Iterator, List
 
 import psycopg2
+import redis
 import requests
 
+from article_pipeline import ArticleBuffer, insert_articles, publish_new_articles
+
 # Configurar logging
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
@@ -41,6 +44,15 @@ class NewsAPICollector:
             "password": os.getenv("POSTGRES_PASSWORD", "newspass123"),
         }
 
+        # Redis: avisos al processor tras cada lote guardado
+        self.redis_client = redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            decode_responses=True,
+        )
+        self.flush_rows = int(os.getenv("COLLECTOR_FLUSH_ROWS", 500))
+        self.flush_seconds = float(os.getenv("COLLECTOR_FLUSH_SECONDS", 30))
+
         # Keywords económicos de Colombia
         self.keywords = [
             "Colombia economy",
@@ -99,10 +111,9 @@ class NewsAPICollector:
             logger.error(f"Error en request: {str(e)}")
             return {"articles": []}
 
-    def collect_all_articles(self, days_back: int = 30) -> List[Dict]:
-        """Recolectar todos los artículos disponibles"""
-        all_articles = []
-        article_urls = set()
+    def collect_all_articles(self, days_back: int = 30) -> Iterator[Dict]:
+        """Recolectar todos los artículos disponibles (se entregan por keyword)"""
+        found = 0
 
         end_date = datetime.now()
         start_date = end_date - timedelta(
@@ -121,39 +132,29 @@ class NewsAPICollector:
                 articles = result.get("articles", [])
 
                 for article in articles:
-                    url = article.get("url")
-
-                    if url and url not in article_urls:
-                        article_urls.add(url)
-
-                        # Transformar al formato de nuestra BD
-                        transformed = {
-                            "title": article.get("title", "")[:500],
-                            "url": url,
-                            "content": (
-                                article.get("description", "")
-                                + " "
-                                + article.get("content", "")
-                            )[:5000],
-                            "source": article.get("source", {}).get("name", "NewsAPI"),
-                            "published_date": self._parse_date(
-                                article.get("publishedAt")
-                            ),
-                        }
-
-                        all_articles.append(transformed)
-
-                logger.info(
-                    f"    ✓ Encontrados: {len(articles)}, Únicos totales: {len(all_articles)}"
-                )
+                    # Transformar al formato de nuestra BD; las URLs repetidas
+                    # las descarta el ArticleBuffer
+                    yield {
+                        "title": article.get("title", "")[:500],
+                        "url": article.get("url"),
+                        "content": (
+                            article.get("description", "")
+                            + " "
+                            + article.get("content", "")
+                        )[:5000],
+                        "source": article.get("source", {}).get("name", "NewsAPI"),
+                        "published_date": self._parse_date(article.get("publishedAt")),
+                    }
+                found += len(articles)
+
+                logger.info(f"    ✓ Encontrados: {len(articles)}, Total: {found}")
                 time.sleep(0.5)  # Pausita para no sobrecargar la API
 
             except Exception as e:
                 logger.warning(f"Error con keyword '{keyword}': {str(e)}")
                 continue
 
-        logger.info(f"📊 Total recolectado: {len(all_articles)} artículos únicos")
-        return all_articles
+        logger.info(f"📊 Total recolectado: {found} artículos")
 
     def _parse_date(self, date_str: str) -> datetime:
         """Parsear fecha de NewsAPI"""
@@ -162,53 +163,40 @@ class NewsAPICollector:
         except:
             return datetime.now()
 
-    def save_to_database(self, articles: List[Dict]) -> int:
-        """Guardar artículos en la base de datos"""
+    def save_to_database(self, articles: List[Dict]) -> List[int]:
+        """
+        Guardar artículos en la base de datos
+        Returns: ids de los artículos nuevos
+        """
         if not articles:
-            return 0
+            return []
+
+        rows = [
+            (
+                article["url"],
+                article["title"],
+                article["content"],
+                article["source"],
+                article["published_date"],
+                None,
+                "live",
+            )
+            for article in articles
+        ]
 
         conn = self.get_db_connection()
-        cursor = conn.cursor()
-        saved = 0
-
         try:
-            for article in articles:
-                try:
-                    cursor.execute(
-                        """
-                        INSERT INTO news (title, url, content, source, published_date, collected_at)
-                        VALUES (%s, %s, %s, %s, %s, %s)
-                        ON CONFLICT (url) DO NOTHING
-                    """,
-                        (
-                            article["title"],
-                            article["url"],
-                            article["content"],
-                            article["source"],
-                            article["published_date"],
-                            datetime.now(),
-                        ),
-                    )
-
-                    if cursor.rowcount > 0:
-                        saved += 1
-
-                except Exception as e:
-                    logger.debug(f"Error insertando artículo: {str(e)}")
-                    continue
-
+            ids = insert_articles(conn, rows)
             conn.commit()
-            logger.info(f"💾 Guardados: {saved} artículos nuevos en la BD")
-
+            logger.info(f"💾 Guardados: {len(ids)} artículos nuevos en la BD")
+            return ids
         except Exception as e:
             conn.rollback()
             logger.error(f"Error en transacción: {str(e)}")
+            return []
         finally:
-            cursor.close()
             conn.close()
 
-        return saved
-
     def run(self, days_back: int = 30):
         """Ejecutar recolección completa"""
         logger.info("=" * 70)
@@ -223,15 +211,20 @@ class NewsAPICollector:
 
         start = time.time()
 
-        # Recolectar artículos
-        articles = self.collect_all_articles(days_back)
-
-        # Guardar en BD
-        saved = self.save_to_database(articles)
+        # Recolectar y guardar por lotes: el processor empieza con el primero
+        with ArticleBuffer(
+            self.save_to_database,
+            lambda ids: publish_new_articles(self.redis_client, ids),
+            flush_rows=self.flush_rows,
+            flush_seconds=self.flush_seconds,
+        ) as buffer:
+            for article in self.collect_all_articles(days_back):
+                buffer.add(article)
+        saved = buffer.stats["saved"]
 
         elapsed = time.time() - start
         logger.info(
-            f"✅ Completado en {int(elapsed)}s - {len(articles)} artículos, {saved} nuevos guardados"
+            f"✅ Completado en {int(elapsed)}s - {buffer.unique} artículos, {saved} nuevos guardados"
         )
         logger.info("=" * 70)
 
@@ -0,0 +1,106 @@
+"""
+Pruebas del cliente de GDELT contra el servidor de replay (gdelt_replay.py)
+Uso: python -m pytest test_gdelt.py   (desde services/collector)
+"""
+
+import asyncio
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+
+from gdelt_fetcher import GDELTFetcher, GDELTQuery
+from gdelt_planner import QueryPlanner
+from gdelt_replay import ReplayServer, synthetic_cassette
+
+KEYWORDS = ["colcap", "ecopetrol", "colombia dólar"]
+
+
+@pytest.fixture
+def replay():
+    """Arranca un ReplayServer en un puerto libre; replay(cassette, **opciones)"""
+    servers = []
+
+    def start(cassette, **options):
+        server = ReplayServer(0, cassette, **options)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+def make_fetcher(server: ReplayServer, **options) -> GDELTFetcher:
+    options = {"rate": 200, "backoff_base": 0.01, "backoff_max": 0.05, **options}
+    return GDELTFetcher(
+        base_url=f"http://127.0.0.1:{server.server_address[1]}/api/v2/doc/doc",
+        **options,
+    )
+
+
+def queries_for(cassette, days: int = 365):
+    end = datetime.utcnow()
+    return [GDELTQuery(keyword, end - timedelta(days=days), end) for keyword in cassette]
+
+
+async def collect(stream):
+    return [item async for item in stream]
+
+
+def test_fetch_all_retries_server_errors(replay):
+    server = replay(synthetic_cassette(KEYWORDS, 10), error_rate=1.0)
+    fetcher = make_fetcher(server, max_retries=2)
+
+    results = asyncio.run(collect(fetcher.fetch_all(queries_for(server.cassette))))
+
+    # Cada consulta: un intento y dos reintentos, todos con 503
+    assert [articles for _, articles in results] == [None] * len(KEYWORDS)
+    assert fetcher.stats["requests"] == 3 * len(KEYWORDS)
+    assert fetcher.stats["retries"] == 2 * len(KEYWORDS)
+    assert fetcher.stats["failures"] == len(KEYWORDS)
+    assert server.stats["errors"] == 3 * len(KEYWORDS)
+
+
+def test_fetch_all_retries_rate_limited(replay):
+    # El servidor admite una petición cada 50 ms; el cliente pide más rápido
+    server = replay(synthetic_cassette(KEYWORDS, 10), min_interval=0.05)
+    fetcher = make_fetcher(server, rate=50, burst=3, max_retries=20)
+
+    results = asyncio.run(collect(fetcher.fetch_all(queries_for(server.cassette))))
+
+    assert server.stats["rate_limited"] > 0
+    assert fetcher.stats["retries"] >= server.stats["rate_limited"]
+    assert fetcher.stats["failures"] == 0
+    assert sorted(len(articles) for _, articles in results) == [10] * len(KEYWORDS)
+
+
+def test_fetch_all_respects_budget(replay):
+    cassette = synthetic_cassette([f"keyword {i}" for i in range(6)], 5)
+    server = replay(cassette)
+    fetcher = make_fetcher(server, concurrency=2)
+
+    results = asyncio.run(
+        collect(fetcher.fetch_all(queries_for(cassette), budget=2))
+    )
+
+    assert len(results) == 6
+    assert server.stats["requests"] == fetcher.stats["requests"] == 2
+    assert fetcher.stats["skipped"] == 4
+    assert sum(articles is None for _, articles in results) == 4
+
+
+def test_planner_recovers_saturated_keyword(replay):
+    # 3000 artículos en un año: cada tramo de 90 días satura maxrecords (250)
+    cassette = synthetic_cassette(["colcap"], 3000)
+    server = replay(cassette)
+    planner = QueryPlanner(make_fetcher(server), slice_days=90)
+
+    results = asyncio.run(collect(planner.run(queries_for(cassette))))
+
+    urls = {a["url"] for _, articles in results for a in articles or []}
+    assert urls == {a["url"] for a in cassette["colcap"]}
+    assert planner.stats["saturated"] > 0
+    assert not planner.incomplete
@@ -0,0 +1,246 @@
+"""
+Backfill offline de archivo a archivo
+Puntúa un volcado histórico (CSV, JSONL o Parquet) en un pool de procesos,
+leyendo por bloques con memoria acotada y sin Redis ni PostgreSQL, y escribe
+un CSV listo para cargarse con un único COPY. Los términos del índice
+invertido (news_terms) van en un segundo CSV (url, term).
+
+Por defecto hace una primera pasada que solo tokeniza para construir la tabla
+de frecuencia documental, de modo que todos los workers rankean las keywords
+con el mismo TF-IDF (--single-pass la omite).
+
+Carga sugerida (psql):
+    CREATE TEMP TABLE news_backfill (LIKE news INCLUDING DEFAULTS);
+    \\copy news_backfill (<columnas>) FROM 'salida.csv' WITH (FORMAT csv, HEADER true)
+    INSERT INTO news (<columnas>) SELECT <columnas> FROM news_backfill
+    ON CONFLICT (url) DO NOTHING;
+    CREATE TEMP TABLE news_backfill_terms (url TEXT, term TEXT);
+    \\copy news_backfill_terms FROM 'salida.terms.csv' WITH (FORMAT csv, HEADER true)
+    INSERT INTO news_terms (term, news_id)
+    SELECT t.term, n.id FROM news_backfill_terms t JOIN news n USING (url)
+    ON CONFLICT DO NOTHING;
+
+Uso: python backfill.py entrada.{csv,jsonl,parquet} salida.csv
+         [--workers N] [--chunk-size 500] [--single-pass]
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from concurrent.futures import (
+    ALL_COMPLETED,
+    FIRST_COMPLETED,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from keywords import DocumentFrequency, candidate_terms
+from lexicon import tokenize
+from writeback import pg_array, pg_float
+
+logger = logging.getLogger(__name__)
+
+# Columnas de news que se escriben (en este orden)
+COLUMNS = [
+    "url",
+    "title",
+    "content",
+    "source",
+    "published_date",
+    "country",
+    "sentiment_score",
+    "sentiment_label",
+    "keyword_score",
+    "textblob_polarity",
+    "vader_compound",
+    "categories",
+    "keywords",
+    "lexicon_version",
+]
+INPUT_COLUMNS = ["url", "title", "content", "source", "published_date", "country"]
+# Columnas NOT NULL de news: una fila sin ellas haría fallar el COPY entero
+REQUIRED_COLUMNS = ["url", "title", "published_date"]
+
+# Procesador propio de cada worker del pool
+_worker_processor = None
+
+
+def read_articles(path: str, chunk_size: int) -> Iterator[List[Dict]]:
+    """Bloques de artículos del volcado (nunca se carga el archivo completo)"""
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        parquet = pq.ParquetFile(path)
+        for batch in parquet.iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            rows = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def is_loadable(article: Dict) -> bool:
+    """El artículo tiene todas las columnas obligatorias de news"""
+    return all(article.get(column) for column in REQUIRED_COLUMNS)
+
+
+def build_document_frequency(path: str, chunk_size: int) -> DocumentFrequency:
+    """Primera pasada: solo tokenización, para la tabla DF del volcado completo"""
+    document_frequency = DocumentFrequency()
+    for chunk in read_articles(path, chunk_size):
+        for article in chunk:
+            if not is_loadable(article):
+                continue
+            text = f"{article.get('title') or ''} {article.get('content') or ''}"
+            document_frequency.add_document(candidate_terms(tokenize(text)))
+    return document_frequency
+
+
+def _init_worker(df_state: Optional[Tuple[np.ndarray, int]]):
+    """NewsProcessor sin caché de Redis y con la tabla DF local (o fija)"""
+    global _worker_processor
+    os.environ["SCORING_CACHE_ENABLED"] = "false"
+    os.environ["PROCESSOR_FAST_START"] = "false"
+    from main import NewsProcessor
+
+    _worker_processor = NewsProcessor()
+    document_frequency = DocumentFrequency(frozen=df_state is not None)
+    if df_state is not None:
+        document_frequency.load_state(*df_state)
+    _worker_processor.document_frequency = document_frequency
+
+
+def _score_chunk(
+    articles: List[Dict],
+) -> Tuple[List[List], List[Tuple[str, str]], int]:
+    """Puntuar un bloque: (filas de news, filas de news_terms, omitidos)"""
+    rows, terms, skipped = [], [], 0
+    for i, article in enumerate(articles):
+        if not is_loadable(article):
+            skipped += 1
+            continue
+
+        result = _worker_processor.process_article(
+            {
+                "id": i,
+                "title": article["title"],
+                "content": article.get("content") or "",
+            }
+        )
+        if "error" in result:
+            skipped += 1
+            continue
+        # Sin tabla precalculada (--single-pass) la DF se construye sobre la marcha
+        _worker_processor.document_frequency.add_document(result["document_terms"])
+
+        rows.append(
+            [article.get(column) or "" for column in INPUT_COLUMNS]
+            + [
+                repr(float(result["sentiment_score"])),
+                result["sentiment_label"],
+                pg_float(result["keyword_score"]),
+                pg_float(result["textblob_polarity"]),
+                pg_float(result["vader_compound"]),
+                pg_array(result["categories"]),
+                pg_array(result["keywords"]),
+                result["lexicon_version"],
+            ]
+        )
+        terms.extend((article["url"], term) for term in result["terms"])
+    return rows, terms, skipped
+
+
+def terms_path(output: str) -> str:
+    root, ext = os.path.splitext(output)
+    return f"{root}.terms{ext or '.csv'}"
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--single-pass", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(
+        level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
+    )
+
+    start = time.time()
+    df_state = None
+    if not args.single_pass:
+        document_frequency = build_document_frequency(args.input, args.chunk_size)
+        df_state = document_frequency.state()
+        logger.info(
+            f"Tabla DF: {document_frequency.documents} documentos "
+            f"en {time.time() - start:.1f}s"
+        )
+
+    scoring_start = time.time()
+    written = skipped = 0
+    # Como mucho dos bloques en vuelo por worker: memoria acotada
+    max_in_flight = 2 * args.workers
+
+    with open(args.output, "w", encoding="utf-8", newline="") as out, open(
+        terms_path(args.output), "w", encoding="utf-8", newline=""
+    ) as terms_out, ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_init_worker, initargs=(df_state,)
+    ) as pool:
+        writer = csv.writer(out)
+        writer.writerow(COLUMNS)
+        terms_writer = csv.writer(terms_out)
+        terms_writer.writerow(["url", "term"])
+
+        def drain(futures, return_when):
+            nonlocal written, skipped
+            done, pending = wait(futures, return_when=return_when)
+            for future in done:
+                rows, terms, chunk_skipped = future.result()
+                writer.writerows(rows)
+                terms_writer.writerows(terms)
+                written += len(rows)
+                skipped += chunk_skipped
+            return pending
+
+        in_flight = set()
+        for chunk in read_articles(args.input, args.chunk_size):
+            in_flight.add(pool.submit(_score_chunk, chunk))
+            if len(in_flight) >= max_in_flight:
+                in_flight = drain(in_flight, FIRST_COMPLETED)
+                elapsed = time.time() - scoring_start
+                logger.info(f"{written} artículos ({written / elapsed:.0f} art/s)")
+        drain(in_flight, ALL_COMPLETED)
+
+    elapsed = time.time() - scoring_start
+    logger.info(
+        f"✅ {written} artículos puntuados en {elapsed:.1f}s "
+        f"({written / elapsed:.0f} art/s, {args.workers} workers), "
+        f"{skipped} omitidos. Total con tabla DF: {time.time() - start:.1f}s"
+    )
+    logger.info(
+        f"Carga: \\copy news_backfill ({', '.join(COLUMNS)}) FROM '{args.output}' "
+        "WITH (FORMAT csv, HEADER true)"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Tamaño de lote adaptativo
+Ajusta el tamaño de lote a partir de la latencia medida por artículo para
+acercarse a una duración objetivo por lote, dentro de límites configurados.
+"""
+
+from typing import Optional
+
+
+class AdaptiveBatcher:
+    """Calcula el siguiente tamaño de lote a partir del backlog y la latencia medida"""
+
+    def __init__(
+        self,
+        initial_size: int = 50,
+        min_size: int = 10,
+        max_size: int = 1000,
+        target_seconds: float = 5.0,
+        drain_factor: float = 4.0,
+        smoothing: float = 0.3,
+    ):
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.drain_factor = drain_factor
+        self.smoothing = smoothing
+
+        self.size = self._clamp(initial_size)
+        # Medias móviles exponenciales: segundos por artículo y coste fijo por lote
+        self.latency: Optional[float] = None
+        self.overhead = 0.0
+        self.rate = 0.0
+
+    def _clamp(self, size: float) -> int:
+        return int(max(self.min_size, min(self.max_size, size)))
+
+    def _smooth(self, previous: Optional[float], sample: float) -> float:
+        if previous is None:
+            return sample
+        return previous + self.smoothing * (sample - previous)
+
+    def next_size(self, backlog: Optional[int] = None) -> int:
+        """
+        Tamaño para el siguiente lote.
+        Con un backlog grande (≥ 10 lotes) se alarga la duración objetivo
+        (drain_factor) para amortizar el coste fijo de reclamar y escribir.
+        """
+        if self.latency is None or self.latency <= 0:
+            return self.size
+
+        target = self.target_seconds
+        if backlog is not None and backlog >= 10 * self.size:
+            target *= self.drain_factor
+
+        ideal = max(target - self.overhead, 0) / self.latency
+        # Cambios graduales: como mucho duplicar o reducir a la mitad por lote
+        self.size = self._clamp(max(self.size / 2, min(self.size * 2, ideal)))
+        return self.size
+
+    def record(self, count: int, scoring_seconds: float, total_seconds: float):
+        """Registrar un lote: artículos, tiempo de puntuación y tiempo total"""
+        if count <= 0:
+            return
+        self.latency = self._smooth(self.latency, scoring_seconds / count)
+        self.overhead = self._smooth(
+            self.overhead, max(total_seconds - scoring_seconds, 0.0)
+        )
+        if total_seconds > 0:
+            self.rate = self._smooth(self.rate or None, count / total_seconds)
@@ -0,0 +1,61 @@
+"""
+Benchmark de clasificación por categorías
+Compara el escaneo por substring (una búsqueda por keyword) contra el
+autómata Aho-Corasick sobre tokens a medida que crece la taxonomía.
+
+Uso: python benchmark_categories.py [repeticiones]
+"""
+
+import sys
+import time
+
+from benchmark_lexicon import HEADLINES
+from benchmark_tokenizer import BODY
+from lexicon import tokenize
+from main import NewsProcessor
+from matcher import KeywordMatcher
+
+
+def grow_table(base, size):
+    """Taxonomía sintética con ~size keywords a partir de la tabla real"""
+    table = {category: list(keywords) for category, keywords in base.items()}
+    i = 0
+    while sum(len(k) for k in table.values()) < size:
+        table[f"categoria_{i % 20}"] = table.get(f"categoria_{i % 20}", []) + [
+            f"termino{i}"
+        ]
+        i += 1
+    return table
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    corpus = [f"{headline} {BODY * 10}" for headline in HEADLINES] * repetitions
+    token_lists = [tokenize(text) for text in corpus]
+    base = NewsProcessor().categories_keywords
+
+    print(f"Corpus: {len(corpus)} artículos (~{len(corpus[0])} caracteres)")
+    for size in (33, 100, 300, 1000):
+        table = grow_table(base, size)
+        lowered = {c: [k.lower() for k in kws] for c, kws in table.items()}
+
+        start = time.perf_counter()
+        for text in corpus:
+            text_lower = text.lower()
+            [c for c, kws in lowered.items() if any(k in text_lower for k in kws)]
+        substring = len(corpus) / (time.perf_counter() - start)
+
+        matcher = KeywordMatcher(table)
+        start = time.perf_counter()
+        for tokens in token_lists:
+            matcher.match(tokens)
+        automaton = len(corpus) / (time.perf_counter() - start)
+
+        print(
+            f"{size:>5} keywords  substring: {substring:>10,.0f} art/s  "
+            f"autómata: {automaton:>10,.0f} art/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
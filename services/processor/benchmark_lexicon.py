@@ -0,0 +1,113 @@
+"""
+Micro-benchmark del motor de léxico
+Compara el análisis por keywords reconstruyendo las tablas en cada llamada
+(comportamiento anterior) contra el léxico precompilado al importar.
+
+Uso: python benchmark_lexicon.py [repeticiones]
+"""
+
+import sys
+import time
+import unicodedata
+from typing import Callable, List
+
+from lexicon import (
+    INTENSIFIERS,
+    LEMMATIZATION_RULES,
+    NEGATIONS,
+    NEGATIVE_ECONOMIC,
+    POSITIVE_ECONOMIC,
+    normalize_text,
+    score_tokens,
+)
+
+# Corpus fijo de titulares económicos
+HEADLINES = [
+    "El COLCAP cae 2% por temor a la inflación en Colombia",
+    "Ecopetrol reporta ganancias récord en el tercer trimestre",
+    "Bancolombia no logra recuperar la confianza de los inversionistas",
+    "El dólar sube muy fuertemente frente al peso colombiano",
+    "Gobierno aprueba reforma tributaria sin acuerdo en el Congreso",
+    "La economía crece ligeramente pese a la crisis internacional",
+    "Banco de la República mantiene estable la tasa de interés",
+    "Exportaciones de café alcanzan su máximo histórico",
+    "Desempleo aumentó y preocupa a los analistas del mercado",
+    "Grupo Argos anuncia nueva inversión de millones de dólares",
+    "Nutresa cerró el año con utilidades superiores a lo esperado",
+    "Devaluación del peso impacta severamente a los importadores",
+    "Avianca suspende rutas por la caída de la demanda",
+    "Inflación en Colombia disminuyó por tercer mes consecutivo",
+    "Analistas advierten riesgo de recesión y desaceleración",
+    "Petróleo repunta y el mercado bursátil colombiano avanza",
+]
+
+
+def legacy_keyword_score(text: str) -> float:
+    """Réplica del análisis anterior: tablas reconstruidas en cada llamada"""
+    lemmatization_rules = dict(LEMMATIZATION_RULES)
+    intensifiers = dict(INTENSIFIERS)
+    negations = list(NEGATIONS)
+    positive_economic = dict(POSITIVE_ECONOMIC)
+    negative_economic = dict(NEGATIVE_ECONOMIC)
+
+    text = "".join(
+        c
+        for c in unicodedata.normalize("NFD", text.lower())
+        if unicodedata.category(c) != "Mn"
+    )
+    words = [lemmatization_rules.get(w, w) for w in text.split()]
+    scores = []
+
+    for i, word in enumerate(words):
+        intensifier = 1.0
+        is_negated = False
+
+        if i > 0 and words[i - 1] in intensifiers:
+            intensifier = intensifiers[words[i - 1]]
+
+        if i > 0 and words[i - 1] in negations:
+            is_negated = True
+        elif i > 1 and words[i - 2] in negations:
+            is_negated = True
+
+        if word in positive_economic:
+            score = positive_economic[word] * intensifier
+            scores.append(-score if is_negated else score)
+        elif word in negative_economic:
+            score = negative_economic[word] * intensifier
+            scores.append(-score if is_negated else score)
+
+    return sum(scores)
+
+
+def compiled_keyword_score(text: str) -> float:
+    """Análisis con el léxico precompilado"""
+    return score_tokens(normalize_text(text).split())
+
+
+def measure(fn: Callable[[str], float], corpus: List[str]) -> float:
+    """Artículos por segundo procesados por fn"""
+    start = time.perf_counter()
+    for text in corpus:
+        fn(text)
+    return len(corpus) / (time.perf_counter() - start)
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    corpus = HEADLINES * repetitions
+
+    for text in HEADLINES:
+        assert legacy_keyword_score(text) == compiled_keyword_score(text)
+
+    legacy = measure(legacy_keyword_score, corpus)
+    compiled = measure(compiled_keyword_score, corpus)
+
+    print(f"Corpus: {len(corpus)} titulares")
+    print(f"Tablas por llamada:   {legacy:>12,.0f} artículos/s")
+    print(f"Léxico precompilado:  {compiled:>12,.0f} artículos/s")
+    print(f"Mejora:               {compiled / legacy:>12.1f}x")
+
+
+if __name__ == "__main__":
+    main()
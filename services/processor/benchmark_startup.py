@@ -0,0 +1,65 @@
+"""
+Benchmark de arranque en frío del processor
+Mide el tiempo hasta el primer artículo puntuado en un proceso nuevo, con
+carga ansiosa (PROCESSOR_FAST_START=false) y con arranque rápido (imports
+perezosos en segundo plano + snapshot de VADER si existe).
+
+--io-delay simula la conexión a la BD y el primer reclamo de artículos, que
+en arranque rápido se solapa con la carga de los analizadores.
+
+Uso: python benchmark_startup.py [--runs N] [--io-delay SEGUNDOS]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import time
+start = time.perf_counter()
+import logging
+logging.disable(logging.CRITICAL)
+from main import NewsProcessor
+processor = NewsProcessor()
+processor.scoring_cache = None
+time.sleep({io_delay})
+processor.process_article(
+    {{"id": 1, "title": "El COLCAP cae por temor a la inflación", "content": ""}}
+)
+print(time.perf_counter() - start)
+"""
+
+
+def time_to_first_article(fast_start: bool, io_delay: float) -> float:
+    env = dict(os.environ, PROCESSOR_FAST_START="true" if fast_start else "false")
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD.format(io_delay=io_delay)],
+        env=env,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--io-delay", type=float, default=0.0)
+    args = parser.parse_args()
+
+    for name, fast_start in (("Carga ansiosa", False), ("Arranque rápido", True)):
+        samples = [
+            time_to_first_article(fast_start, args.io_delay) for _ in range(args.runs)
+        ]
+        print(
+            f"{name:<16} primer artículo: mediana {statistics.median(samples):.3f}s "
+            f"(min {min(samples):.3f}s, max {max(samples):.3f}s)"
+        )
+
+
+if __name__ == "__main__":
+    main()
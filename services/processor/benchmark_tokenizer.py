@@ -0,0 +1,67 @@
+"""
+Benchmark de tokenización por artículo
+Compara las tres pasadas anteriores sobre el texto (normalize_text con
+unicodedata, lower() para categorías y lower().split() para keywords)
+contra una única tokenización compartida con str.translate.
+
+Uso: python benchmark_tokenizer.py [repeticiones]
+"""
+
+import sys
+import time
+import unicodedata
+from typing import Callable, List
+
+from benchmark_lexicon import HEADLINES
+from lexicon import LEMMATIZATION_RULES, lemmatize, tokenize
+
+# Cuerpo de ejemplo para aproximar título + contenido
+BODY = (
+    "Según analistas del mercado, la Bolsa de Valores de Colombia registró "
+    "una jornada con alta volatilidad, mientras el Banco de la República "
+    "evalúa la política monetaria frente a la inflación y la tasa de cambio. "
+)
+
+
+def legacy_passes(text: str):
+    """Tres pasadas independientes sobre el mismo texto"""
+    normalized = "".join(
+        c
+        for c in unicodedata.normalize("NFD", text.lower())
+        if unicodedata.category(c) != "Mn"
+    )
+    sentiment_words = [LEMMATIZATION_RULES.get(w, w) for w in normalized.split()]
+    category_text = text.lower()
+    keyword_words = text.lower().split()
+    return sentiment_words, category_text, keyword_words
+
+
+def shared_pass(text: str):
+    """Una tokenización reutilizada por los tres análisis"""
+    tokens = tokenize(text)
+    return lemmatize(tokens), " ".join(tokens), tokens
+
+
+def cpu_per_article(fn: Callable[[str], object], corpus: List[str]) -> float:
+    """Microsegundos de CPU por artículo"""
+    start = time.process_time()
+    for text in corpus:
+        fn(text)
+    return (time.process_time() - start) / len(corpus) * 1e6
+
+
+def main():
+    repetitions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    corpus = [f"{headline} {BODY * 3}" for headline in HEADLINES] * repetitions
+
+    legacy = cpu_per_article(legacy_passes, corpus)
+    shared = cpu_per_article(shared_pass, corpus)
+
+    print(f"Corpus: {len(corpus)} artículos (~{len(corpus[0])} caracteres)")
+    print(f"Tres pasadas:         {legacy:>8.1f} µs CPU/artículo")
+    print(f"Tokenización única:   {shared:>8.1f} µs CPU/artículo")
+    print(f"Ahorro:               {legacy - shared:>8.1f} µs CPU/artículo")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Benchmark de escritura de artículos procesados
+Compara UPDATE fila a fila, execute_values y COPY + UPDATE ... FROM.
+
+Se ejecuta contra PostgreSQL (variables POSTGRES_*) sobre una tabla temporal
+llamada "news" que oculta la real durante la sesión: no modifica datos.
+
+Uso: python benchmark_writeback.py [tamaños...]   (por defecto 10000 100000 1000000)
+"""
+
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+import psycopg2
+from psycopg2.extras import execute_values
+
+from writeback import copy_updates
+
+# Lote por transacción en execute_values y COPY (igual que PROCESSOR_FLUSH_SIZE)
+FLUSH_SIZE = int(os.getenv("PROCESSOR_FLUSH_SIZE", 500))
+
+# Worker que "reclamó" las filas de la tabla temporal
+WORKER_ID = "benchmark"
+
+# Por encima de este tamaño el UPDATE fila a fila se omite (tarda horas)
+MAX_PER_ROW = int(os.getenv("BENCH_MAX_PER_ROW", 100000))
+
+LABELS = ["positive", "negative", "neutral"]
+CATEGORIES = ["mercados", "divisas", "banca", "commodities", "general"]
+KEYWORDS = ["colcap", "ecopetrol", "dólar", "inflación", "bancolombia", "tasa"]
+
+
+def make_results(n: int) -> List[Dict]:
+    """Resultados sintéticos con la forma de process_article"""
+    rng = random.Random(42)
+    return [
+        {
+            "id": i,
+            "sentiment_score": rng.uniform(-0.5, 1.2),
+            "sentiment_label": rng.choice(LABELS),
+            "keyword_score": rng.uniform(-1, 1),
+            "textblob_polarity": rng.uniform(-1, 1),
+            "vader_compound": rng.uniform(-1, 1),
+            "categories": rng.sample(CATEGORIES, 2),
+            "keywords": rng.sample(KEYWORDS, 5),
+            # Sin términos: se compara solo la escritura de scores
+            "lexicon_version": "bench",
+            "terms": [],
+        }
+        for i in range(1, n + 1)
+    ]
+
+
+def setup(conn, n: int):
+    """Crear y poblar la tabla temporal news con n artículos sin procesar, reclamados"""
+    cursor = conn.cursor()
+    cursor.execute("DROP TABLE IF EXISTS pg_temp.news")
+    cursor.execute("DROP TABLE IF EXISTS pg_temp.news_terms")
+    cursor.execute(
+        """
+        CREATE TEMP TABLE news (
+            id INTEGER PRIMARY KEY,
+            sentiment_score FLOAT,
+            sentiment_label VARCHAR(20),
+            keyword_score FLOAT,
+            textblob_polarity FLOAT,
+            vader_compound FLOAT,
+            categories TEXT[],
+            keywords TEXT[],
+            lexicon_version TEXT,
+            needs_rescore BOOLEAN DEFAULT FALSE,
+            scoring_attempts INTEGER NOT NULL DEFAULT 0,
+            claimed_by TEXT,
+            lease_expires_at TIMESTAMP,
+            updated_at TIMESTAMP
+        )
+    """
+    )
+    cursor.execute("CREATE TEMP TABLE news_terms (term TEXT, news_id INTEGER)")
+    cursor.execute(
+        "INSERT INTO news (id, claimed_by) SELECT generate_series(1, %s), %s",
+        (n, WORKER_ID),
+    )
+    conn.commit()
+    cursor.close()
+
+
+def per_row(conn, results: List[Dict]):
+    """Un UPDATE y un commit por artículo (ruta update_article)"""
+    cursor = conn.cursor()
+    for r in results:
+        cursor.execute(
+            """
+            UPDATE news
+            SET sentiment_score = %s, sentiment_label = %s, categories = %s,
+                keywords = %s, claimed_by = NULL, lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE id = %s
+        """,
+            (
+                r["sentiment_score"],
+                r["sentiment_label"],
+                r["categories"],
+                r["keywords"],
+                r["id"],
+            ),
+        )
+        conn.commit()
+    cursor.close()
+
+
+def with_execute_values(conn, results: List[Dict]):
+    """UPDATE ... FROM (VALUES ...) por lote"""
+    cursor = conn.cursor()
+    for i in range(0, len(results), FLUSH_SIZE):
+        rows = [
+            (
+                r["id"],
+                r["sentiment_score"],
+                r["sentiment_label"],
+                r["categories"],
+                r["keywords"],
+            )
+            for r in results[i : i + FLUSH_SIZE]
+        ]
+        execute_values(
+            cursor,
+            """
+            UPDATE news AS n
+            SET sentiment_score = v.score, sentiment_label = v.label,
+                categories = v.categories, keywords = v.keywords,
+                claimed_by = NULL, lease_expires_at = NULL,
+                updated_at = CURRENT_TIMESTAMP
+            FROM (VALUES %s) AS v(id, score, label, categories, keywords)
+            WHERE n.id = v.id
+        """,
+            rows,
+            template="(%s, %s, %s, %s::text[], %s::text[])",
+            page_size=FLUSH_SIZE,
+        )
+        conn.commit()
+    cursor.close()
+
+
+def with_copy(conn, results: List[Dict]):
+    """COPY a tabla temporal + un UPDATE ... FROM por lote"""
+    cursor = conn.cursor()
+    for i in range(0, len(results), FLUSH_SIZE):
+        copy_updates(cursor, results[i : i + FLUSH_SIZE], WORKER_ID)
+        conn.commit()
+    cursor.close()
+
+
+def main():
+    sizes = [int(a) for a in sys.argv[1:]] or [10_000, 100_000, 1_000_000]
+    conn = psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        database=os.getenv("POSTGRES_DB", "news_colcap"),
+        user=os.getenv("POSTGRES_USER", "newsuser"),
+        password=os.getenv("POSTGRES_PASSWORD", "newspass123"),
+    )
+
+    methods = [
+        ("UPDATE fila a fila", per_row),
+        ("execute_values", with_execute_values),
+        ("COPY + UPDATE FROM", with_copy),
+    ]
+
+    print(f"{'artículos':>10}  {'método':<20} {'segundos':>10} {'artículos/s':>12}")
+    try:
+        for n in sizes:
+            results = make_results(n)
+            for name, method in methods:
+                if method is per_row and n > MAX_PER_ROW:
+                    print(f"{n:>10}  {name:<20} {'omitido':>10}")
+                    continue
+
+                setup(conn, n)
+                start = time.perf_counter()
+                method(conn, results)
+                elapsed = time.perf_counter() - start
+                print(f"{n:>10}  {name:<20} {elapsed:>10.2f} {n / elapsed:>12,.0f}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+"""
+Caché de puntuación por contenido
+LRU en memoria delante de un nivel compartido en Redis (TTL y tamaño acotado).
+La clave es un hash del texto normalizado, de modo que las copias sindicadas
+de una misma noticia se puntúan una sola vez.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+
+class ScoringCache:
+    """Caché de dos niveles: LRU local + Redis compartido entre réplicas"""
+
+    KEY_PREFIX = "score_cache"
+    INDEX_KEY = "score_cache:index"
+    STATS_KEY = "score_cache:stats"
+
+    def __init__(
+        self,
+        redis_client: redis.Redis,
+        namespace: str,
+        local_size: int = 10000,
+        ttl: int = 604800,
+        max_entries: int = 200000,
+    ):
+        self.redis_client = redis_client
+        self.namespace = namespace
+        self.local_size = local_size
+        self.ttl = ttl
+        self.max_entries = max_entries
+
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+        # Contadores (los deltas se publican en Redis con publish_stats)
+        self.stats = {"local_hits": 0, "redis_hits": 0, "misses": 0}
+        self._published = dict(self.stats)
+
+    def key(self, tokens: Iterable[str]) -> str:
+        """Hash del texto normalizado, separado por versión de léxico/categorías"""
+        digest = hashlib.blake2b(" ".join(tokens).encode(), digest_size=16)
+        return f"{self.KEY_PREFIX}:{self.namespace}:{digest.hexdigest()}"
+
+    def _count(self, counter: str):
+        with self._lock:
+            self.stats[counter] += 1
+
+    def _remember(self, key: str, value: Dict):
+        with self._lock:
+            self._local[key] = value
+            self._local.move_to_end(key)
+            if len(self._local) > self.local_size:
+                self._local.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Resultado cacheado o None"""
+        with self._lock:
+            value = self._local.get(key)
+            if value is not None:
+                self._local.move_to_end(key)
+                self.stats["local_hits"] += 1
+                return value
+
+        try:
+            raw = self.redis_client.get(key)
+        except redis.RedisError as e:
+            logger.warning(f"Caché Redis no disponible: {str(e)}")
+            raw = None
+
+        if raw is None:
+            self._count("misses")
+            return None
+
+        value = json.loads(raw)
+        self._remember(key, value)
+        self._count("redis_hits")
+        return value
+
+    def set(self, key: str, value: Dict):
+        """Guardar en ambos niveles; Redis se recorta a max_entries (los más antiguos)"""
+        self._remember(key, value)
+
+        try:
+            pipe = self.redis_client.pipeline()
+            pipe.setex(key, self.ttl, json.dumps(value))
+            pipe.zadd(self.INDEX_KEY, {key: time.time()})
+            pipe.zcard(self.INDEX_KEY)
+            size = pipe.execute()[-1]
+
+            overflow = size - self.max_entries
+            if overflow > 0:
+                evicted = [k for k, _ in self.redis_client.zpopmin(self.INDEX_KEY, overflow)]
+                if evicted:
+                    self.redis_client.delete(*evicted)
+
+        except redis.RedisError as e:
+            logger.warning(f"Caché Redis no disponible: {str(e)}")
+
+    def publish_stats(self):
+        """Sumar los contadores acumulados al hash compartido de Redis"""
+        with self._lock:
+            deltas = {k: v - self._published[k] for k, v in self.stats.items()}
+            self._published = dict(self.stats)
+
+        deltas = {k: v for k, v in deltas.items() if v}
+        if not deltas:
+            return
+
+        try:
+            pipe = self.redis_client.pipeline()
+            for counter, delta in deltas.items():
+                pipe.hincrby(self.STATS_KEY, counter, delta)
+            pipe.execute()
+        except redis.RedisError as e:
+            logger.warning(f"No se pudieron publicar métricas de caché: {str(e)}")
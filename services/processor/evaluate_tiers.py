@@ -0,0 +1,102 @@
+"""
+Evaluación offline de los niveles de puntuación
+Puntúa un corpus almacenado con cada nivel (keyword, vader, full con early
+exit y full) y reporta throughput frente a concordancia de etiquetas.
+
+El corpus es un archivo JSONL o CSV con columnas title, content y, opcional,
+label (etiqueta de referencia). Sin label, la referencia es el nivel full.
+Sin archivo se usa el corpus fijo de titulares de benchmark_lexicon.
+
+Uso: python evaluate_tiers.py [corpus.jsonl|corpus.csv] [--repeat N]
+"""
+
+import argparse
+import csv
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Tuple
+
+# (nombre, SCORING_TIER, SCORING_EARLY_EXIT), del más barato al más caro
+TIERS = [
+    ("keyword", "keyword", "false"),
+    ("vader", "vader", "false"),
+    ("full+early-exit", "full", "true"),
+    ("full", "full", "false"),
+]
+
+
+def load_corpus(path: str) -> List[Dict]:
+    """Leer artículos desde JSONL o CSV"""
+    with open(path, encoding="utf-8", newline="") as f:
+        if path.endswith(".csv"):
+            return list(csv.DictReader(f))
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def build_processor(tier: str, early_exit: str):
+    """NewsProcessor con el nivel dado, carga ansiosa y sin caché de puntuación"""
+    os.environ.update(
+        SCORING_TIER=tier,
+        SCORING_EARLY_EXIT=early_exit,
+        PROCESSOR_FAST_START="false",
+        SCORING_CACHE_ENABLED="false",
+    )
+    from main import NewsProcessor
+
+    return NewsProcessor()
+
+
+def score_corpus(processor, corpus: List[Dict]) -> Tuple[List[str], float]:
+    """Etiquetas del corpus y artículos por segundo"""
+    start = time.perf_counter()
+    labels = [
+        processor.analyze_sentiment(
+            f"{article['title']} {article.get('content') or ''}"
+        )[1]
+        for article in corpus
+    ]
+    return labels, len(corpus) / (time.perf_counter() - start)
+
+
+def agreement(labels: List[str], reference: List[str]) -> float:
+    return sum(a == b for a, b in zip(labels, reference)) / len(reference)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("corpus", nargs="?")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    if args.corpus:
+        corpus = load_corpus(args.corpus)
+    else:
+        from benchmark_lexicon import HEADLINES
+
+        corpus = [{"title": headline, "content": ""} for headline in HEADLINES]
+    corpus = corpus * args.repeat
+
+    results = {}
+    for name, tier, early_exit in TIERS:
+        results[name] = score_corpus(build_processor(tier, early_exit), corpus)
+
+    gold = [article.get("label") for article in corpus]
+    if all(gold):
+        reference, reference_name = gold, "etiquetas del corpus"
+    else:
+        reference, reference_name = results["full"][0], "nivel full"
+
+    print(f"{len(corpus)} artículos, concordancia frente a {reference_name}")
+    full_rate = results["full"][1]
+    for name, (labels, rate) in results.items():
+        print(
+            f"{name:<16} {rate:>10.0f} art/s ({rate / full_rate:>5.1f}x)  "
+            f"concordancia {agreement(labels, reference):.1%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
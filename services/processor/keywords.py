@@ -0,0 +1,183 @@
+"""
+Extracción de keywords por TF-IDF
+Selección parcial (top-k con heap) sobre tokens sin stopwords, ponderada por
+una tabla de frecuencia documental del corpus. La tabla es un count-min
+sketch de tamaño fijo (unos MB para millones de artículos) que cada réplica
+actualiza por lote y comparte en Redis con BITFIELD INCRBY.
+"""
+
+import hashlib
+import heapq
+import logging
+import math
+import threading
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import redis
+
+logger = logging.getLogger(__name__)
+
+# Stopwords en español, sin tildes (los tokens ya vienen normalizados)
+STOPWORDS = frozenset(
+    """
+    a al algo algun alguna algunas alguno algunos ante antes aqui asi aun
+    aunque bajo bien cada casi como con contra cual cuales cuando cuyo de del
+    desde donde dos durante e el ella ellas ello ellos en entre era eran es esa
+    esas ese eso esos esta estaba estaban estado estan estar estas este esto
+    estos fue fueron gran ha hace hacen hacer hacia han hasta hay la las le les
+    lo los mas me mediante menos mientras mismo mismos mucho muchos muy nada ni
+    no nos nuestra nuestro nuevo nueva o otra otras otro otros para parte pero
+    poco por porque puede pueden pues que quien quienes se segun ser sera seran
+    si sido siempre sin sino sobre solo son su sus tal tambien tan tanto tiene
+    tienen toda todas todo todos tras tres un una unas uno unos ya
+    ademas ahora ano anos asimismo cerca dentro dia dias dijo hoy manera
+    momento mes meses vez veces
+    """.split()
+)
+
+# Longitud mínima de un candidato a keyword
+MIN_LENGTH = 4
+
+
+def candidate_terms(tokens: Iterable[str]) -> List[str]:
+    """Tokens candidatos a keyword: sin stopwords y con longitud mínima"""
+    return [t for t in tokens if len(t) >= MIN_LENGTH and t not in STOPWORDS]
+
+
+class DocumentFrequency:
+    """
+    Frecuencia documental aproximada (count-min sketch): depth filas de width
+    contadores; df(t) es el mínimo de sus contadores, nunca menor que el real.
+    Los incrementos locales se acumulan y se envían a Redis en flush(), que
+    además recarga periódicamente el sketch combinado de todas las réplicas.
+    """
+
+    SKETCH_KEY = "keyword_df:sketch"
+    DOCS_KEY = "keyword_df:docs"
+
+    def __init__(
+        self,
+        redis_client: Optional[redis.Redis] = None,
+        width: int = 2**18,
+        depth: int = 4,
+        refresh_seconds: float = 60.0,
+        frozen: bool = False,
+    ):
+        self.redis_client = redis_client
+        # Tabla fija (p. ej. precalculada en el backfill): add_document no cuenta
+        self.frozen = frozen
+        self.width = width
+        self.depth = depth
+        self.refresh_seconds = refresh_seconds
+
+        self._counts = np.zeros(depth * width, dtype=np.uint32)
+        self.documents = 0
+        self._pending: Counter = Counter()
+        self._pending_docs = 0
+        self._lock = threading.Lock()
+        self._refreshed = 0.0
+        self._cells = lru_cache(maxsize=200000)(self._hash_cells)
+
+    def _hash_cells(self, term: str) -> Tuple[int, ...]:
+        """Posición del término en cada fila del sketch"""
+        digest = hashlib.blake2b(term.encode(), digest_size=4 * self.depth).digest()
+        return tuple(
+            row * self.width
+            + int.from_bytes(digest[4 * row : 4 * row + 4], "little") % self.width
+            for row in range(self.depth)
+        )
+
+    def add_document(self, terms: Iterable[str]):
+        """Contar un documento con sus términos (cada término una sola vez)"""
+        if self.frozen:
+            return
+        cells = [cell for term in set(terms) for cell in self._cells(term)]
+        with self._lock:
+            np.add.at(self._counts, cells, 1)
+            self._pending.update(cells)
+            self.documents += 1
+            self._pending_docs += 1
+
+    def state(self) -> Tuple[np.ndarray, int]:
+        """Contadores y número de documentos (para copiar la tabla a otro proceso)"""
+        return self._counts, self.documents
+
+    def load_state(self, counts: np.ndarray, documents: int):
+        self._counts = counts
+        self.documents = documents
+
+    def df(self, term: str) -> int:
+        return int(self._counts[list(self._cells(term))].min())
+
+    def idf(self, term: str) -> float:
+        """IDF suavizado; sin corpus todavía es 1 (ranking por frecuencia)"""
+        return math.log((1 + self.documents) / (1 + self.df(term))) + 1
+
+    def flush(self):
+        """Enviar los incrementos pendientes a Redis y recargar si toca"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+            pending_docs, self._pending_docs = self._pending_docs, 0
+
+        if self.redis_client is None:
+            return
+
+        try:
+            # Sketch y contador de documentos en una sola transacción: o se
+            # aplican ambos o ninguno
+            pipe = self.redis_client.pipeline()
+            if pending:
+                bitfield = pipe.bitfield(self.SKETCH_KEY, default_overflow="SAT")
+                for cell, amount in pending.items():
+                    bitfield.incrby("u32", f"#{cell}", amount)
+                bitfield.execute()
+            if pending_docs:
+                pipe.incrby(self.DOCS_KEY, pending_docs)
+            pipe.execute()
+        except redis.RedisError as e:
+            # Se conservan para el próximo flush
+            with self._lock:
+                self._pending.update(pending)
+                self._pending_docs += pending_docs
+            logger.warning(f"Tabla DF en Redis no disponible: {str(e)}")
+            return
+
+        try:
+            if time.time() - self._refreshed >= self.refresh_seconds:
+                self.refresh()
+        except redis.RedisError as e:
+            logger.warning(f"Tabla DF en Redis no disponible: {str(e)}")
+
+    def refresh(self):
+        """Reemplazar el sketch local por el combinado de Redis"""
+        raw, documents = self.redis_client.mget(self.SKETCH_KEY, self.DOCS_KEY)
+        counts = np.zeros(self.depth * self.width, dtype=np.uint32)
+        if raw:
+            shared = np.frombuffer(raw, dtype=">u4")[: counts.size]
+            counts[: shared.size] = shared
+        with self._lock:
+            # Los incrementos aún no enviados se conservan sobre el sketch nuevo
+            if self._pending:
+                cells, amounts = zip(*self._pending.items())
+                np.add.at(counts, list(cells), list(amounts))
+            self._counts = counts
+            self.documents = int(documents or 0) + self._pending_docs
+        self._refreshed = time.time()
+
+
+def extract_keywords(
+    tokens: Iterable[str],
+    top_n: int = 5,
+    document_frequency: Optional[DocumentFrequency] = None,
+) -> List[str]:
+    """Top-k términos por TF-IDF (por frecuencia si no hay tabla DF)"""
+    counts = Counter(candidate_terms(tokens))
+    if document_frequency is None:
+        return heapq.nlargest(top_n, counts, key=counts.__getitem__)
+
+    idf = document_frequency.idf
+    return heapq.nlargest(top_n, counts, key=lambda term: counts[term] * idf(term))
@@ -0,0 +1,714 @@
+"""
+Motor de léxico de sentimiento
+Tablas de palabras económicas compiladas una sola vez al importar el módulo
+"""
+
+import hashlib
+import json
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Set, Tuple
+
+# Lematización básica (verbos comunes en español)
+LEMMATIZATION_RULES = {
+    "crecio": "crece",
+    "creciendo": "crece",
+    "crecieron": "crece",
+    "cayo": "cae",
+    "cayeron": "cae",
+    "cayendo": "cae",
+    "subio": "sube",
+    "subieron": "sube",
+    "subiendo": "sube",
+    "bajo": "baja",
+    "bajaron": "baja",
+    "bajando": "baja",
+    "aumento": "aumenta",
+    "aumentaron": "aumenta",
+    "aumentando": "aumenta",
+    "disminuyo": "disminuye",
+    "disminuyeron": "disminuye",
+    "perdio": "pierde",
+    "perdieron": "pierde",
+    "perdiendo": "pierde",
+    "gano": "gana",
+    "ganaron": "gana",
+    "ganando": "gana",
+    "mejoro": "mejora",
+    "mejoraron": "mejora",
+    "mejorando": "mejora",
+    "empeoro": "empeora",
+    "empeoraron": "empeora",
+    "logro": "logra",
+    "lograron": "logra",
+    "logrando": "logra",
+    "recupero": "recupera",
+    "recuperaron": "recupera",
+    "afecto": "afecta",
+    "afectaron": "afecta",
+    "afectando": "afecta",
+    "impulso": "impulsa",
+    "impulsaron": "impulsa",
+}
+
+# Intensificadores
+INTENSIFIERS = {
+    "muy": 1.5,
+    "significativamente": 1.7,
+    "fuertemente": 1.6,
+    "drasticamente": 1.8,
+    "ligeramente": 0.7,
+    "moderadamente": 0.85,
+    "extremadamente": 1.9,
+    "altamente": 1.6,
+    "sumamente": 1.7,
+    "enormemente": 1.8,
+    "considerablemente": 1.6,
+    "notablemente": 1.5,
+    "marcadamente": 1.6,
+    "profundamente": 1.7,
+    "severamente": 1.7,
+    "apenas": 0.6,
+    "escasamente": 0.6,
+    "poco": 0.7,
+    "bastante": 1.3,
+}
+
+# Negaciones
+NEGATIONS = frozenset(
+    [
+        "no",
+        "nunca",
+        "jamas",
+        "sin",
+        "evita",
+        "evito",
+        "ni",
+        "tampoco",
+        "nada",
+        "nadie",
+        "ninguno",
+        "ninguna",
+        "imposible",
+        "niega",
+        "nego",
+        "rechaza",
+        "rechazo",
+        "impide",
+        "impidio",
+        "detiene",
+        "detuvo",
+        "frena",
+        "freno",
+    ]
+)
+
+# Keywords económicas ULTRA EXPANDIDAS para mayor sensibilidad
+POSITIVE_ECONOMIC = {
+    # Crecimiento y aumento (0.3-0.6)
+    "crece": 0.5,
+    "crecimiento": 0.5,
+    "aumenta": 0.45,
+    "aumento": 0.45,
+    "sube": 0.5,
+    "subida": 0.5,
+    "incremento": 0.45,
+    "incrementa": 0.45,
+    "repunte": 0.5,
+    "repunta": 0.5,
+    "avance": 0.45,
+    "avanza": 0.45,
+    "alza": 0.5,
+    "eleva": 0.45,
+    "elevacion": 0.45,
+    "impulsa": 0.5,
+    "impulso": 0.5,
+    "fortalece": 0.5,
+    "fortalecimiento": 0.5,
+    # Ganancias y éxito (0.4-0.7)
+    "gana": 0.5,
+    "ganancia": 0.55,
+    "ganancias": 0.55,
+    "exito": 0.6,
+    "exitoso": 0.6,
+    "logra": 0.5,
+    "logro": 0.5,
+    "logros": 0.5,
+    "record": 0.65,
+    "historico": 0.55,
+    "maximo": 0.6,
+    "maxima": 0.6,
+    "beneficio": 0.55,
+    "beneficios": 0.55,
+    "rentable": 0.55,
+    "rentabilidad": 0.55,
+    "utilidad": 0.5,
+    "utilidades": 0.5,
+    # Inversión y expansión (0.3-0.5)
+    "inversion": 0.4,
+    "invierte": 0.4,
+    "expansion": 0.5,
+    "expande": 0.5,
+    "desarrollo": 0.45,
+    "desarrolla": 0.45,
+    "moderniza": 0.45,
+    "modernizacion": 0.45,
+    "progreso": 0.5,
+    "progresa": 0.5,
+    # Recuperación y mejora (0.4-0.6)
+    "recupera": 0.55,
+    "recuperacion": 0.55,
+    "mejora": 0.5,
+    "mejoramiento": 0.5,
+    "mejorando": 0.5,
+    "mejoro": 0.5,
+    "optimo": 0.55,
+    "optima": 0.55,
+    "optimiza": 0.5,
+    "optimizacion": 0.5,
+    "optimismo": 0.5,
+    "optimista": 0.5,
+    # Estabilidad y confianza (0.35-0.5)
+    "estabilidad": 0.45,
+    "estable": 0.45,
+    "reactivacion": 0.55,
+    "superavit": 0.6,
+    "confianza": 0.5,
+    "confiable": 0.45,
+    "liquidez": 0.4,
+    "solido": 0.5,
+    "solidez": 0.5,
+    "solvencia": 0.5,
+    "competitividad": 0.45,
+    "competitivo": 0.45,
+    "sostenido": 0.5,
+    "sostenible": 0.45,
+    "sustentable": 0.45,
+    "sostenibilidad": 0.45,
+    # Innovación y oportunidad (0.35-0.5)
+    "innovacion": 0.45,
+    "innovador": 0.45,
+    "oportunidad": 0.4,
+    "oportunidades": 0.4,
+    "prospero": 0.55,
+    "prosperidad": 0.55,
+    "favorable": 0.45,
+    "favorables": 0.45,
+    "prometedor": 0.5,
+    "promisorio": 0.5,
+    "positivo": 0.5,
+    "positiva": 0.5,
+    # Acuerdos y negociación (0.25-0.45)
+    "acuerdo": 0.4,
+    "acuerdos": 0.4,
+    "negociacion": 0.35,
+    "alianza": 0.45,
+    "asociacion": 0.4,
+    "cooperacion": 0.4,
+    "pacto": 0.35,
+    "convenio": 0.35,
+    "contrato": 0.3,
+    # Mercados y comercio (0.25-0.45)
+    "millones": 0.3,
+    "miles": 0.25,
+    "dolares": 0.25,
+    "exportacion": 0.4,
+    "exporta": 0.4,
+    "exportaciones": 0.4,
+    "demanda": 0.3,
+    "compra": 0.25,
+    "compras": 0.25,
+    "vende": 0.25,
+    "comercio": 0.3,
+    "mercado": 0.25,
+    "mercados": 0.25,
+    # Productividad y eficiencia (0.35-0.5)
+    "productividad": 0.45,
+    "productivo": 0.45,
+    "eficiente": 0.45,
+    "eficiencia": 0.45,
+    "produccion": 0.35,
+    "produce": 0.35,
+    "genera": 0.35,
+    "generacion": 0.35,
+    "rendimiento": 0.4,
+    # Adicionales positivos (0.3-0.55)
+    "respalda": 0.4,
+    "respaldo": 0.4,
+    "apoya": 0.35,
+    "apoyo": 0.35,
+    "consolida": 0.5,
+    "consolidacion": 0.5,
+    "robusto": 0.5,
+    "robustez": 0.5,
+    "vigoroso": 0.5,
+    "vigoriza": 0.5,
+    "dinamico": 0.45,
+    "dinamismo": 0.45,
+    "auge": 0.55,
+    "bonanza": 0.55,
+    "florecimiento": 0.5,
+    # Palabras económicas comunes positivas (0.15-0.35)
+    "nuevo": 0.2,
+    "nueva": 0.2,
+    "nuevos": 0.2,
+    "nuevas": 0.2,
+    "proyecto": 0.25,
+    "proyectos": 0.25,
+    "plan": 0.2,
+    "planes": 0.2,
+    "estrategia": 0.25,
+    "meta": 0.25,
+    "objetivo": 0.2,
+    "objetivos": 0.2,
+    "aprueba": 0.3,
+    "aprobacion": 0.3,
+    "autoriza": 0.3,
+    "autorizacion": 0.3,
+    "firma": 0.25,
+    "firmo": 0.25,
+    "firmado": 0.25,
+    "cierra": 0.25,
+    "anuncia": 0.2,
+    "anuncio": 0.2,
+    "presenta": 0.2,
+    "presentacion": 0.2,
+    "lanza": 0.3,
+    "lanzamiento": 0.3,
+    "estrena": 0.3,
+    "inaugura": 0.35,
+    "inauguracion": 0.35,
+    "abre": 0.25,
+    "apertura": 0.25,
+    "inicia": 0.2,
+    "activa": 0.25,
+    "activacion": 0.25,
+    "renueva": 0.3,
+    "renovacion": 0.3,
+    "destina": 0.2,
+    "destinan": 0.2,
+    "asigna": 0.2,
+    "asignacion": 0.2,
+    "anticipa": 0.25,
+    "espera": 0.15,
+    "esperado": 0.15,
+    "previsto": 0.15,
+    "cumple": 0.3,
+    "cumplimiento": 0.3,
+    "alcanza": 0.35,
+    "obtiene": 0.3,
+    "duplica": 0.4,
+    "triplica": 0.45,
+    "multiplica": 0.35,
+    "incrementa": 0.3,
+    "suma": 0.2,
+    "adicional": 0.2,
+    "adicionales": 0.2,
+    "extra": 0.2,
+    "mayor": 0.25,
+    "mayores": 0.25,
+    "mas": 0.15,
+    "mejor": 0.3,
+    "mejores": 0.3,
+    "superior": 0.3,
+    "supera": 0.35,
+    "supero": 0.35,
+    "excelente": 0.4,
+    "destacado": 0.35,
+    "destaca": 0.3,
+    "sobresale": 0.35,
+    "lidera": 0.35,
+    "lider": 0.35,
+    "liderazgo": 0.35,
+    "primero": 0.3,
+    "primera": 0.3,
+}
+
+NEGATIVE_ECONOMIC = {
+    # Caídas y bajas (-0.4 a -0.6)
+    "cae": -0.55,
+    "caida": -0.55,
+    "cayo": -0.55,
+    "cayeron": -0.55,
+    "baja": -0.5,
+    "bajo": -0.5,
+    "bajaron": -0.5,
+    "descenso": -0.5,
+    "desciende": -0.5,
+    "descendio": -0.5,
+    "desploma": -0.65,
+    "desplome": -0.65,
+    "desplomo": -0.65,
+    "derrumba": -0.65,
+    "derrumbe": -0.65,
+    "colapsa": -0.7,
+    "colapso": -0.7,
+    # Pérdidas (-0.4 a -0.7)
+    "pierde": -0.55,
+    "perdida": -0.55,
+    "perdidas": -0.55,
+    "perdio": -0.55,
+    "perdieron": -0.55,
+    "deficit": -0.6,
+    "deficitario": -0.6,
+    "quebranto": -0.65,
+    "merma": -0.5,
+    # Crisis y recesión (-0.6 a -0.8)
+    "crisis": -0.7,
+    "recesion": -0.7,
+    "recesivo": -0.7,
+    "depresion": -0.75,
+    "quiebra": -0.8,
+    "bancarrota": -0.8,
+    "insolvencia": -0.75,
+    "impago": -0.7,
+    "default": -0.75,
+    # Problemas y riesgos (-0.3 a -0.6)
+    "riesgo": -0.45,
+    "riesgos": -0.45,
+    "riesgoso": -0.45,
+    "problema": -0.5,
+    "problemas": -0.5,
+    "dificultad": -0.5,
+    "dificultades": -0.5,
+    "complicacion": -0.5,
+    "amenaza": -0.55,
+    "amenazas": -0.55,
+    "peligro": -0.55,
+    "peligros": -0.55,
+    # Afectaciones (-0.35 a -0.6)
+    "afecta": -0.5,
+    "afectacion": -0.5,
+    "afectado": -0.5,
+    "impacta": -0.45,
+    "impacto": -0.4,
+    "golpea": -0.55,
+    "golpe": -0.55,
+    "dana": -0.55,
+    "dano": -0.55,
+    "danos": -0.55,
+    "perjudica": -0.55,
+    "perjuicio": -0.55,
+    "deteriora": -0.55,
+    "deterioro": -0.55,
+    "debilita": -0.55,
+    "debilitamiento": -0.55,
+    # Inflación y devaluación (-0.45 a -0.7)
+    "inflacion": -0.6,
+    "inflacionario": -0.6,
+    "devaluacion": -0.6,
+    "devalua": -0.6,
+    "devaluo": -0.6,
+    "deprecia": -0.55,
+    "depreciacion": -0.55,
+    "deprecio": -0.55,
+    "desvaloriza": -0.55,
+    # Desaceleración y estancamiento (-0.4 a -0.6)
+    "desaceleracion": -0.55,
+    "desacelera": -0.55,
+    "ralentiza": -0.5,
+    "ralentizacion": -0.5,
+    "estancamiento": -0.6,
+    "estanca": -0.6,
+    "estancado": -0.6,
+    "paraliza": -0.65,
+    "paralizacion": -0.65,
+    "frena": -0.5,
+    "freno": -0.5,
+    "frenada": -0.5,
+    # Inestabilidad y desconfianza (-0.45 a -0.65)
+    "inestabilidad": -0.6,
+    "inestable": -0.6,
+    "volatilidad": -0.5,
+    "volatil": -0.5,
+    "incertidumbre": -0.55,
+    "incierto": -0.55,
+    "desconfianza": -0.55,
+    "desconfian": -0.55,
+    "desconfia": -0.55,
+    "temor": -0.5,
+    "miedo": -0.5,
+    "panico": -0.65,
+    "nerviosismo": -0.5,
+    # Desempleo y escasez (-0.5 a -0.7)
+    "desempleo": -0.65,
+    "desempleado": -0.65,
+    "despido": -0.65,
+    "despidos": -0.65,
+    "escasez": -0.6,
+    "escaso": -0.55,
+    "carencia": -0.55,
+    "falta": -0.45,
+    "faltan": -0.45,
+    # Corrupción y delitos (-0.6 a -0.8)
+    "corrupcion": -0.7,
+    "corrupto": -0.7,
+    "fraude": -0.75,
+    "fraudulento": -0.75,
+    "soborno": -0.7,
+    "lavado": -0.7,
+    "ilegal": -0.65,
+    "ilicito": -0.65,
+    "delito": -0.65,
+    # Conflictos (-0.5 a -0.8)
+    "guerra": -0.75,
+    "conflicto": -0.6,
+    "violencia": -0.7,
+    "violento": -0.7,
+    "huelga": -0.6,
+    "paro": -0.55,
+    "protesta": -0.5,
+    "manifestacion": -0.45,
+    "disturbios": -0.65,
+    # Negación y rechazo (-0.4 a -0.6)
+    "niega": -0.45,
+    "negacion": -0.45,
+    "rechaza": -0.5,
+    "rechazo": -0.5,
+    "suspende": -0.55,
+    "suspension": -0.55,
+    "cancela": -0.55,
+    "cancelacion": -0.55,
+    "anula": -0.5,
+    # Reducción y recorte (-0.35 a -0.55)
+    "reduce": -0.5,
+    "reduccion": -0.5,
+    "disminuye": -0.5,
+    "disminucion": -0.5,
+    "recorte": -0.55,
+    "recorta": -0.55,
+    "recortaron": -0.55,
+    "contraccion": -0.55,
+    "contrae": -0.55,
+    # Emergencia y catástrofe (-0.5 a -0.75)
+    "emergencia": -0.6,
+    "emergente": -0.55,
+    "catastrofe": -0.75,
+    "catastrofico": -0.75,
+    "desastre": -0.75,
+    "desastroso": -0.75,
+    "tragedia": -0.7,
+    "tragico": -0.7,
+    "grave": -0.55,
+    "critico": -0.6,
+    # Adicionales negativos (-0.4 a -0.65)
+    "fuga": -0.65,
+    "sancion": -0.6,
+    "sanciones": -0.6,
+    "penaliza": -0.55,
+    "penalizacion": -0.55,
+    "multa": -0.5,
+    "perdurable": -0.45,
+    "adverso": -0.55,
+    "adversidad": -0.55,
+    "desfavorable": -0.55,
+    "negativo": -0.5,
+    "negativa": -0.5,
+    "pesimismo": -0.55,
+    "pesimista": -0.55,
+    "sombrio": -0.55,
+    # Palabras económicas comunes negativas (-0.15 a -0.35)
+    "no": -0.15,
+    "sin": -0.2,
+    "menos": -0.25,
+    "menor": -0.25,
+    "menores": -0.25,
+    "cierra": -0.3,
+    "cierre": -0.3,
+    "cerro": -0.3,
+    "cerraron": -0.3,
+    "clausura": -0.35,
+    "clausuro": -0.35,
+    "termina": -0.25,
+    "termino": -0.25,
+    "detiene": -0.3,
+    "detenido": -0.3,
+    "detencion": -0.3,
+    "para": -0.25,
+    "parado": -0.3,
+    "paraliza": -0.35,
+    "paralizado": -0.35,
+    "limita": -0.3,
+    "limitacion": -0.3,
+    "limitado": -0.3,
+    "restringe": -0.35,
+    "restriccion": -0.35,
+    "restringido": -0.35,
+    "prohibe": -0.4,
+    "prohibicion": -0.4,
+    "veto": -0.4,
+    "bloquea": -0.4,
+    "bloqueo": -0.4,
+    "retrasa": -0.35,
+    "retraso": -0.35,
+    "demora": -0.3,
+    "demorado": -0.3,
+    "aplaza": -0.3,
+    "aplazamiento": -0.3,
+    "pospone": -0.3,
+    "posterga": -0.3,
+    "elimina": -0.35,
+    "eliminacion": -0.35,
+    "elimino": -0.35,
+    "suprime": -0.35,
+    "supresion": -0.35,
+    "suprimio": -0.35,
+    "retira": -0.3,
+    "retiro": -0.3,
+    "retiraron": -0.3,
+    "abandona": -0.4,
+    "abandono": -0.4,
+    "renuncia": -0.35,
+    "renuncio": -0.35,
+    "falla": -0.35,
+    "fallo": -0.35,
+    "fallido": -0.35,
+    "fracasa": -0.4,
+    "fracaso": -0.4,
+    "fracasado": -0.4,
+    "incumple": -0.4,
+    "incumplimiento": -0.4,
+    "incumplido": -0.4,
+    "evita": -0.25,
+    "evitado": -0.25,
+    "previene": -0.2,
+    "prevencion": -0.2,
+    "advierte": -0.3,
+    "advertencia": -0.3,
+    "alerta": -0.35,
+    "preocupa": -0.35,
+    "preocupacion": -0.35,
+    "preocupante": -0.35,
+    "inquieta": -0.3,
+    "inquietud": -0.3,
+    "inquietante": -0.3,
+    "debil": -0.35,
+    "debilidad": -0.35,
+    "fragil": -0.4,
+    "fragilidad": -0.4,
+    "vulnerable": -0.35,
+    "vulnerabilidad": -0.35,
+    "peor": -0.35,
+    "peores": -0.35,
+    "inferior": -0.3,
+    "inferiores": -0.3,
+    "bajo": -0.25,
+    "minimo": -0.3,
+}
+
+
+def _build_lexicon() -> Dict[str, Tuple[float, float, bool]]:
+    """
+    Fusiona todas las tablas en un único lookup palabra → entrada.
+    Entrada: (polaridad, factor de intensificador, es_negación).
+    Las palabras positivas tienen prioridad sobre las negativas, igual que
+    en el análisis original.
+    """
+    words = (
+        set(POSITIVE_ECONOMIC)
+        | set(NEGATIVE_ECONOMIC)
+        | set(INTENSIFIERS)
+        | NEGATIONS
+    )
+    lexicon = {}
+    for word in words:
+        if word in POSITIVE_ECONOMIC:
+            polarity = POSITIVE_ECONOMIC[word]
+        else:
+            polarity = NEGATIVE_ECONOMIC.get(word, 0.0)
+        lexicon[word] = (
+            polarity,
+            INTENSIFIERS.get(word, 1.0),
+            word in NEGATIONS,
+        )
+    return lexicon
+
+
+# Lookup compilado (se construye una sola vez al importar)
+LEXICON = _build_lexicon()
+
+
+def _build_accent_table() -> Dict[int, str]:
+    """Tabla para str.translate que elimina tildes (equivale a NFD sin Mn)"""
+    table = {}
+    # Latin-1 Supplement, Latin Extended-A y B
+    for code in range(0x00C0, 0x0250):
+        char = chr(code)
+        stripped = "".join(
+            c for c in unicodedata.normalize("NFD", char) if unicodedata.category(c) != "Mn"
+        )
+        if stripped != char:
+            table[code] = stripped
+    # Diacríticos combinantes sueltos (texto ya descompuesto)
+    for code in range(0x0300, 0x0370):
+        table[code] = None
+    return table
+
+
+def lexicon_version(lexicon: Dict, lemmatization_rules: Dict[str, str]) -> str:
+    """Huella del léxico y las reglas de lematización (se guarda por artículo)"""
+    payload = json.dumps(
+        [sorted(lexicon.items()), sorted(lemmatization_rules.items())]
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+
+# Versión del léxico compilado
+LEXICON_VERSION = lexicon_version(LEXICON, LEMMATIZATION_RULES)
+
+ACCENT_TABLE = _build_accent_table()
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Tokenización única por artículo: minúsculas, sin tildes y sin puntuación.
+    La misma lista de tokens alimenta sentimiento, categorías y keywords.
+    """
+    return _TOKEN_RE.findall(text.lower().translate(ACCENT_TABLE))
+
+
+def lemmatize(tokens: Iterable[str]) -> List[str]:
+    """Lematización básica (verbos comunes en español)"""
+    lemmas = LEMMATIZATION_RULES
+    return [lemmas.get(t, t) for t in tokens]
+
+
+def normalize_text(text: str) -> str:
+    """Normaliza el texto: minúsculas, sin tildes, lematización básica"""
+    return " ".join(lemmatize(tokenize(text)))
+
+
+def score_tokens(tokens: Iterable[str]) -> float:
+    """
+    Kernel de puntuación por keywords con intensificadores y negaciones.
+    Un intensificador afecta a la palabra siguiente; una negación invierte
+    el signo de las dos palabras siguientes.
+    """
+    lookup = LEXICON.get
+    total = 0.0
+    prev = prev2 = None
+
+    for token in tokens:
+        entry = lookup(token)
+
+        if entry is not None and entry[0]:
+            score = entry[0]
+            if prev is not None:
+                score *= prev[1]
+            if (prev is not None and prev[2]) or (prev2 is not None and prev2[2]):
+                score = -score
+            total += score
+
+        prev2, prev = prev, entry
+
+    return total
+
+
+def index_terms(tokens: Iterable[str], lemmas: Iterable[str]) -> Set[str]:
+    """
+    Términos del índice invertido de un artículo: lemas presentes en el léxico
+    y tokens originales con regla de lematización. Si cambia cualquiera de
+    ellos en el léxico, el artículo debe volver a puntuarse.
+    """
+    return (set(lemmas) & LEXICON.keys()) | (set(tokens) & LEMMATIZATION_RULES.keys())
@@ -6,18 +6,37 @@ Procesa y analiza el contenido de las noticias
 import os
 import json
 import logging
+import hashlib
+import math
+import socket
 import time
-import unicodedata
 import multiprocessing
+import threading
 import redis
 import psycopg2
-import nltk
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict, Tuple
+from typing import List, Dict, Optional, Tuple
 from psycopg2.extras import RealDictCursor, execute_values
-from textblob import TextBlob
-from nltk.sentiment import SentimentIntensityAnalyzer
+from batching import AdaptiveBatcher
+from cache import ScoringCache
+from keywords import DocumentFrequency, candidate_terms, extract_keywords
+from lexicon import (
+    LEMMATIZATION_RULES,
+    LEXICON,
+    LEXICON_VERSION,
+    index_terms,
+    lemmatize,
+    normalize_text,
+    score_tokens,
+    tokenize,
+)
+from matcher import KeywordMatcher
+from metrics import Metrics, start_metrics_server
+from scoring import SCORING_TIERS, combine_scores, textblob_is_decisive
+from rescore import register_version
+from snapshot import load_snapshot, vader_from_snapshot
+from writeback import copy_updates
 
 # Configurar logging
 logging.basicConfig(
@@ -25,6 +44,52 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Incrementar al cambiar el algoritmo de puntuación (invalida la caché)
+SCORING_VERSION = "5"
+
+
+def get_cpu_quota() -> int:
+    """Número de CPUs disponibles según la cuota del contenedor (cgroups)"""
+    # cgroup v2: "<quota> <period>" o "max <period>"
+    try:
+        with open("/sys/fs/cgroup/cpu.max") as f:
+            quota, period = f.read().split()
+        if quota != "max":
+            return max(1, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+
+    # cgroup v1
+    try:
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_quota_us") as f:
+            quota = int(f.read())
+        with open("/sys/fs/cgroup/cpu/cpu.cfs_period_us") as f:
+            period = int(f.read())
+        if quota > 0:
+            return max(1, math.ceil(quota / period))
+    except (OSError, ValueError):
+        pass
+
+    return len(os.sched_getaffinity(0))
+
+
+# Procesador propio de cada worker del pool de procesos
+_worker_processor = None
+
+
+def _init_worker():
+    """Inicializa VADER, TextBlob y el léxico una sola vez por worker"""
+    global _worker_processor
+    _worker_processor = NewsProcessor()
+    _worker_processor.load_scorers()
+
+
+def _process_chunk(articles: List[Dict]) -> List[Dict]:
+    """Procesa un bloque de artículos dentro de un worker"""
+    results = [_worker_processor.process_article(article) for article in articles]
+    _worker_processor.publish_batch_stats()
+    return results
+
 
 class NewsProcessor:
     """Procesador de noticias con análisis de sentimiento"""
@@ -45,13 +110,25 @@ class NewsProcessor:
             "password": os.getenv("POSTGRES_PASSWORD", "newspass123"),
         }
 
-        # Inicializar analizador de sentimientos
-        try:
-            self.sia = SentimentIntensityAnalyzer()
-            logger.info("Analizador de sentimientos VADER inicializado")
-        except Exception as e:
-            logger.error(f"Error inicializando VADER: {str(e)}")
-            self.sia = None
+        # Nivel de puntuación: keyword (solo léxico), vader (léxico + VADER) o
+        # full (léxico + VADER + TextBlob). Con early exit, el nivel full omite
+        # TextBlob cuando keywords + VADER ya fijan la etiqueta
+        self.scoring_tier = os.getenv("SCORING_TIER", "full").lower()
+        if self.scoring_tier not in SCORING_TIERS:
+            logger.warning(f"SCORING_TIER desconocido '{self.scoring_tier}', usando full")
+            self.scoring_tier = "full"
+        self.early_exit = os.getenv("SCORING_EARLY_EXIT", "false").lower() == "true"
+
+        # Analizadores de sentimiento (nltk/TextBlob). En modo de arranque rápido
+        # se importan en segundo plano mientras el pod conecta y reclama trabajo
+        self._sia = None
+        self._textblob = None
+        self._scorers_loaded = False
+        self._scorers_lock = threading.Lock()
+        if os.getenv("PROCESSOR_FAST_START", "true").lower() == "true":
+            threading.Thread(target=self.load_scorers, daemon=True).start()
+        else:
+            self.load_scorers()
 
         # Categorías económicas
         self.categories_keywords = {
@@ -64,819 +141,470 @@ class NewsProcessor:
             "comercio": ["exportación", "importación", "comercio", "TLC"],
         }
 
-        logger.info("News Processor inicializado")
+        # Autómata de keywords de categorías (se reconstruye solo si cambia la tabla)
+        self.category_matcher = KeywordMatcher(self.categories_keywords)
+
+        # Caché de puntuación por contenido (LRU local + Redis compartido)
+        self.scoring_cache = None
+        if os.getenv("SCORING_CACHE_ENABLED", "true").lower() == "true":
+            self.scoring_cache = ScoringCache(
+                self.redis_client,
+                namespace=self.scoring_fingerprint(),
+                local_size=int(os.getenv("SCORING_CACHE_LOCAL_SIZE", 10000)),
+                ttl=int(os.getenv("SCORING_CACHE_TTL", 604800)),
+                max_entries=int(os.getenv("SCORING_CACHE_MAX_ENTRIES", 200000)),
+            )
 
-    def normalize_text(self, text: str) -> str:
-        """Normaliza el texto: minúsculas, sin tildes, lematización básica"""
-        # Minúsculas
-        text = text.lower()
-
-        # Eliminar tildes
-        text = "".join(
-            c
-            for c in unicodedata.normalize("NFD", text)
-            if unicodedata.category(c) != "Mn"
+        # Frecuencia documental del corpus para las keywords (count-min sketch
+        # compartido en Redis; cliente binario porque el sketch son bytes)
+        self.document_frequency = DocumentFrequency(
+            redis.Redis(
+                host=os.getenv("REDIS_HOST", "localhost"),
+                port=int(os.getenv("REDIS_PORT", 6379)),
+            ),
+            width=int(os.getenv("KEYWORD_DF_WIDTH", 2**18)),
+            depth=int(os.getenv("KEYWORD_DF_DEPTH", 4)),
+            refresh_seconds=float(os.getenv("KEYWORD_DF_REFRESH", 60)),
         )
 
-        # Lematización básica (verbos comunes en español)
-        lemmatization_rules = {
-            "crecio": "crece",
-            "creciendo": "crece",
-            "crecieron": "crece",
-            "cayo": "cae",
-            "cayeron": "cae",
-            "cayendo": "cae",
-            "subio": "sube",
-            "subieron": "sube",
-            "subiendo": "sube",
-            "bajo": "baja",
-            "bajaron": "baja",
-            "bajando": "baja",
-            "aumento": "aumenta",
-            "aumentaron": "aumenta",
-            "aumentando": "aumenta",
-            "disminuyo": "disminuye",
-            "disminuyeron": "disminuye",
-            "perdio": "pierde",
-            "perdieron": "pierde",
-            "perdiendo": "pierde",
-            "gano": "gana",
-            "ganaron": "gana",
-            "ganando": "gana",
-            "mejoro": "mejora",
-            "mejoraron": "mejora",
-            "mejorando": "mejora",
-            "empeoro": "empeora",
-            "empeoraron": "empeora",
-            "logro": "logra",
-            "lograron": "logra",
-            "logrando": "logra",
-            "recupero": "recupera",
-            "recuperaron": "recupera",
-            "afecto": "afecta",
-            "afectaron": "afecta",
-            "afectando": "afecta",
-            "impulso": "impulsa",
-            "impulsaron": "impulsa",
+        # Ejecución paralela: "thread" o "process" (pool de procesos, evita el GIL)
+        self.execution_mode = os.getenv("PROCESSOR_EXECUTION_MODE", "thread")
+        self.num_workers = int(os.getenv("PROCESSOR_WORKERS", 0)) or get_cpu_quota()
+        self.chunk_size = int(os.getenv("PROCESSOR_CHUNK_SIZE", 25))
+        self._process_pool = None
+
+        # Reclamo de trabajo con lease: evita que réplicas procesen las mismas filas
+        self.worker_id = os.getenv("POD_NAME") or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_seconds = int(os.getenv("PROCESSOR_LEASE_SECONDS", 300))
+
+        # Redis Streams: notificaciones collector → processor → analyzer
+        self.jobs_stream = "news_processing"
+        self.jobs_group = "processors"
+        self.analysis_stream = "analysis_trigger"
+        self.block_ms = int(os.getenv("PROCESSOR_BLOCK_MS", 30000))
+
+        # Escritura masiva: se acumulan resultados y se vuelcan con COPY
+        self.flush_size = int(os.getenv("PROCESSOR_FLUSH_SIZE", 500))
+        self.flush_interval = float(os.getenv("PROCESSOR_FLUSH_INTERVAL", 5))
+        self._pending_updates = []
+        self._last_flush = time.time()
+
+        # Tamaño de lote adaptativo según backlog y latencia medida
+        self.batcher = AdaptiveBatcher(
+            initial_size=int(os.getenv("PROCESSOR_BATCH_SIZE", 50)),
+            min_size=int(os.getenv("PROCESSOR_MIN_BATCH_SIZE", 10)),
+            max_size=int(os.getenv("PROCESSOR_MAX_BATCH_SIZE", 1000)),
+            target_seconds=float(os.getenv("PROCESSOR_TARGET_BATCH_SECONDS", 5)),
+        )
+        self.backlog_refresh = float(os.getenv("PROCESSOR_BACKLOG_REFRESH", 30))
+        self.backlog = None
+        self.lane_backlog: Dict[str, int] = {}
+        self._backlog_checked = 0.0
+
+        # Carriles de prioridad: live (recién recolectadas) y backfill (históricos
+        # y re-puntuaciones). Peso = cuota garantizada de cada lote
+        self.lane_weights = {
+            "live": float(os.getenv("PROCESSOR_LIVE_WEIGHT", 3)),
+            "backfill": float(os.getenv("PROCESSOR_BACKFILL_WEIGHT", 1)),
         }
+        # Con tráfico live los lotes no se alargan para drenar backfill
+        self.live_active = False
+        # Ids recién insertados que anuncian los collectors, por carril: se
+        # reclaman por clave primaria antes de recorrer los pendientes
+        self.targeted_ids: Dict[str, List[int]] = {lane: [] for lane in self.lane_weights}
+        self.max_targeted_ids = int(os.getenv("PROCESSOR_MAX_TARGETED_IDS", 10000))
+
+        # Reintentos de artículos que fallan: backoff exponencial y dead letter
+        self.max_attempts = int(os.getenv("PROCESSOR_MAX_ATTEMPTS", 5))
+        self.retry_base_seconds = float(os.getenv("PROCESSOR_RETRY_BASE_SECONDS", 30))
+        self.retry_max_seconds = float(os.getenv("PROCESSOR_RETRY_MAX_SECONDS", 3600))
+
+        # Métricas para Prometheus (expuestas por run() en PROCESSOR_METRICS_PORT)
+        self.metrics = Metrics()
+        self.metrics.describe("processor_batch_size", "Tamaño del próximo lote")
+        self.metrics.describe(
+            "processor_backlog", "Artículos pendientes de procesar por carril"
+        )
+        self.metrics.describe(
+            "processor_articles_per_second", "Throughput medido por lote (EWMA)"
+        )
+        self.metrics.describe(
+            "processor_article_latency_seconds", "Segundos de puntuación por artículo"
+        )
+        self.metrics.describe(
+            "processor_articles_processed_total", "Artículos procesados", "counter"
+        )
+        self.metrics.describe(
+            "processor_scoring_failures_total", "Artículos cuya puntuación falló", "counter"
+        )
+        self.metrics.describe(
+            "processor_dead_letters_total", "Artículos enviados a dead letters", "counter"
+        )
+        self.metrics.describe(
+            "processor_lane_claimed_total", "Artículos reclamados por carril", "counter"
+        )
+        self.metrics.describe(
+            "processor_stale_results_total",
+            "Resultados descartados porque el lease ya no era de este worker",
+            "counter",
+        )
+        self.metrics.describe(
+            "processor_lane_latency_seconds",
+            "Segundos desde la ingesta hasta la puntuación (media del lote, por carril)",
+        )
 
-        words = text.split()
-        normalized_words = [lemmatization_rules.get(w, w) for w in words]
-        return " ".join(normalized_words)
+        logger.info("News Processor inicializado")
+
+    def load_scorers(self):
+        """Importar y construir VADER y TextBlob según el nivel (una sola vez)"""
+        if self._scorers_loaded:
+            return
+
+        with self._scorers_lock:
+            if self._scorers_loaded:
+                return
+
+            start = time.time()
+            if self.scoring_tier != "keyword":
+                try:
+                    snapshot = load_snapshot()
+                    if snapshot is not None:
+                        self._sia = vader_from_snapshot(snapshot)
+                    else:
+                        from nltk.sentiment import SentimentIntensityAnalyzer
+
+                        self._sia = SentimentIntensityAnalyzer()
+                    logger.info("Analizador de sentimientos VADER inicializado")
+                except Exception as e:
+                    logger.error(f"Error inicializando VADER: {str(e)}")
+                    self._sia = None
+
+            if self.scoring_tier == "full":
+                from textblob import TextBlob
+
+                # TextBlob carga su léxico de forma perezosa en el primer análisis
+                TextBlob("inicializar").sentiment
+                self._textblob = TextBlob
+
+            self._scorers_loaded = True
+            logger.info(
+                f"Analizadores ({self.scoring_tier}) cargados en "
+                f"{time.time() - start:.2f}s"
+            )
+
+    @property
+    def sia(self):
+        """Analizador VADER (None si no está disponible)"""
+        self.load_scorers()
+        return self._sia
+
+    def scoring_fingerprint(self) -> str:
+        """Huella del léxico y las categorías: separa entradas de caché entre versiones"""
+        payload = json.dumps(
+            [
+                SCORING_VERSION,
+                self.scoring_tier,
+                self.early_exit,
+                sorted(LEXICON.items()),
+                LEMMATIZATION_RULES,
+                self.categories_keywords,
+            ],
+            sort_keys=True,
+        )
+        return hashlib.blake2b(payload.encode(), digest_size=8).hexdigest()
+
+    def publish_batch_stats(self):
+        """Publicar en Redis los contadores de la caché y los incrementos de DF"""
+        if self.scoring_cache is not None:
+            self.scoring_cache.publish_stats()
+        self.document_frequency.flush()
+
+    def normalize_text(self, text: str) -> str:
+        """Normaliza el texto: minúsculas, sin tildes, lematización básica"""
+        return normalize_text(text)
 
     def get_db_connection(self):
         """Obtener conexión a PostgreSQL"""
         return psycopg2.connect(**self.db_config)
 
-    def analyze_sentiment(self, text: str) -> Tuple[float, str]:
+    def analyze_sentiment(
+        self, text: str, tokens: Optional[List[str]] = None
+    ) -> Tuple[float, str]:
         """
         Análisis de sentimiento AVANZADO con normalización, intensificadores y negaciones
         Returns: (score: -1 a 1, label: positive/negative/neutral)
         """
-        if not text:
-            return 0.0, "neutral"
-
-        # Normalizar texto
-        text_normalized = self.normalize_text(text)
-
-        # Intensificadores
-        intensifiers = {
-            "muy": 1.5,
-            "significativamente": 1.7,
-            "fuertemente": 1.6,
-            "drasticamente": 1.8,
-            "ligeramente": 0.7,
-            "moderadamente": 0.85,
-            "extremadamente": 1.9,
-            "altamente": 1.6,
-            "sumamente": 1.7,
-            "enormemente": 1.8,
-            "considerablemente": 1.6,
-            "notablemente": 1.5,
-            "marcadamente": 1.6,
-            "profundamente": 1.7,
-            "severamente": 1.7,
-            "apenas": 0.6,
-            "escasamente": 0.6,
-            "poco": 0.7,
-            "bastante": 1.3,
-        }
+        score, label, _ = self.analyze_sentiment_components(text, tokens)
+        return score, label
 
-        # Negaciones
-        negations = [
-            "no",
-            "nunca",
-            "jamas",
-            "sin",
-            "evita",
-            "evito",
-            "ni",
-            "tampoco",
-            "nada",
-            "nadie",
-            "ninguno",
-            "ninguna",
-            "imposible",
-            "niega",
-            "nego",
-            "rechaza",
-            "rechazo",
-            "impide",
-            "impidio",
-            "detiene",
-            "detuvo",
-            "frena",
-            "freno",
-        ]
-
-        # Keywords económicas ULTRA EXPANDIDAS para mayor sensibilidad
-        positive_economic = {
-            # Crecimiento y aumento (0.3-0.6)
-            "crece": 0.5,
-            "crecimiento": 0.5,
-            "aumenta": 0.45,
-            "aumento": 0.45,
-            "sube": 0.5,
-            "subida": 0.5,
-            "incremento": 0.45,
-            "incrementa": 0.45,
-            "repunte": 0.5,
-            "repunta": 0.5,
-            "avance": 0.45,
-            "avanza": 0.45,
-            "alza": 0.5,
-            "eleva": 0.45,
-            "elevacion": 0.45,
-            "impulsa": 0.5,
-            "impulso": 0.5,
-            "fortalece": 0.5,
-            "fortalecimiento": 0.5,
-            # Ganancias y éxito (0.4-0.7)
-            "gana": 0.5,
-            "ganancia": 0.55,
-            "ganancias": 0.55,
-            "exito": 0.6,
-            "exitoso": 0.6,
-            "logra": 0.5,
-            "logro": 0.5,
-            "logros": 0.5,
-            "record": 0.65,
-            "historico": 0.55,
-            "maximo": 0.6,
-            "maxima": 0.6,
-            "beneficio": 0.55,
-            "beneficios": 0.55,
-            "rentable": 0.55,
-            "rentabilidad": 0.55,
-            "utilidad": 0.5,
-            "utilidades": 0.5,
-            # Inversión y expansión (0.3-0.5)
-            "inversion": 0.4,
-            "invierte": 0.4,
-            "expansion": 0.5,
-            "expande": 0.5,
-            "desarrollo": 0.45,
-            "desarrolla": 0.45,
-            "moderniza": 0.45,
-            "modernizacion": 0.45,
-            "progreso": 0.5,
-            "progresa": 0.5,
-            # Recuperación y mejora (0.4-0.6)
-            "recupera": 0.55,
-            "recuperacion": 0.55,
-            "mejora": 0.5,
-            "mejoramiento": 0.5,
-            "mejorando": 0.5,
-            "mejoro": 0.5,
-            "optimo": 0.55,
-            "optima": 0.55,
-            "optimiza": 0.5,
-            "optimizacion": 0.5,
-            "optimismo": 0.5,
-            "optimista": 0.5,
-            # Estabilidad y confianza (0.35-0.5)
-            "estabilidad": 0.45,
-            "estable": 0.45,
-            "reactivacion": 0.55,
-            "superavit": 0.6,
-            "confianza": 0.5,
-            "confiable": 0.45,
-            "liquidez": 0.4,
-            "solido": 0.5,
-            "solidez": 0.5,
-            "solvencia": 0.5,
-            "competitividad": 0.45,
-            "competitivo": 0.45,
-            "sostenido": 0.5,
-            "sostenible": 0.45,
-            "sustentable": 0.45,
-            "sostenibilidad": 0.45,
-            # Innovación y oportunidad (0.35-0.5)
-            "innovacion": 0.45,
-            "innovador": 0.45,
-            "oportunidad": 0.4,
-            "oportunidades": 0.4,
-            "prospero": 0.55,
-            "prosperidad": 0.55,
-            "favorable": 0.45,
-            "favorables": 0.45,
-            "prometedor": 0.5,
-            "promisorio": 0.5,
-            "positivo": 0.5,
-            "positiva": 0.5,
-            # Acuerdos y negociación (0.25-0.45)
-            "acuerdo": 0.4,
-            "acuerdos": 0.4,
-            "negociacion": 0.35,
-            "alianza": 0.45,
-            "asociacion": 0.4,
-            "cooperacion": 0.4,
-            "pacto": 0.35,
-            "convenio": 0.35,
-            "contrato": 0.3,
-            # Mercados y comercio (0.25-0.45)
-            "millones": 0.3,
-            "miles": 0.25,
-            "dolares": 0.25,
-            "exportacion": 0.4,
-            "exporta": 0.4,
-            "exportaciones": 0.4,
-            "demanda": 0.3,
-            "compra": 0.25,
-            "compras": 0.25,
-            "vende": 0.25,
-            "comercio": 0.3,
-            "mercado": 0.25,
-            "mercados": 0.25,
-            # Productividad y eficiencia (0.35-0.5)
-            "productividad": 0.45,
-            "productivo": 0.45,
-            "eficiente": 0.45,
-            "eficiencia": 0.45,
-            "produccion": 0.35,
-            "produce": 0.35,
-            "genera": 0.35,
-            "generacion": 0.35,
-            "rendimiento": 0.4,
-            # Adicionales positivos (0.3-0.55)
-            "respalda": 0.4,
-            "respaldo": 0.4,
-            "apoya": 0.35,
-            "apoyo": 0.35,
-            "consolida": 0.5,
-            "consolidacion": 0.5,
-            "robusto": 0.5,
-            "robustez": 0.5,
-            "vigoroso": 0.5,
-            "vigoriza": 0.5,
-            "dinamico": 0.45,
-            "dinamismo": 0.45,
-            "auge": 0.55,
-            "bonanza": 0.55,
-            "florecimiento": 0.5,
-            # Palabras económicas comunes positivas (0.15-0.35)
-            "nuevo": 0.2,
-            "nueva": 0.2,
-            "nuevos": 0.2,
-            "nuevas": 0.2,
-            "proyecto": 0.25,
-            "proyectos": 0.25,
-            "plan": 0.2,
-            "planes": 0.2,
-            "estrategia": 0.25,
-            "meta": 0.25,
-            "objetivo": 0.2,
-            "objetivos": 0.2,
-            "aprueba": 0.3,
-            "aprobacion": 0.3,
-            "autoriza": 0.3,
-            "autorizacion": 0.3,
-            "firma": 0.25,
-            "firmo": 0.25,
-            "firmado": 0.25,
-            "cierra": 0.25,
-            "anuncia": 0.2,
-            "anuncio": 0.2,
-            "presenta": 0.2,
-            "presentacion": 0.2,
-            "lanza": 0.3,
-            "lanzamiento": 0.3,
-            "estrena": 0.3,
-            "inaugura": 0.35,
-            "inauguracion": 0.35,
-            "abre": 0.25,
-            "apertura": 0.25,
-            "inicia": 0.2,
-            "activa": 0.25,
-            "activacion": 0.25,
-            "renueva": 0.3,
-            "renovacion": 0.3,
-            "destina": 0.2,
-            "destinan": 0.2,
-            "asigna": 0.2,
-            "asignacion": 0.2,
-            "anticipa": 0.25,
-            "espera": 0.15,
-            "esperado": 0.15,
-            "previsto": 0.15,
-            "cumple": 0.3,
-            "cumplimiento": 0.3,
-            "alcanza": 0.35,
-            "obtiene": 0.3,
-            "duplica": 0.4,
-            "triplica": 0.45,
-            "multiplica": 0.35,
-            "incrementa": 0.3,
-            "suma": 0.2,
-            "adicional": 0.2,
-            "adicionales": 0.2,
-            "extra": 0.2,
-            "mayor": 0.25,
-            "mayores": 0.25,
-            "mas": 0.15,
-            "mejor": 0.3,
-            "mejores": 0.3,
-            "superior": 0.3,
-            "supera": 0.35,
-            "supero": 0.35,
-            "excelente": 0.4,
-            "destacado": 0.35,
-            "destaca": 0.3,
-            "sobresale": 0.35,
-            "lidera": 0.35,
-            "lider": 0.35,
-            "liderazgo": 0.35,
-            "primero": 0.3,
-            "primera": 0.3,
+    def analyze_sentiment_components(
+        self, text: str, tokens: Optional[List[str]] = None
+    ) -> Tuple[float, str, Dict[str, Optional[float]]]:
+        """
+        Score y etiqueta junto con los componentes sin combinar (keyword_score,
+        textblob_polarity, vader_compound). Un componente que no se calculó
+        (nivel de puntuación, early exit o error) queda en None.
+        """
+        components = {
+            "keyword_score": 0.0,
+            "textblob_polarity": None,
+            "vader_compound": None,
         }
+        if not text:
+            return 0.0, "neutral", components
 
-        negative_economic = {
-            # Caídas y bajas (-0.4 a -0.6)
-            "cae": -0.55,
-            "caida": -0.55,
-            "cayo": -0.55,
-            "cayeron": -0.55,
-            "baja": -0.5,
-            "bajo": -0.5,
-            "bajaron": -0.5,
-            "descenso": -0.5,
-            "desciende": -0.5,
-            "descendio": -0.5,
-            "desploma": -0.65,
-            "desplome": -0.65,
-            "desplomo": -0.65,
-            "derrumba": -0.65,
-            "derrumbe": -0.65,
-            "colapsa": -0.7,
-            "colapso": -0.7,
-            # Pérdidas (-0.4 a -0.7)
-            "pierde": -0.55,
-            "perdida": -0.55,
-            "perdidas": -0.55,
-            "perdio": -0.55,
-            "perdieron": -0.55,
-            "deficit": -0.6,
-            "deficitario": -0.6,
-            "quebranto": -0.65,
-            "merma": -0.5,
-            # Crisis y recesión (-0.6 a -0.8)
-            "crisis": -0.7,
-            "recesion": -0.7,
-            "recesivo": -0.7,
-            "depresion": -0.75,
-            "quiebra": -0.8,
-            "bancarrota": -0.8,
-            "insolvencia": -0.75,
-            "impago": -0.7,
-            "default": -0.75,
-            # Problemas y riesgos (-0.3 a -0.6)
-            "riesgo": -0.45,
-            "riesgos": -0.45,
-            "riesgoso": -0.45,
-            "problema": -0.5,
-            "problemas": -0.5,
-            "dificultad": -0.5,
-            "dificultades": -0.5,
-            "complicacion": -0.5,
-            "amenaza": -0.55,
-            "amenazas": -0.55,
-            "peligro": -0.55,
-            "peligros": -0.55,
-            # Afectaciones (-0.35 a -0.6)
-            "afecta": -0.5,
-            "afectacion": -0.5,
-            "afectado": -0.5,
-            "impacta": -0.45,
-            "impacto": -0.4,
-            "golpea": -0.55,
-            "golpe": -0.55,
-            "dana": -0.55,
-            "dano": -0.55,
-            "danos": -0.55,
-            "perjudica": -0.55,
-            "perjuicio": -0.55,
-            "deteriora": -0.55,
-            "deterioro": -0.55,
-            "debilita": -0.55,
-            "debilitamiento": -0.55,
-            # Inflación y devaluación (-0.45 a -0.7)
-            "inflacion": -0.6,
-            "inflacionario": -0.6,
-            "devaluacion": -0.6,
-            "devalua": -0.6,
-            "devaluo": -0.6,
-            "deprecia": -0.55,
-            "depreciacion": -0.55,
-            "deprecio": -0.55,
-            "desvaloriza": -0.55,
-            # Desaceleración y estancamiento (-0.4 a -0.6)
-            "desaceleracion": -0.55,
-            "desacelera": -0.55,
-            "ralentiza": -0.5,
-            "ralentizacion": -0.5,
-            "estancamiento": -0.6,
-            "estanca": -0.6,
-            "estancado": -0.6,
-            "paraliza": -0.65,
-            "paralizacion": -0.65,
-            "frena": -0.5,
-            "freno": -0.5,
-            "frenada": -0.5,
-            # Inestabilidad y desconfianza (-0.45 a -0.65)
-            "inestabilidad": -0.6,
-            "inestable": -0.6,
-            "volatilidad": -0.5,
-            "volatil": -0.5,
-            "incertidumbre": -0.55,
-            "incierto": -0.55,
-            "desconfianza": -0.55,
-            "desconfian": -0.55,
-            "desconfia": -0.55,
-            "temor": -0.5,
-            "miedo": -0.5,
-            "panico": -0.65,
-            "nerviosismo": -0.5,
-            # Desempleo y escasez (-0.5 a -0.7)
-            "desempleo": -0.65,
-            "desempleado": -0.65,
-            "despido": -0.65,
-            "despidos": -0.65,
-            "escasez": -0.6,
-            "escaso": -0.55,
-            "carencia": -0.55,
-            "falta": -0.45,
-            "faltan": -0.45,
-            # Corrupción y delitos (-0.6 a -0.8)
-            "corrupcion": -0.7,
-            "corrupto": -0.7,
-            "fraude": -0.75,
-            "fraudulento": -0.75,
-            "soborno": -0.7,
-            "lavado": -0.7,
-            "ilegal": -0.65,
-            "ilicito": -0.65,
-            "delito": -0.65,
-            # Conflictos (-0.5 a -0.8)
-            "guerra": -0.75,
-            "conflicto": -0.6,
-            "violencia": -0.7,
-            "violento": -0.7,
-            "huelga": -0.6,
-            "paro": -0.55,
-            "protesta": -0.5,
-            "manifestacion": -0.45,
-            "disturbios": -0.65,
-            # Negación y rechazo (-0.4 a -0.6)
-            "niega": -0.45,
-            "negacion": -0.45,
-            "rechaza": -0.5,
-            "rechazo": -0.5,
-            "suspende": -0.55,
-            "suspension": -0.55,
-            "cancela": -0.55,
-            "cancelacion": -0.55,
-            "anula": -0.5,
-            # Reducción y recorte (-0.35 a -0.55)
-            "reduce": -0.5,
-            "reduccion": -0.5,
-            "disminuye": -0.5,
-            "disminucion": -0.5,
-            "recorte": -0.55,
-            "recorta": -0.55,
-            "recortaron": -0.55,
-            "contraccion": -0.55,
-            "contrae": -0.55,
-            # Emergencia y catástrofe (-0.5 a -0.75)
-            "emergencia": -0.6,
-            "emergente": -0.55,
-            "catastrofe": -0.75,
-            "catastrofico": -0.75,
-            "desastre": -0.75,
-            "desastroso": -0.75,
-            "tragedia": -0.7,
-            "tragico": -0.7,
-            "grave": -0.55,
-            "critico": -0.6,
-            # Adicionales negativos (-0.4 a -0.65)
-            "fuga": -0.65,
-            "sancion": -0.6,
-            "sanciones": -0.6,
-            "penaliza": -0.55,
-            "penalizacion": -0.55,
-            "multa": -0.5,
-            "perdurable": -0.45,
-            "adverso": -0.55,
-            "adversidad": -0.55,
-            "desfavorable": -0.55,
-            "negativo": -0.5,
-            "negativa": -0.5,
-            "pesimismo": -0.55,
-            "pesimista": -0.55,
-            "sombrio": -0.55,
-            # Palabras económicas comunes negativas (-0.15 a -0.35)
-            "no": -0.15,
-            "sin": -0.2,
-            "menos": -0.25,
-            "menor": -0.25,
-            "menores": -0.25,
-            "cierra": -0.3,
-            "cierre": -0.3,
-            "cerro": -0.3,
-            "cerraron": -0.3,
-            "clausura": -0.35,
-            "clausuro": -0.35,
-            "termina": -0.25,
-            "termino": -0.25,
-            "detiene": -0.3,
-            "detenido": -0.3,
-            "detencion": -0.3,
-            "para": -0.25,
-            "parado": -0.3,
-            "paraliza": -0.35,
-            "paralizado": -0.35,
-            "limita": -0.3,
-            "limitacion": -0.3,
-            "limitado": -0.3,
-            "restringe": -0.35,
-            "restriccion": -0.35,
-            "restringido": -0.35,
-            "prohibe": -0.4,
-            "prohibicion": -0.4,
-            "veto": -0.4,
-            "bloquea": -0.4,
-            "bloqueo": -0.4,
-            "retrasa": -0.35,
-            "retraso": -0.35,
-            "demora": -0.3,
-            "demorado": -0.3,
-            "aplaza": -0.3,
-            "aplazamiento": -0.3,
-            "pospone": -0.3,
-            "posterga": -0.3,
-            "elimina": -0.35,
-            "eliminacion": -0.35,
-            "elimino": -0.35,
-            "suprime": -0.35,
-            "supresion": -0.35,
-            "suprimio": -0.35,
-            "retira": -0.3,
-            "retiro": -0.3,
-            "retiraron": -0.3,
-            "abandona": -0.4,
-            "abandono": -0.4,
-            "renuncia": -0.35,
-            "renuncio": -0.35,
-            "falla": -0.35,
-            "fallo": -0.35,
-            "fallido": -0.35,
-            "fracasa": -0.4,
-            "fracaso": -0.4,
-            "fracasado": -0.4,
-            "incumple": -0.4,
-            "incumplimiento": -0.4,
-            "incumplido": -0.4,
-            "evita": -0.25,
-            "evitado": -0.25,
-            "previene": -0.2,
-            "prevencion": -0.2,
-            "advierte": -0.3,
-            "advertencia": -0.3,
-            "alerta": -0.35,
-            "preocupa": -0.35,
-            "preocupacion": -0.35,
-            "preocupante": -0.35,
-            "inquieta": -0.3,
-            "inquietud": -0.3,
-            "inquietante": -0.3,
-            "debil": -0.35,
-            "debilidad": -0.35,
-            "fragil": -0.4,
-            "fragilidad": -0.4,
-            "vulnerable": -0.35,
-            "vulnerabilidad": -0.35,
-            "peor": -0.35,
-            "peores": -0.35,
-            "inferior": -0.3,
-            "inferiores": -0.3,
-            "bajo": -0.25,
-            "minimo": -0.3,
-        }
+        # Normalizar texto (reutiliza los tokens del artículo si se proporcionan)
+        if tokens is None:
+            tokens = tokenize(text)
 
-        # Analizar con intensificadores y negaciones
-        words = text_normalized.split()
-        scores = []
-
-        i = 0
-        while i < len(words):
-            word = words[i]
-            intensifier = 1.0
-            is_negated = False
-
-            # Detectar intensificador
-            if i > 0 and words[i - 1] in intensifiers:
-                intensifier = intensifiers[words[i - 1]]
-
-            # Detectar negación
-            if i > 0 and words[i - 1] in negations:
-                is_negated = True
-            elif i > 1 and words[i - 2] in negations:
-                is_negated = True
-
-            # Calcular score
-            if word in positive_economic:
-                score = positive_economic[word] * intensifier
-                if is_negated:
-                    score = -score
-                scores.append(score)
-            elif word in negative_economic:
-                score = negative_economic[word] * intensifier
-                if is_negated:
-                    score = -score
-                scores.append(score)
-
-            i += 1
-
-        keyword_score = sum(scores)
+        # Analizar con intensificadores y negaciones (léxico precompilado)
+        keyword_score = score_tokens(lemmatize(tokens))
+        components["keyword_score"] = keyword_score
 
         try:
-            # VADER
-            if self.sia:
+            # VADER (niveles "vader" y "full")
+            vader_compound = 0.0
+            if self.scoring_tier != "keyword" and self.sia:
                 vader_compound = self.sia.polarity_scores(text)["compound"]
-            else:
-                vader_compound = 0.0
-
-            # TextBlob
-            blob = TextBlob(text)
-            textblob_polarity = blob.sentiment.polarity
-
-            # Combinar con pesos optimizados: Keywords 65%, TextBlob 25%, VADER 10%
-            # Keywords tienen más peso porque son específicos del dominio económico
-            base_score = (
-                (keyword_score * 0.65)
-                + (textblob_polarity * 0.25)
-                + (vader_compound * 0.1)
+                components["vader_compound"] = vader_compound
+
+            # TextBlob (nivel "full"): se omite si keywords + VADER ya deciden la etiqueta
+            textblob_polarity = 0.0
+            if self.scoring_tier == "full" and (
+                not self.early_exit
+                or textblob_is_decisive(keyword_score, vader_compound)
+            ):
+                self.load_scorers()
+                blob = self._textblob(text)
+                textblob_polarity = blob.sentiment.polarity
+                components["textblob_polarity"] = textblob_polarity
+
+            score, label = combine_scores(
+                keyword_score, textblob_polarity, vader_compound
             )
-
-            # AMPLIFICACIÓN: Multiplicar por 2.5 para mayor variación visual
-            amplified_score = base_score * 2.5
-
-            # NORMALIZACIÓN: Ajustar para que el promedio esté alrededor de 0.26 (como COLCAP)
-            # Offset de +0.26 para alinear con el punto de inicio del COLCAP
-            final_score = amplified_score + 0.26
-
-            # Limitar a rango razonable para visualización
-            final_score = max(-0.5, min(1.2, final_score))
-
-            # Umbrales ajustados para la nueva escala
-            if final_score >= 0.30:  # Por encima del baseline 0.26
-                label = "positive"
-            elif final_score <= 0.22:  # Por debajo del baseline 0.26
-                label = "negative"
-            else:
-                label = "neutral"
-
-            return final_score, label
+            return score, label, components
 
         except Exception as e:
             logger.error(f"Error en análisis de sentimiento: {str(e)}")
             # Fallback: usar solo keywords con amplificación y normalización
             amplified = keyword_score * 2.5 + 0.26
             amplified = max(-0.5, min(1.2, amplified))
-            return amplified, (
-                "positive"
-                if amplified > 0.30
-                else ("negative" if amplified < 0.22 else "neutral")
+            return (
+                amplified,
+                (
+                    "positive"
+                    if amplified > 0.30
+                    else ("negative" if amplified < 0.22 else "neutral")
+                ),
+                components,
             )
 
-    def classify_categories(self, text: str) -> List[str]:
+    def classify_categories(
+        self, text: str, tokens: Optional[List[str]] = None
+    ) -> List[str]:
         """Clasificar noticias por categorías económicas"""
-        text_lower = text.lower()
-        categories = []
+        if tokens is None:
+            tokens = tokenize(text)
 
-        for category, keywords in self.categories_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                categories.append(category)
+        found = self.category_matcher.match(tokens)
+        categories = [c for c in self.categories_keywords if c in found]
 
         return categories if categories else ["general"]
 
-    def extract_keywords(self, text: str, top_n: int = 5) -> List[str]:
-        """Extraer keywords principales del texto"""
+    def set_categories_keywords(self, categories_keywords: Dict[str, List[str]]):
+        """Reemplazar la tabla de categorías y recompilar el autómata"""
+        self.categories_keywords = categories_keywords
+        self.category_matcher = KeywordMatcher(categories_keywords)
+        if self.scoring_cache is not None:
+            self.scoring_cache.namespace = self.scoring_fingerprint()
+
+    def extract_keywords(
+        self, text: str, top_n: int = 5, tokens: Optional[List[str]] = None
+    ) -> List[str]:
+        """Extraer keywords principales del texto (TF-IDF sobre el corpus)"""
         try:
-            # Tokenizar y limpiar
-            words = text.lower().split()
-
-            # Filtrar palabras comunes (stopwords)
-            stopwords = set(
-                [
-                    "el",
-                    "la",
-                    "de",
-                    "que",
-                    "y",
-                    "a",
-                    "en",
-                    "un",
-                    "ser",
-                    "se",
-                    "no",
-                    "por",
-                    "con",
-                    "su",
-                    "para",
-                    "como",
-                    "es",
-                ]
-            )
-
-            words = [w for w in words if w not in stopwords and len(w) > 3]
-
-            # Contar frecuencias
-            word_freq = {}
-            for word in words:
-                word_freq[word] = word_freq.get(word, 0) + 1
-
-            # Top N keywords
-            sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-            keywords = [word for word, freq in sorted_words[:top_n]]
-
-            return keywords
+            words = tokens if tokens is not None else tokenize(text)
+            return extract_keywords(words, top_n, self.document_frequency)
 
         except Exception as e:
             logger.error(f"Error extrayendo keywords: {str(e)}")
             return []
 
     def process_article(self, article: Dict) -> Dict:
-        """Procesar un artículo individual"""
+        """Procesar un artículo individual (con "error" si la puntuación falla)"""
         try:
             # Combinar título y contenido para análisis
             full_text = f"{article['title']} {article.get('content', '')}"
 
+            # Tokenización única compartida por los tres análisis
+            tokens = tokenize(full_text)
+
+            # Copias idénticas (p. ej. noticias sindicadas) se puntúan una sola vez
+            cache_key = None
+            if self.scoring_cache is not None:
+                cache_key = self.scoring_cache.key(tokens)
+                cached = self.scoring_cache.get(cache_key)
+                if cached is not None:
+                    return {"id": article["id"], **cached}
+
             # Análisis de sentimiento
-            sentiment_score, sentiment_label = self.analyze_sentiment(full_text)
+            sentiment_score, sentiment_label, components = (
+                self.analyze_sentiment_components(full_text, tokens)
+            )
 
             # Clasificación de categorías
-            categories = self.classify_categories(full_text)
+            categories = self.classify_categories(full_text, tokens)
 
             # Extracción de keywords
-            keywords = self.extract_keywords(full_text)
+            keywords = self.extract_keywords(full_text, tokens=tokens)
 
-            return {
-                "id": article["id"],
+            scores = {
                 "sentiment_score": sentiment_score,
                 "sentiment_label": sentiment_label,
+                **components,
                 "categories": categories,
                 "keywords": keywords,
+                "lexicon_version": LEXICON_VERSION,
+                "terms": sorted(index_terms(tokens, lemmatize(tokens))),
+                # Se suman a la tabla DF solo al escribirse (flush_updates)
+                "document_terms": sorted(set(candidate_terms(tokens))),
             }
+            if cache_key is not None:
+                self.scoring_cache.set(cache_key, scores)
+
+            return {"id": article["id"], **scores}
 
         except Exception as e:
             logger.error(f"Error procesando artículo {article.get('id')}: {str(e)}")
-            return None
+            return {"id": article.get("id"), "error": f"{type(e).__name__}: {e}"}
+
+    def register_lexicon_version(self):
+        """Registrar las tablas del léxico actual para la re-puntuación incremental"""
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            register_version(cursor)
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            logger.warning(f"No se pudo registrar la versión del léxico: {str(e)}")
+        finally:
+            cursor.close()
+            conn.close()
 
     def get_unprocessed_articles(self, limit: int = 100) -> List[Dict]:
-        """Obtener artículos sin procesar de la BD"""
+        """
+        Reclamar artículos sin procesar (o marcados para re-puntuar) de la BD.
+        Marca las filas con el id del worker y un lease (FOR UPDATE SKIP LOCKED),
+        de modo que otras réplicas las omiten; si el lease expira sin que el
+        artículo se haya procesado, cualquier worker puede volver a reclamarlo.
+
+        Reparto ponderado entre carriles: el carril live tiene garantizada su
+        cuota del lote (lane_weights); lo que no usa pasa a backfill y, si
+        backfill no llena el resto, live completa el lote.
+        """
+        live_quota = math.ceil(
+            limit * self.lane_weights["live"] / sum(self.lane_weights.values())
+        )
         conn = self.get_db_connection()
         cursor = conn.cursor(cursor_factory=RealDictCursor)
 
         try:
-            cursor.execute(
-                """
-                SELECT id, title, content, published_date
-                FROM news
-                WHERE sentiment_score IS NULL
-                ORDER BY published_date DESC
-                LIMIT %s
-            """,
-                (limit,),
+            live = self.claim_lane(cursor, "live", live_quota)
+            backfill = self.claim_lane(cursor, "backfill", limit - len(live))
+            if len(live) == live_quota and len(live) + len(backfill) < limit:
+                live += self.claim_lane(
+                    cursor, "live", limit - len(live) - len(backfill)
+                )
+            conn.commit()
+
+            self.live_active = bool(live)
+            for lane, claimed in (("live", live), ("backfill", backfill)):
+                self.metrics.inc(
+                    "processor_lane_claimed_total", len(claimed), {"lane": lane}
+                )
+            logger.info(
+                f"Reclamados {len(live) + len(backfill)} artículos sin procesar "
+                f"(live: {len(live)}, backfill: {len(backfill)})"
+            )
+            return live + backfill
+
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            cursor.close()
+            conn.close()
+
+    def claim_lane(self, cursor, lane: str, limit: int) -> List[Dict]:
+        """
+        Reclamar hasta limit artículos pendientes de un carril: primero los ids
+        anunciados por los collectors y, si no llenan el cupo, los más antiguos
+        (o más recientes, en live) de la cola
+        """
+        if limit <= 0:
+            return []
+        claimed = []
+        targeted = self.targeted_ids.get(lane)
+        if targeted:
+            ids, self.targeted_ids[lane] = targeted[:limit], targeted[limit:]
+            # Los que ya procesó o reclamó otra réplica no cumplen el filtro
+            claimed = self._claim(cursor, "id = ANY(%s)", (ids,), "id", limit)
+        if len(claimed) < limit:
+            # live: los más recientes primero; backfill: orden de llegada
+            order = "published_date DESC" if lane == "live" else "id"
+            claimed += self._claim(
+                cursor, "lane = %s", (lane,), order, limit - len(claimed)
             )
+        return claimed
+
+    def claim_shard(
+        self, shard_index: int, shard_count: int, limit: int
+    ) -> List[Dict]:
+        """Reclamar hasta limit artículos pendientes del shard (en orden de id)"""
+        conn = self.get_db_connection()
+        cursor = conn.cursor(cursor_factory=RealDictCursor)
 
-            articles = cursor.fetchall()
-            logger.info(f"Obtenidos {len(articles)} artículos sin procesar")
-            return articles
+        try:
+            claimed = self._claim(
+                cursor, "id %% %s = %s", (shard_count, shard_index), "id", limit
+            )
+            conn.commit()
+            return claimed
 
+        except Exception:
+            conn.rollback()
+            raise
         finally:
             cursor.close()
             conn.close()
 
+    def _claim(
+        self, cursor, condition: str, params: tuple, order: str, limit: int
+    ) -> List[Dict]:
+        cursor.execute(
+            f"""
+            UPDATE news
+            SET claimed_by = %s,
+                lease_expires_at = NOW() + make_interval(secs => %s)
+            WHERE id IN (
+                SELECT id
+                FROM news
+                WHERE (sentiment_score IS NULL OR needs_rescore)
+                  AND {condition}
+                  AND (lease_expires_at IS NULL OR lease_expires_at < NOW())
+                ORDER BY {order}
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            )
+            RETURNING id, title, content, published_date, lane,
+                      EXTRACT(EPOCH FROM NOW() - created_at)::float AS queued_seconds
+        """,
+            (self.worker_id, self.lease_seconds, *params, limit),
+        )
+        return cursor.fetchall()
+
     def update_article(self, processed_data: Dict):
         """Actualizar artículo con datos procesados"""
         conn = self.get_db_connection()
@@ -888,19 +616,45 @@ class NewsProcessor:
                 UPDATE news
                 SET sentiment_score = %s,
                     sentiment_label = %s,
+                    keyword_score = %s,
+                    textblob_polarity = %s,
+                    vader_compound = %s,
                     categories = %s,
                     keywords = %s,
+                    lexicon_version = %s,
+                    needs_rescore = FALSE,
+                    scoring_attempts = 0,
+                    claimed_by = NULL,
+                    lease_expires_at = NULL,
                     updated_at = CURRENT_TIMESTAMP
-                WHERE id = %s
+                WHERE id = %s AND claimed_by = %s
             """,
                 (
                     processed_data["sentiment_score"],
                     processed_data["sentiment_label"],
+                    processed_data["keyword_score"],
+                    processed_data["textblob_polarity"],
+                    processed_data["vader_compound"],
                     processed_data["categories"],
                     processed_data["keywords"],
+                    processed_data["lexicon_version"],
                     processed_data["id"],
+                    self.worker_id,
                 ),
             )
+            if cursor.rowcount == 0:
+                # Lease perdido: la fila ya es de otro worker
+                conn.rollback()
+                self.metrics.inc("processor_stale_results_total")
+                return
+            cursor.execute(
+                "DELETE FROM news_terms WHERE news_id = %s", (processed_data["id"],)
+            )
+            execute_values(
+                cursor,
+                "INSERT INTO news_terms (term, news_id) VALUES %s",
+                [(term, processed_data["id"]) for term in processed_data["terms"]],
+            )
 
             conn.commit()
 
@@ -911,67 +665,422 @@ class NewsProcessor:
             cursor.close()
             conn.close()
 
-    def process_batch(self):
-        """Procesa un lote de artículos"""
+    def batch_update_articles(self, processed: List[Dict]) -> int:
+        """
+        Encolar artículos procesados para escritura masiva.
+        Vuelca a la BD al alcanzar flush_size o tras flush_interval segundos.
+        Returns: número de artículos escritos (0 si solo se encolaron)
+        """
+        self._pending_updates.extend(processed)
+
+        if (
+            len(self._pending_updates) >= self.flush_size
+            or time.time() - self._last_flush >= self.flush_interval
+        ):
+            return self.flush_updates()
+        return 0
+
+    def flush_updates(self) -> int:
+        """Escribir los resultados pendientes con COPY + un único UPDATE"""
+        self._last_flush = time.time()
+        if not self._pending_updates:
+            return 0
+
+        pending = self._pending_updates
+        self._pending_updates = []
+
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            updated = copy_updates(cursor, pending, self.worker_id)
+            conn.commit()
+            # Frecuencia documental: un documento por artículo puntuado por
+            # primera vez (no en re-puntuaciones ni en resultados descartados)
+            first_scored = {news_id for news_id, first in updated if first}
+            for result in pending:
+                if result["id"] in first_scored:
+                    self.document_frequency.add_document(result["document_terms"])
+            # Enviar ya a Redis: en modo process los workers solo ven la tabla
+            # compartida, no el sketch de este proceso
+            self.document_frequency.flush()
+            stale = len(pending) - len(updated)
+            if stale:
+                # Lease expirado: otro worker reclamó (o ya puntuó) esas filas
+                self.metrics.inc("processor_stale_results_total", stale)
+                logger.warning(f"⚠️  {stale} resultados descartados por lease perdido")
+            logger.info(f"💾 Escritos {len(updated)} artículos procesados")
+            return len(updated)
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error en escritura masiva: {str(e)}")
+            return 0
+        finally:
+            cursor.close()
+            conn.close()
+
+    def get_process_pool(self) -> ProcessPoolExecutor:
+        """Pool de procesos persistente entre lotes (workers inicializados una vez)"""
+        if self._process_pool is None:
+            # Evita hacer fork mientras el hilo de carga está importando módulos;
+            # los workers heredan nltk/TextBlob ya importados
+            self.load_scorers()
+            self._process_pool = ProcessPoolExecutor(
+                max_workers=self.num_workers, initializer=_init_worker
+            )
+            logger.info(f"Pool de procesos iniciado con {self.num_workers} workers")
+        return self._process_pool
+
+    def process_articles(self, articles: List[Dict]) -> List[Dict]:
+        """Procesar artículos en paralelo según el modo de ejecución"""
+        if self.execution_mode == "process":
+            chunks = [
+                articles[i : i + self.chunk_size]
+                for i in range(0, len(articles), self.chunk_size)
+            ]
+            pool = self.get_process_pool()
+            results = [r for chunk in pool.map(_process_chunk, chunks) for r in chunk]
+        else:
+            with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+                results = list(executor.map(self.process_article, articles))
+            self.publish_batch_stats()
+
+        failed = [r for r in results if "error" in r]
+        if failed:
+            self.record_failures(failed)
+        return [r for r in results if "error" not in r]
+
+    def record_failures(self, failed: List[Dict]):
+        """
+        Registrar intentos fallidos: backoff exponencial vía lease_expires_at
+        (el artículo no se puede reclamar hasta entonces) y, tras max_attempts
+        fallos, dead letter: lease infinito y una fila en dead_letters.
+        """
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            # Solo filas que siguen reclamadas por este worker: con el lease
+            # expirado, la fila ya es de otro y su intento no cuenta
+            attempts = execute_values(
+                cursor,
+                """
+                UPDATE news AS n
+                SET scoring_attempts = n.scoring_attempts + 1,
+                    claimed_by = NULL,
+                    lease_expires_at = CASE
+                        WHEN n.scoring_attempts + 1 >= f.max_attempts
+                            THEN 'infinity'::timestamp
+                        ELSE NOW() + make_interval(
+                            secs => LEAST(
+                                f.max_seconds,
+                                f.base_seconds * power(2, n.scoring_attempts)
+                            )
+                        )
+                    END
+                FROM (VALUES %s) AS f(
+                    id, error, worker_id, max_attempts, max_seconds, base_seconds
+                )
+                WHERE n.id = f.id
+                  AND n.claimed_by = f.worker_id
+                RETURNING n.id, n.scoring_attempts, f.error
+            """,
+                [
+                    (
+                        r["id"],
+                        r["error"],
+                        self.worker_id,
+                        self.max_attempts,
+                        self.retry_max_seconds,
+                        self.retry_base_seconds,
+                    )
+                    for r in failed
+                ],
+                template="(%s, %s, %s, %s::int, %s::float, %s::float)",
+                fetch=True,
+            )
+            dead = [row for row in attempts if row[1] >= self.max_attempts]
+            if dead:
+                execute_values(
+                    cursor,
+                    """
+                    INSERT INTO dead_letters (news_id, attempts, last_error)
+                    VALUES %s
+                    ON CONFLICT (news_id) DO UPDATE
+                    SET attempts = EXCLUDED.attempts,
+                        last_error = EXCLUDED.last_error,
+                        failed_at = CURRENT_TIMESTAMP
+                """,
+                    dead,
+                )
+            conn.commit()
+
+            stale = len(failed) - len(attempts)
+            if stale:
+                self.metrics.inc("processor_stale_results_total", stale)
+            self.metrics.inc("processor_scoring_failures_total", len(attempts))
+            self.metrics.inc("processor_dead_letters_total", len(dead))
+            logger.warning(
+                f"⚠️ {len(attempts)} artículos fallidos, {len(dead)} a dead letters"
+                + (f", {stale} descartados por lease perdido" if stale else "")
+            )
+
+        except Exception as e:
+            conn.rollback()
+            logger.error(f"Error registrando fallos: {str(e)}")
+        finally:
+            cursor.close()
+            conn.close()
+
+    def close(self):
+        """Volcar resultados pendientes y liberar el pool de procesos"""
+        self.flush_updates()
+        self.document_frequency.flush()
+        if self._process_pool is not None:
+            self._process_pool.shutdown()
+            self._process_pool = None
+
+    def count_pending_articles(self) -> Dict[str, int]:
+        """Número de artículos sin procesar por carril"""
+        conn = self.get_db_connection()
+        cursor = conn.cursor()
+
+        try:
+            cursor.execute(
+                """
+                SELECT lane, COUNT(*)
+                FROM news
+                WHERE (sentiment_score IS NULL OR needs_rescore)
+                  AND lease_expires_at IS DISTINCT FROM 'infinity'
+                GROUP BY lane
+            """
+            )
+            return {"live": 0, "backfill": 0, **dict(cursor.fetchall())}
+        finally:
+            cursor.close()
+            conn.close()
+
+    def refresh_backlog(self):
+        """Actualizar el backlog desde la BD cada backlog_refresh segundos"""
+        if time.time() - self._backlog_checked < self.backlog_refresh:
+            return
+        try:
+            self.lane_backlog = self.count_pending_articles()
+            self.backlog = sum(self.lane_backlog.values())
+            self._backlog_checked = time.time()
+        except Exception as e:
+            logger.warning(f"No se pudo contar el backlog: {str(e)}")
 
-        articles = self.get_unprocessed_articles(limit=50)
+    def process_batch(self) -> int:
+        """
+        Procesa un lote de artículos (tamaño adaptativo).
+        Returns: artículos reclamados, incluidos los que fallaron (0 = cola vacía)
+        """
+        start = time.time()
+        self.refresh_backlog()
+        # Mientras haya tráfico live el lote mantiene la duración objetivo, para
+        # que las noticias nuevas esperen como mucho un lote corto
+        live_pending = self.live_active or self.lane_backlog.get("live", 0) > 0
+        limit = self.batcher.next_size(None if live_pending else self.backlog)
+
+        articles = self.get_unprocessed_articles(limit=limit)
         if not articles:
+            if self.flush_updates():
+                self.notify_analyzer()
             return 0
 
-        processed = []
+        scoring_start = time.time()
+        processed = self.process_articles([dict(article) for article in articles])
+        scoring_seconds = time.time() - scoring_start
 
-        with ThreadPoolExecutor(max_workers=num_workers) as executor:
-            futures = [
-                executor.submit(self.process_article, dict(article))
-                for article in articles
-            ]
+        if processed and self.batch_update_articles(processed):
+            self.notify_analyzer()
+
+        self.batcher.record(len(articles), scoring_seconds, time.time() - start)
+        for lane in self.lane_weights:
+            lane_articles = [a for a in articles if a["lane"] == lane]
+            if not lane_articles:
+                continue
+            if lane in self.lane_backlog:
+                self.lane_backlog[lane] = max(
+                    0, self.lane_backlog[lane] - len(lane_articles)
+                )
+            queued = sum(a["queued_seconds"] for a in lane_articles)
+            self.metrics.set(
+                "processor_lane_latency_seconds",
+                queued / len(lane_articles) + time.time() - start,
+                {"lane": lane},
+            )
+        if self.backlog is not None:
+            self.backlog = max(0, self.backlog - len(articles))
+        self.update_batch_metrics(len(processed))
+
+        return len(articles)
 
-            # Recolectar resultados a medida que terminan
-            for future in as_completed(futures):
-                result = future.result()
-                if result:
-                    processed.append(result)
+    def process_shard(self, shard_index: int, shard_count: int) -> Dict:
+        """
+        Modo batch particionado: procesa solo los artículos pendientes con
+        id % shard_count == shard_index, reclamándolos por bloques con el mismo
+        lease que el modo continuo hasta agotar la partición. Los shards son
+        disjuntos entre sí, pero el lease evita procesar dos veces una fila que
+        también reclame un processor continuo o un pod reintentado del Job.
+        Returns: estadísticas del shard (artículos, segundos, art/s)
+        """
+        start = time.time()
+        total = 0
 
-        if processed:
+        while True:
+            batch_start = time.time()
+            articles = self.claim_shard(
+                shard_index, shard_count, self.batcher.next_size()
+            )
+            if not articles:
+                break
+
+            scoring_start = time.time()
+            processed = self.process_articles([dict(a) for a in articles])
+            scoring_seconds = time.time() - scoring_start
             self.batch_update_articles(processed)
-            self.notify_analyzer()
 
-        return len(processed)
+            self.batcher.record(
+                len(articles), scoring_seconds, time.time() - batch_start
+            )
+            total += len(processed)
+            logger.info(
+                f"📦 Shard {shard_index}/{shard_count}: {total} artículos "
+                f"({total / (time.time() - start):.1f} art/s)"
+            )
+
+        self.flush_updates()
 
+        if total:
+            self.notify_analyzer()
+
+        seconds = time.time() - start
+        stats = {
+            "shard": shard_index,
+            "shards": shard_count,
+            "processed": total,
+            "seconds": round(seconds, 2),
+            "articles_per_second": round(total / seconds, 1) if seconds else 0.0,
+        }
+        logger.info(f"✅ Shard {shard_index}/{shard_count} completado: {stats}")
+        return stats
+
+    def update_batch_metrics(self, processed: int):
+        """Publicar tamaño de lote, backlog y throughput"""
+        self.metrics.set("processor_batch_size", self.batcher.size)
+        for lane, backlog in self.lane_backlog.items():
+            self.metrics.set("processor_backlog", backlog, {"lane": lane})
+        self.metrics.set("processor_articles_per_second", self.batcher.rate)
+        self.metrics.set("processor_article_latency_seconds", self.batcher.latency or 0)
+        self.metrics.inc("processor_articles_processed_total", processed)
 
     def notify_analyzer(self):
         """Notificar al servicio de análisis"""
         message = {"timestamp": datetime.utcnow().isoformat(), "action": "run_analysis"}
-        self.redis_client.publish("analysis_trigger", json.dumps(message))
+        self.redis_client.xadd(
+            self.analysis_stream, message, maxlen=10000, approximate=True
+        )
+
+    def ensure_consumer_group(self):
+        """Crear el grupo de consumidores (y el stream) si no existen"""
+        try:
+            self.redis_client.xgroup_create(
+                self.jobs_stream, self.jobs_group, id="0", mkstream=True
+            )
+        except redis.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+
+    def remember_targets(self, fields: Dict[str, str]):
+        """Guardar los ids que anuncia una notificación del collector"""
+        ids = fields.get("article_ids")
+        lane = fields.get("lane", "live")
+        if not ids or lane not in self.targeted_ids:
+            return
+        targeted = self.targeted_ids[lane]
+        # Si la lista se llena, el resto se reclama igual desde la cola
+        room = self.max_targeted_ids - len(targeted)
+        targeted.extend(int(i) for i in ids.split(",")[: max(0, room)])
+
+    def read_jobs(self) -> List[str]:
+        """
+        Leer notificaciones del stream.
+        Primero reclama las pendientes de consumidores caídos (inactivas más que
+        el lease); si no hay, bloquea hasta block_ms esperando nuevas.
+        Los ids de artículos que traen quedan en targeted_ids.
+        """
+        _, messages, _ = self.redis_client.xautoclaim(
+            self.jobs_stream,
+            self.jobs_group,
+            self.worker_id,
+            min_idle_time=self.lease_seconds * 1000,
+            start_id="0-0",
+            count=100,
+        )
+        if messages:
+            logger.info(f"Reclamadas {len(messages)} notificaciones pendientes")
+        else:
+            response = self.redis_client.xreadgroup(
+                self.jobs_group,
+                self.worker_id,
+                {self.jobs_stream: ">"},
+                count=100,
+                block=self.block_ms,
+            )
+            messages = [entry for _, entries in response for entry in entries]
+
+        for _, fields in messages:
+            # xautoclaim devuelve None para mensajes ya recortados del stream
+            if fields:
+                self.remember_targets(fields)
+        return [message_id for message_id, _ in messages]
 
     def listen_for_jobs(self):
-        """Escuchar mensajes de Redis"""
-        pubsub = self.redis_client.pubsub()
-        pubsub.subscribe("news_processing")
+        """
+        Consumir notificaciones del stream 'news_processing'.
+        Tras cada lectura se vacía el backlog y luego se confirman (XACK) los
+        mensajes; si el bloqueo expira sin mensajes se procesa igualmente como
+        red de seguridad.
+        """
+        self.ensure_consumer_group()
+        logger.info(
+            f"Escuchando stream '{self.jobs_stream}' (grupo '{self.jobs_group}')..."
+        )
 
-        logger.info("Escuchando canal 'news_processing' en Redis...")
+        message_ids = []
+        while True:
+            # Hasta agotar lo reclamable: un lote en el que todo falla no corta
+            # el drenaje (los fallidos quedan en backoff y no se reclaman)
+            while self.process_batch():
+                pass
+
+            if message_ids:
+                self.redis_client.xack(self.jobs_stream, self.jobs_group, *message_ids)
 
-        for message in pubsub.listen():
-            if message["type"] == "message":
-                logger.info(f"Mensaje recibido: {message['data']}")
-                self.process_batch()
+            message_ids = self.read_jobs()
+            if message_ids:
+                logger.info(f"Recibidas {len(message_ids)} notificaciones")
 
     def run(self):
         """Ejecutar servicio"""
         logger.info("🚀 Iniciando News Processor Service")
 
-        # Procesar artículos existentes al iniciar
-        self.process_batch()
+        start_metrics_server(
+            self.metrics, int(os.getenv("PROCESSOR_METRICS_PORT", 8080))
+        )
+        self.register_lexicon_version()
 
-        # Escuchar por nuevos trabajos
+        # Escuchar por nuevos trabajos (procesa el backlog existente al iniciar)
         while True:
             try:
-                # Procesar cada 10 segundos (acelerado para demo)
-                time.sleep(10)
-                self.process_batch()
+                self.listen_for_jobs()
 
             except KeyboardInterrupt:
                 logger.info("Deteniendo procesador...")
+                self.close()
                 break
             except Exception as e:
                 logger.error(f"Error en loop principal: {str(e)}")
@@ -0,0 +1,90 @@
+"""
+Matcher multi-patrón (Aho-Corasick) para clasificación por categorías
+El autómata trabaja sobre tokens en lugar de caracteres: cada keyword se
+compara con palabras completas, así "tasa" no coincide dentro de otras palabras.
+"""
+
+from collections import deque
+from typing import Dict, Iterable, List, Set
+
+from lexicon import tokenize
+
+
+def _plural(word: str) -> str:
+    """
+    Plural regular en español de una palabra en minúsculas (con tildes):
+    vocal + s, z → ces, consonante + es. Las palabras en s o x ya son plurales
+    o invariables ("acciones", "crisis"), salvo las agudas ("interés" →
+    "intereses"), que solo se distinguen por la tilde.
+    """
+    if word[-1] in "sx":
+        if len(word) > 1 and word[-2] in "áéíóú":
+            return word + "es"
+        return word
+    if word[-1] == "z":
+        return word[:-1] + "ces"
+    return word + ("s" if word[-1] in "aeiouáéíóú" else "es")
+
+
+class KeywordMatcher:
+    """Autómata Aho-Corasick sobre tokens: keyword (una o varias palabras) → etiquetas"""
+
+    def __init__(self, table: Dict[str, List[str]]):
+        # Estado 0 = raíz
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[Set[str]] = [set()]
+
+        for label, keywords in table.items():
+            for keyword in keywords:
+                words = tokenize(keyword)
+                if not words:
+                    continue
+                self._add(words, label)
+                # Aceptar también el plural de la última palabra ("tasa" → "tasas");
+                # se calcula antes de quitar las tildes
+                plural = (tokenize(_plural(keyword.split()[-1].lower())) or words)[-1]
+                if plural != words[-1]:
+                    self._add(words[:-1] + [plural], label)
+
+        self._build_failure_links()
+
+    def _add(self, words: List[str], label: str):
+        state = 0
+        for word in words:
+            next_state = self._goto[state].get(word)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][word] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append(set())
+            state = next_state
+        self._out[state].add(label)
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for word, child in self._goto[state].items():
+                queue.append(child)
+                fallback = self._fail[state]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[child] = self._goto[fallback].get(word, 0)
+                self._out[child] |= self._out[self._fail[child]]
+
+    def match(self, tokens: Iterable[str]) -> Set[str]:
+        """Etiquetas de todas las keywords presentes, en una sola pasada"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found = set()
+        state = 0
+
+        for token in tokens:
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            if out[state]:
+                found |= out[state]
+
+        return found
@@ -0,0 +1,70 @@
+"""
+Métricas del processor en formato de texto de Prometheus
+Servidor HTTP mínimo (stdlib) para el scraping por anotaciones del pod.
+"""
+
+import logging
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class Metrics:
+    """Registro de gauges/counters: nombre → valor, con etiquetas opcionales"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._help: Dict[str, Tuple[str, str]] = {}
+        self._values: Dict[Tuple[str, Tuple], float] = {}
+
+    def describe(self, name: str, help_text: str, kind: str = "gauge"):
+        self._help[name] = (help_text, kind)
+
+    def set(self, name: str, value: float, labels: Optional[Dict[str, str]] = None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._values[key] = float(value)
+
+    def inc(self, name: str, amount: float = 1, labels: Optional[Dict[str, str]] = None):
+        key = (name, tuple(sorted((labels or {}).items())))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> str:
+        """Exposición en formato de texto de Prometheus"""
+        lines = []
+        with self._lock:
+            values = sorted(self._values.items())
+        described = set()
+        for (name, labels), value in values:
+            if name not in described and name in self._help:
+                help_text, kind = self._help[name]
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {kind}")
+                described.add(name)
+            label_str = ",".join(f'{k}="{v}"' for k, v in labels)
+            lines.append(f"{name}{{{label_str}}} {value}" if labels else f"{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+def start_metrics_server(metrics: Metrics, port: int) -> ThreadingHTTPServer:
+    """Servir /metrics en un hilo daemon"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            body = metrics.render().encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("0.0.0.0", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    logger.info(f"Métricas disponibles en :{port}/metrics")
+    return server
@@ -0,0 +1,207 @@
+"""
+Re-puntuación incremental tras un cambio de léxico
+Cada artículo guarda la versión de léxico con la que se puntuó y sus términos
+en el índice invertido news_terms. Al cambiar el léxico solo se marcan para
+re-puntuar (needs_rescore, carril backfill) los artículos que contienen
+términos añadidos, eliminados o con peso distinto; el resto pasa a la versión
+actual sin tocarse.
+
+Uso: python rescore.py [--dry-run]
+"""
+
+import argparse
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Set, Tuple
+
+import psycopg2
+import redis
+
+from lexicon import ACCENT_TABLE, LEMMATIZATION_RULES, LEXICON, LEXICON_VERSION
+
+logger = logging.getLogger(__name__)
+
+# translate() de PostgreSQL equivalente a ACCENT_TABLE (los sobrantes se eliminan)
+_ACCENT_FROM = "".join(chr(c) for c, s in ACCENT_TABLE.items() if s) + "".join(
+    chr(c) for c, s in ACCENT_TABLE.items() if not s
+)
+_ACCENT_TO = "".join(s for s in ACCENT_TABLE.values() if s)
+
+
+def register_version(cursor):
+    """Guardar las tablas de la versión actual (necesarias para futuros diffs)"""
+    cursor.execute(
+        """
+        INSERT INTO lexicon_versions (version, lexicon, lemmatization_rules)
+        VALUES (%s, %s, %s)
+        ON CONFLICT (version) DO NOTHING
+    """,
+        (LEXICON_VERSION, json.dumps(LEXICON), json.dumps(LEMMATIZATION_RULES)),
+    )
+
+
+def changed_terms(
+    old_lexicon: Dict, old_rules: Dict[str, str]
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Términos a buscar entre una versión anterior y la actual.
+    Returns: (términos cubiertos por el índice de la versión anterior,
+              términos nuevos que hay que buscar en el texto)
+    """
+    new_lexicon = {word: list(entry) for word, entry in LEXICON.items()}
+    changed_lexicon = {
+        word
+        for word in old_lexicon.keys() | new_lexicon.keys()
+        if old_lexicon.get(word) != new_lexicon.get(word)
+    }
+    changed_rules = {
+        word
+        for word in old_rules.keys() | LEMMATIZATION_RULES.keys()
+        if old_rules.get(word) != LEMMATIZATION_RULES.get(word)
+    }
+    # Palabras que se lematizan (antes o ahora) a un término modificado
+    lemma_sources = {
+        word
+        for rules in (old_rules, LEMMATIZATION_RULES)
+        for word, lemma in rules.items()
+        if lemma in changed_lexicon
+    }
+
+    terms = changed_lexicon | changed_rules | lemma_sources
+    indexed = old_lexicon.keys() | old_rules.keys()
+    return terms & indexed, terms - indexed
+
+
+def queue_version(cursor, version: str, old_lexicon: Dict, old_rules: Dict) -> int:
+    """Marcar los artículos de una versión anterior afectados por el cambio"""
+    indexed, unindexed = changed_terms(old_lexicon, old_rules)
+    queued = 0
+
+    if indexed:
+        cursor.execute(
+            """
+            UPDATE news
+            SET needs_rescore = TRUE, lane = 'backfill'
+            WHERE lexicon_version = %s
+              AND NOT needs_rescore
+              AND id IN (SELECT news_id FROM news_terms WHERE term = ANY(%s))
+        """,
+            (version, sorted(indexed)),
+        )
+        queued += cursor.rowcount
+
+    if unindexed:
+        # Términos que no existían en la versión anterior: no están en el
+        # índice, se buscan como palabra completa en el texto normalizado
+        pattern = r"\m(" + "|".join(sorted(unindexed)) + r")\M"
+        cursor.execute(
+            """
+            UPDATE news
+            SET needs_rescore = TRUE, lane = 'backfill'
+            WHERE lexicon_version = %s
+              AND NOT needs_rescore
+              AND translate(lower(title || ' ' || COALESCE(content, '')), %s, %s) ~ %s
+        """,
+            (version, _ACCENT_FROM, _ACCENT_TO, pattern),
+        )
+        queued += cursor.rowcount
+
+    # Los no afectados puntúan igual con el léxico actual
+    cursor.execute(
+        """
+        UPDATE news
+        SET lexicon_version = %s
+        WHERE lexicon_version = %s AND NOT needs_rescore
+    """,
+        (LEXICON_VERSION, version),
+    )
+    logger.info(
+        f"Versión {version}: {queued} artículos a re-puntuar "
+        f"({len(indexed)} términos indexados, {len(unindexed)} nuevos), "
+        f"{cursor.rowcount} actualizados sin cambios"
+    )
+    return queued
+
+
+def queue_rescoring(conn, dry_run: bool = False) -> int:
+    """Marcar para re-puntuar los artículos afectados por el léxico actual"""
+    cursor = conn.cursor()
+    try:
+        register_version(cursor)
+        cursor.execute(
+            """
+            SELECT DISTINCT n.lexicon_version, v.lexicon, v.lemmatization_rules
+            FROM news AS n
+            LEFT JOIN lexicon_versions AS v ON v.version = n.lexicon_version
+            WHERE n.sentiment_score IS NOT NULL
+              AND n.lexicon_version IS DISTINCT FROM %s
+        """,
+            (LEXICON_VERSION,),
+        )
+        queued = 0
+        for version, old_lexicon, old_rules in cursor.fetchall():
+            if old_lexicon is None:
+                # Sin versión registrada (artículos anteriores al índice): completo
+                cursor.execute(
+                    """
+                    UPDATE news SET needs_rescore = TRUE, lane = 'backfill'
+                    WHERE sentiment_score IS NOT NULL
+                      AND lexicon_version IS NOT DISTINCT FROM %s
+                """,
+                    (version,),
+                )
+                logger.info(
+                    f"Versión {version} sin tablas registradas: "
+                    f"{cursor.rowcount} artículos a re-puntuar"
+                )
+                queued += cursor.rowcount
+            else:
+                queued += queue_version(cursor, version, old_lexicon, old_rules)
+        if dry_run:
+            conn.rollback()
+        else:
+            conn.commit()
+        return queued
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cursor.close()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+
+    conn = psycopg2.connect(
+        host=os.getenv("POSTGRES_HOST", "localhost"),
+        database=os.getenv("POSTGRES_DB", "news_colcap"),
+        user=os.getenv("POSTGRES_USER", "newsuser"),
+        password=os.getenv("POSTGRES_PASSWORD", "newspass123"),
+    )
+    try:
+        queued = queue_rescoring(conn, dry_run=args.dry_run)
+    finally:
+        conn.close()
+
+    logger.info(f"Léxico {LEXICON_VERSION}: {queued} artículos a re-puntuar")
+    if queued and not args.dry_run:
+        # Despertar a los processors
+        redis.Redis(
+            host=os.getenv("REDIS_HOST", "localhost"),
+            port=int(os.getenv("REDIS_PORT", 6379)),
+            decode_responses=True,
+        ).xadd(
+            "news_processing",
+            {"timestamp": datetime.utcnow().isoformat(), "action": "rescore"},
+            maxlen=10000,
+            approximate=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Combinación de componentes de sentimiento
+Pesos, amplificación, offset y umbrales que convierten los scores de
+keywords, TextBlob y VADER en el score final y su etiqueta.
+"""
+
+from typing import Tuple
+
+# Pesos optimizados: Keywords 65%, TextBlob 25%, VADER 10%
+# Keywords tienen más peso porque son específicos del dominio económico
+KEYWORD_WEIGHT = 0.65
+TEXTBLOB_WEIGHT = 0.25
+VADER_WEIGHT = 0.1
+
+# AMPLIFICACIÓN: Multiplicar por 2.5 para mayor variación visual
+AMPLIFIER = 2.5
+
+# NORMALIZACIÓN: Offset de +0.26 para alinear con el punto de inicio del COLCAP
+OFFSET = 0.26
+
+# Limitar a rango razonable para visualización
+SCORE_MIN = -0.5
+SCORE_MAX = 1.2
+
+# Umbrales ajustados para la nueva escala (baseline 0.26)
+POSITIVE_THRESHOLD = 0.30
+NEGATIVE_THRESHOLD = 0.22
+
+# Niveles de puntuación, de más barato a más caro
+SCORING_TIERS = ("keyword", "vader", "full")
+
+
+def label_for(score: float) -> str:
+    """Etiqueta positive/negative/neutral para un score final"""
+    if score >= POSITIVE_THRESHOLD:
+        return "positive"
+    if score <= NEGATIVE_THRESHOLD:
+        return "negative"
+    return "neutral"
+
+
+def combine_scores(
+    keyword_score: float, textblob_polarity: float, vader_compound: float
+) -> Tuple[float, str]:
+    """Score final (-0.5 a 1.2) y etiqueta a partir de los tres componentes"""
+    base_score = (
+        (keyword_score * KEYWORD_WEIGHT)
+        + (textblob_polarity * TEXTBLOB_WEIGHT)
+        + (vader_compound * VADER_WEIGHT)
+    )
+    final_score = base_score * AMPLIFIER + OFFSET
+    final_score = max(SCORE_MIN, min(SCORE_MAX, final_score))
+    return final_score, label_for(final_score)
+
+
+def textblob_is_decisive(keyword_score: float, vader_compound: float) -> bool:
+    """
+    True si TextBlob (polaridad en [-1, 1]) todavía puede cambiar la etiqueta.
+    Si no puede, el score de keywords + VADER ya es decisivo y TextBlob se omite.
+    """
+    partial = (
+        (keyword_score * KEYWORD_WEIGHT) + (vader_compound * VADER_WEIGHT)
+    ) * AMPLIFIER + OFFSET
+    swing = TEXTBLOB_WEIGHT * AMPLIFIER
+    return NEGATIVE_THRESHOLD < partial + swing and partial - swing < POSITIVE_THRESHOLD
@@ -0,0 +1,84 @@
+"""
+Snapshot versionado de tablas de puntuación
+Precalcula el léxico de VADER en un único archivo que se carga con una sola
+lectura mapeada en memoria, evitando abrir y parsear el zip de nltk_data en
+cada arranque de pod. La versión incluye la huella del léxico económico, de
+modo que un snapshot generado con otras tablas se descarta.
+
+Uso (en el build de la imagen): python snapshot.py
+"""
+
+import hashlib
+import json
+import logging
+import mmap
+import os
+import pickle
+from importlib import metadata
+from typing import Dict, Optional
+
+from lexicon import LEMMATIZATION_RULES, LEXICON
+
+logger = logging.getLogger(__name__)
+
+SNAPSHOT_FORMAT = 1
+SNAPSHOT_PATH = os.getenv(
+    "PROCESSOR_SNAPSHOT",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "scoring_snapshot.pkl"),
+)
+
+
+def snapshot_version() -> str:
+    """Versión esperada: formato, versión de nltk y contenido del léxico"""
+    try:
+        nltk_version = metadata.version("nltk")
+    except metadata.PackageNotFoundError:
+        nltk_version = None
+    payload = json.dumps(
+        [SNAPSHOT_FORMAT, nltk_version, sorted(LEXICON.items()), LEMMATIZATION_RULES],
+        sort_keys=True,
+    )
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
+def build_snapshot(path: str = SNAPSHOT_PATH):
+    """Construir el snapshot a partir de nltk_data y el léxico actual"""
+    from nltk.sentiment import SentimentIntensityAnalyzer
+
+    data = {
+        "version": snapshot_version(),
+        "vader_lexicon": SentimentIntensityAnalyzer().lexicon,
+    }
+    with open(path, "wb") as f:
+        pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+    logger.info(f"Snapshot de puntuación escrito en {path}")
+
+
+def load_snapshot(path: str = SNAPSHOT_PATH) -> Optional[Dict]:
+    """Cargar el snapshot; None si no existe o su versión no coincide"""
+    try:
+        with open(path, "rb") as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                data = pickle.loads(buffer)
+    except (OSError, ValueError, pickle.UnpicklingError, EOFError):
+        return None
+
+    if data.get("version") != snapshot_version():
+        logger.warning(f"Snapshot {path} desactualizado, se ignora")
+        return None
+    return data
+
+
+def vader_from_snapshot(snapshot: Dict):
+    """SentimentIntensityAnalyzer con el léxico del snapshot (sin leer nltk_data)"""
+    from nltk.sentiment.vader import SentimentIntensityAnalyzer, VaderConstants
+
+    sia = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+    sia.lexicon = snapshot["vader_lexicon"]
+    sia.constants = VaderConstants()
+    return sia
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    build_snapshot()
@@ -0,0 +1,46 @@
+"""
+Pruebas del plural y del autómata de categorías (matcher.py)
+Uso: python -m pytest test_matcher.py   (desde services/processor)
+"""
+
+import pytest
+
+from lexicon import tokenize
+from matcher import KeywordMatcher, _plural
+
+
+@pytest.mark.parametrize(
+    "word, plural",
+    [
+        ("tasa", "tasas"),
+        ("dólar", "dolares"),
+        ("acción", "acciones"),
+        ("ley", "leyes"),
+        ("café", "cafes"),
+        # Ya terminadas en s (plurales o invariables): sin cambio
+        ("acciones", "acciones"),
+        ("crisis", "crisis"),
+        ("divisas", "divisas"),
+        # Agudas en s: llevan plural
+        ("interés", "intereses"),
+        ("país", "paises"),
+        # z → ces
+        ("paz", "paces"),
+        ("luz", "luces"),
+        ("raíz", "raices"),
+    ],
+)
+def test_plural(word, plural):
+    # El matcher compara tokens: sin tildes
+    assert tokenize(_plural(word)) == [plural]
+
+
+def test_matcher_accepts_plurals():
+    matcher = KeywordMatcher(
+        {"mercados": ["acción", "acciones"], "energia": ["luz"], "tasas": ["tasa de interés"]}
+    )
+    assert matcher.match(tokenize("Suben las acciones de Ecopetrol")) == {"mercados"}
+    assert matcher.match(tokenize("Una acción en alza")) == {"mercados"}
+    assert matcher.match(tokenize("Tarifas de luces y gas")) == {"energia"}
+    assert matcher.match(tokenize("Baja la tasa de intereses")) == {"tasas"}
+    assert not matcher.match(tokenize("Las accioneses no existen"))
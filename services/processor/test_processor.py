@@ -0,0 +1,67 @@
+"""
+Pruebas de NewsProcessor sin PostgreSQL (conexión falsa) y con fakeredis
+Uso: python -m pytest test_processor.py   (desde services/processor)
+"""
+
+import fakeredis
+import pytest
+
+import main
+from keywords import DocumentFrequency
+
+
+class FakeConnection:
+    """Conexión que acepta cursor/commit/rollback/close sin hacer nada"""
+
+    def cursor(self, *args, **kwargs):
+        return self
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def processor(monkeypatch):
+    monkeypatch.setenv("SCORING_CACHE_ENABLED", "false")
+    monkeypatch.setenv("PROCESSOR_FAST_START", "false")
+    monkeypatch.setenv("PROCESSOR_EXECUTION_MODE", "process")
+    monkeypatch.setenv("PROCESSOR_WORKERS", "2")
+    monkeypatch.setenv("PROCESSOR_CHUNK_SIZE", "2")
+
+    processor = main.NewsProcessor()
+    # Sketch pequeño: BITFIELD en fakeredis recorre la clave entera
+    processor.document_frequency = DocumentFrequency(
+        fakeredis.FakeRedis(), width=1024, depth=4
+    )
+    processor.get_db_connection = FakeConnection
+    # Todas las filas siguen reclamadas y es su primera puntuación
+    monkeypatch.setattr(
+        main,
+        "copy_updates",
+        lambda cursor, processed, worker_id: [(r["id"], True) for r in processed],
+    )
+    yield processor
+    processor.close()
+
+
+def test_process_mode_shares_document_frequency(processor):
+    articles = [
+        {"id": 1, "title": "Ecopetrol impulsa el COLCAP", "content": "acciones al alza"},
+        {"id": 2, "title": "El dólar cae frente al peso", "content": "divisas"},
+        {"id": 3, "title": "Bancolombia reporta utilidades", "content": "banca"},
+    ]
+    processed = processor.process_articles(articles)
+    assert len(processed) == 3
+
+    processor.batch_update_articles(processed)
+    processor.flush_updates()
+
+    redis_client = processor.document_frequency.redis_client
+    assert int(redis_client.get(DocumentFrequency.DOCS_KEY)) == 3
+    assert any(redis_client.get(DocumentFrequency.SKETCH_KEY))
@@ -0,0 +1,115 @@
+"""
+Escritura masiva de artículos procesados
+Carga los resultados con COPY en una tabla temporal y los aplica con un único
+UPDATE ... FROM por lote, junto con los términos del índice invertido.
+"""
+
+import csv
+import io
+from typing import Dict, Iterable, List, Optional, Tuple
+
+
+def pg_array(values: Iterable[str]) -> str:
+    """Literal de array de PostgreSQL ('{"a","b"}') para un campo CSV"""
+    items = (
+        '"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values
+    )
+    return "{" + ",".join(items) + "}"
+
+
+def pg_float(value: Optional[float]) -> str:
+    """Campo CSV de un FLOAT opcional (vacío = NULL)"""
+    return "" if value is None else repr(float(value))
+
+
+def copy_updates(
+    cursor, processed: List[Dict], worker_id: str
+) -> List[Tuple[int, bool]]:
+    """
+    Aplica los resultados en un solo UPDATE vía COPY a una tabla temporal.
+    Solo se escriben las filas que siguen reclamadas por worker_id: si el lease
+    expiró y otro worker las reclamó (o ya las puntuó), el resultado está
+    obsoleto y se descarta.
+    No hace commit: la tabla temporal se elimina al confirmar la transacción.
+    Returns: (id, primera puntuación) de las filas de news actualizadas; las
+    re-puntuaciones llevan False
+    """
+    if not processed:
+        return []
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in processed:
+        writer.writerow(
+            (
+                row["id"],
+                repr(float(row["sentiment_score"])),
+                row["sentiment_label"],
+                pg_float(row["keyword_score"]),
+                pg_float(row["textblob_polarity"]),
+                pg_float(row["vader_compound"]),
+                pg_array(row["categories"]),
+                pg_array(row["keywords"]),
+                row["lexicon_version"],
+                pg_array(row["terms"]),
+            )
+        )
+    buffer.seek(0)
+
+    cursor.execute(
+        """
+        CREATE TEMP TABLE tmp_news_updates (
+            id INTEGER,
+            sentiment_score FLOAT,
+            sentiment_label VARCHAR(20),
+            keyword_score FLOAT,
+            textblob_polarity FLOAT,
+            vader_compound FLOAT,
+            categories TEXT[],
+            keywords TEXT[],
+            lexicon_version TEXT,
+            terms TEXT[]
+        ) ON COMMIT DROP
+    """
+    )
+    cursor.copy_expert("COPY tmp_news_updates FROM STDIN WITH (FORMAT csv)", buffer)
+    cursor.execute(
+        """
+        UPDATE news AS n
+        SET sentiment_score = t.sentiment_score,
+            sentiment_label = t.sentiment_label,
+            keyword_score = t.keyword_score,
+            textblob_polarity = t.textblob_polarity,
+            vader_compound = t.vader_compound,
+            categories = t.categories,
+            keywords = t.keywords,
+            lexicon_version = t.lexicon_version,
+            needs_rescore = FALSE,
+            scoring_attempts = 0,
+            claimed_by = NULL,
+            lease_expires_at = NULL,
+            updated_at = CURRENT_TIMESTAMP
+        FROM tmp_news_updates AS t
+        JOIN news AS prev ON prev.id = t.id
+        WHERE n.id = t.id
+          AND n.claimed_by = %s
+        RETURNING n.id, prev.sentiment_score IS NULL
+    """,
+        (worker_id,),
+    )
+    rows = [(row[0], row[1]) for row in cursor.fetchall()]
+    updated = [news_id for news_id, _ in rows]
+
+    # Índice invertido término → artículo: se reemplazan los términos de las
+    # filas escritas
+    cursor.execute("DELETE FROM news_terms WHERE news_id = ANY(%s)", (updated,))
+    cursor.execute(
+        """
+        INSERT INTO news_terms (term, news_id)
+        SELECT DISTINCT unnest(t.terms), t.id
+        FROM tmp_news_updates AS t
+        WHERE t.id = ANY(%s)
+    """,
+        (updated,),
+    )
+    return rows